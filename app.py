@@ -1,21 +1,43 @@
 from flask import Flask, render_template, session, redirect, url_for
 from config import Config
+from utils.db_connection import init_app as init_db
+from utils.metrics import init_app as init_metrics
+from utils.warmup import init_app as init_health
+from utils.analytics_rollup import start_refresh_scheduler
 
 # Import blueprints
 from routes.student_routes import student_bp
 from routes.admin_routes import admin_bp
 from routes.auth_routes import auth_bp
 
-def create_app():
+def create_app(start_scheduler=True):
     """
     Application factory pattern for creating Flask app.
 
+    Args:
+        start_scheduler (bool): Start the analytics refresh thread in this
+            process; wsgi.py passes False and gunicorn.conf.py starts it in
+            each worker instead, since threads do not survive fork()
+
     Returns:
         Flask app instance
     """
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # Connection pool and request-scoped connection handling
+    init_db(app)
+
+    # Query/request timing and the X-DB-* response headers
+    init_metrics(app)
+
+    # /healthz and /readyz (warm-up itself runs in run.py / wsgi.py)
+    init_health(app)
+
+    # Background refresh of the grade analytics rollups
+    if start_scheduler:
+        start_refresh_scheduler(app.config['ANALYTICS_REFRESH_INTERVAL'])
+
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(student_bp, url_prefix='/student')
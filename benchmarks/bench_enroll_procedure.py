@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark: three BEFORE INSERT triggers vs the enroll_student procedure
+
+Compares the per-enrollment latency of
+    - a plain INSERT INTO enrolls_in, checked by the prereq_check,
+      section_capacity_check and student_enrollment_status_check triggers
+    - CALL enroll_student(...), which runs the same checks once and makes the
+      triggers skip theirs
+
+The benchmark builds a scratch database with the same synthetic dataset as
+bench_view_plans (plus prerequisites and some full sections), loads
+triggers.sql and procedures_functions.sql into it, and replays the same
+random (student, course, section) requests through both paths. Every attempt
+runs in its own transaction and is rolled back, so both paths see identical
+data. It reports median/p95/mean latency and checks that both paths accept or
+reject every request the same way (same SQLSTATE).
+
+Usage:
+    python -m benchmarks.bench_enroll_procedure [--students N] [--courses N]
+        [--sections N] [--enrollments N] [--requests N] [--seed N]
+        [--database NAME] [--keep]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+import mysql.connector
+from mysql.connector import Error
+from config import Config
+from utils.init_db import get_database_dir, read_sql_file, execute_sql_statements
+from benchmarks.bench_view_plans import build_scratch_database
+
+INSERT_SQL = """
+    INSERT INTO enrolls_in (studentId, courseId, sectionNo, status, grade, enrolledDate)
+    VALUES (%s, %s, %s, 'enrolled', NULL, CURDATE())
+"""
+
+
+def add_enrollment_rules(cursor, db_name):
+    """
+    Add prerequisites, make some sections full, then load triggers and procedures.
+
+    Every third course requires the previous course, every sixth also the one
+    before that; every 50th course gets capacity-1 sections (already full).
+    """
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute(
+        "INSERT INTO prerequisite_of (prereqCourseId, targetCourseId) "
+        "SELECT courseId - 1, courseId FROM Course WHERE courseId % 3 = 0 AND courseId > 1")
+    cursor.execute(
+        "INSERT INTO prerequisite_of (prereqCourseId, targetCourseId) "
+        "SELECT courseId - 2, courseId FROM Course WHERE courseId % 6 = 0 AND courseId > 2")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.execute("UPDATE Section SET capacity = 1 WHERE courseId % 50 = 0")
+    cursor.execute("DELETE FROM section_stats")
+
+    database_dir = get_database_dir()
+    for filename in ('triggers.sql', 'procedures_functions.sql'):
+        sql_content = read_sql_file(os.path.join(database_dir, filename))
+        if sql_content is None or not execute_sql_statements(cursor, sql_content, filename, db_name=db_name):
+            raise RuntimeError(f"Failed to load {filename} into {db_name}")
+
+
+def make_requests(count, students, courses, sections, seed):
+    """Random (studentId, courseId, sectionNo) enrollment requests."""
+    rng = random.Random(seed)
+    return [(rng.randint(1, students), rng.randint(1, courses), f"{rng.randint(1, sections):04d}")
+            for _ in range(count)]
+
+
+def attempt(connection, cursor, via_procedure, request):
+    """
+    Run one enrollment in its own transaction and roll it back.
+
+    Returns:
+        tuple: (seconds, outcome) where outcome is 'ok' or the error's SQLSTATE
+    """
+    connection.start_transaction()
+    start = time.perf_counter()
+    try:
+        if via_procedure:
+            cursor.callproc('enroll_student', request)
+        else:
+            cursor.execute(INSERT_SQL, request)
+        outcome = 'ok'
+    except Error as e:
+        outcome = e.sqlstate or str(e.errno)
+    elapsed = time.perf_counter() - start
+    connection.rollback()
+    return elapsed, outcome
+
+
+def summarize(label, timings):
+    """Print latency statistics in milliseconds."""
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label:<22} {statistics.median(ordered) * 1000:>9.3f} "
+          f"{p95 * 1000:>9.3f} {statistics.mean(ordered) * 1000:>9.3f}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--sections', type=int, default=3, help='sections per course')
+    parser.add_argument('--enrollments', type=int, default=6, help='enrolls_in rows per student')
+    parser.add_argument('--requests', type=int, default=2000, help='enrollment attempts per path')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', default=f"{Config.DB_CONFIG['database']}_bench")
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database afterwards')
+    args = parser.parse_args()
+
+    if args.database == Config.DB_CONFIG['database']:
+        print("ERROR: --database must not be the application database.")
+        sys.exit(2)
+
+    config = Config.DB_CONFIG.copy()
+    config.pop('database', None)
+    config['raise_on_warnings'] = False
+
+    connection = None
+    cursor = None
+    try:
+        connection = mysql.connector.connect(**config)
+        cursor = connection.cursor()
+
+        print("=" * 70)
+        print("Enrollment checks: 3 triggers vs enroll_student procedure")
+        print("=" * 70)
+        print(f"Building {args.database}: {args.students} students, {args.courses} courses, "
+              f"{args.sections} sections/course, {args.enrollments} enrollments/student...")
+        start = time.perf_counter()
+        build_scratch_database(cursor, args.database, args.students, args.courses,
+                               args.sections, args.enrollments)
+        add_enrollment_rules(cursor, args.database)
+        connection.commit()
+        print(f"✓ Built in {time.perf_counter() - start:.1f}s")
+
+        requests = make_requests(args.requests, args.students, args.courses, args.sections, args.seed)
+
+        # Warm the buffer pool and the procedure cache for both paths
+        for request in requests[:50]:
+            attempt(connection, cursor, False, request)
+            attempt(connection, cursor, True, request)
+
+        trigger_times, procedure_times = [], []
+        outcomes = Counter()
+        mismatches = []
+        for request in requests:
+            # Alternate which path goes first so neither always runs on a warmer cache
+            first_procedure = len(trigger_times) % 2 == 1
+            results = {}
+            for via_procedure in (first_procedure, not first_procedure):
+                results[via_procedure] = attempt(connection, cursor, via_procedure, request)
+            trigger_times.append(results[False][0])
+            procedure_times.append(results[True][0])
+            outcomes[results[True][1]] += 1
+            if results[False][1] != results[True][1]:
+                mismatches.append((request, results[False][1], results[True][1]))
+
+        print(f"\n{args.requests} requests per path; outcomes: "
+              + ", ".join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items())))
+        print(f"  {'(ms)':<22} {'median':>9} {'p95':>9} {'mean':>9}")
+        summarize('INSERT + 3 triggers', trigger_times)
+        summarize('CALL enroll_student', procedure_times)
+        speedup = statistics.median(trigger_times) / statistics.median(procedure_times)
+        print(f"  median speedup: {speedup:.2f}x")
+
+        if not args.keep:
+            cursor.execute(f"DROP DATABASE {args.database}")
+
+        print("\n" + "=" * 70)
+        if mismatches:
+            print(f"✗ {len(mismatches)} requests had different outcomes, e.g.:")
+            for request, via_trigger, via_procedure in mismatches[:5]:
+                print(f"    {request}: triggers={via_trigger} procedure={via_procedure}")
+        else:
+            print("✓ Both paths accepted and rejected the same requests.")
+        sys.exit(1 if mismatches else 0)
+
+    except (Error, RuntimeError) as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        sys.exit(2)
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
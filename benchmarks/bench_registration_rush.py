@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Registration-rush stress test: many students enrolling in a few hot sections
+
+Drives a running CourseTracker instance over real HTTP, the way a crowd of
+browsers would on registration day:
+    1. Picks a handful of hot sections (open seats, courses without
+       prerequisites) and students who have never taken those courses, and
+       gives each student a throwaway login (username rush_<studentId>)
+    2. Logs every student in through /auth/login
+    3. Releases them all at once: each student enrolls in a random hot
+       section; with --churn some drop it again and enroll in another
+    4. Reports successful enrollments per second, the mix of results,
+       latency percentiles, the application's retries, and the server's
+       InnoDB row lock waits and deadlocks during the rush
+    5. Checks the invariants: no hot section over capacity, no student
+       enrolled twice in a course, section_stats counters equal to the real
+       counts, and every reported enrollment (minus drops) present in the
+       database
+    6. Removes the rush enrollments and logins (unless --keep)
+
+Requests ask for JSON results (Accept: application/json) from the enroll
+and drop routes. The harness connects to the database configured in .env,
+which must be the one the instance uses; load a synthetic dataset first
+(python -m utils.init_db --scale medium).
+
+Usage:
+    python -m benchmarks.bench_registration_rush [--url URL] [--students N]
+        [--hot-sections N] [--sections COURSE:SECTION,...] [--concurrency N]
+        [--churn F] [--seed N] [--timeout S] [--keep]
+
+Exit status is 1 if an invariant is violated, 2 if the test cannot run.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import mysql.connector
+from mysql.connector import Error
+from werkzeug.security import generate_password_hash
+from config import Config
+
+RUSH_PASSWORD = 'rush-password'
+RUSH_USER_PREFIX = 'rush_'
+
+HOT_SECTIONS_SQL = """
+    SELECT ss.courseId, ss.sectionNo, ss.capacity, ss.open_seats
+    FROM section_stats ss
+    WHERE ss.open_seats > 0
+      AND NOT EXISTS (SELECT 1 FROM prerequisite_of p WHERE p.targetCourseId = ss.courseId)
+    ORDER BY ss.courseId, ss.sectionNo
+    LIMIT %s
+"""
+
+SECTION_SQL = """
+    SELECT ss.courseId, ss.sectionNo, ss.capacity, ss.open_seats
+    FROM section_stats ss
+    WHERE ss.courseId = %s AND ss.sectionNo = %s
+"""
+
+RUSH_STUDENTS_SQL = """
+    SELECT s.studentId
+    FROM Student s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM enrolls_in e
+        WHERE e.studentId = s.studentId AND e.courseId IN ({courses})
+    )
+    ORDER BY s.studentId
+    LIMIT %s
+"""
+
+CREATE_LOGIN_SQL = """
+    INSERT INTO app_users (username, password_hash, role, linked_id)
+    VALUES (%s, %s, 'student', %s)
+    ON DUPLICATE KEY UPDATE password_hash = VALUES(password_hash), linked_id = VALUES(linked_id)
+"""
+
+OVER_CAPACITY_SQL = """
+    SELECT s.courseId, s.sectionNo, s.capacity, COUNT(*) AS enrolled
+    FROM Section s
+    JOIN enrolls_in e ON e.courseId = s.courseId AND e.sectionNo = s.sectionNo
+    WHERE e.status = 'enrolled' AND s.courseId IN ({courses})
+    GROUP BY s.courseId, s.sectionNo, s.capacity
+    HAVING COUNT(*) > s.capacity
+"""
+
+DUPLICATES_SQL = """
+    SELECT studentId, courseId, COUNT(*) AS rows_found
+    FROM enrolls_in
+    WHERE courseId IN ({courses}) AND status IN ('enrolled', 'completed')
+    GROUP BY studentId, courseId
+    HAVING COUNT(*) > 1
+"""
+
+COUNTER_DRIFT_SQL = """
+    SELECT ss.courseId, ss.sectionNo, ss.enrolled_count,
+           (SELECT COUNT(*) FROM enrolls_in e
+            WHERE e.courseId = ss.courseId AND e.sectionNo = ss.sectionNo
+              AND e.status = 'enrolled') AS actual
+    FROM section_stats ss
+    WHERE ss.courseId IN ({courses})
+    HAVING ss.enrolled_count <> actual
+"""
+
+RUSH_ENROLLMENTS_SQL = """
+    SELECT COUNT(*) AS n
+    FROM enrolls_in
+    WHERE status = 'enrolled' AND courseId IN ({courses}) AND studentId IN ({students})
+"""
+
+
+def placeholders(values):
+    return ', '.join(['%s'] * len(values))
+
+
+class Student:
+    """One simulated browser: a student id and its session cookie."""
+
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.cookie = None
+
+
+class RushClient:
+    """Minimal HTTP client for the instance under test (one connection per request)."""
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.https = parts.scheme == 'https'
+        self.timeout = timeout
+
+    def post(self, student, path, form=None, json_result=True):
+        """
+        POST a form as `student`.
+
+        Returns:
+            tuple: (HTTP status, parsed JSON body or None, headers, seconds)
+        """
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        connection = cls(self.host, self.port, timeout=self.timeout)
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        if json_result:
+            headers['Accept'] = 'application/json'
+        if student.cookie:
+            headers['Cookie'] = student.cookie
+        started = time.perf_counter()
+        try:
+            connection.request('POST', path, body=urlencode(form or {}), headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection.close()
+
+        cookie = response.getheader('Set-Cookie')
+        if cookie:
+            student.cookie = cookie.split(';', 1)[0]
+        data = None
+        if json_result and response.getheader('Content-Type', '').startswith('application/json'):
+            data = json.loads(body)
+        return response.status, data, response, elapsed
+
+
+def connect():
+    """Database connection for setup, counters, invariants and cleanup."""
+    config = Config.DB_CONFIG.copy()
+    config['raise_on_warnings'] = False
+    return mysql.connector.connect(**config)
+
+
+def query(connection, sql, params=()):
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def lock_counters(connection):
+    """InnoDB row lock waits / lock time (ms) and deadlocks since server start."""
+    counters = {row['Variable_name']: int(row['Value']) for row in query(
+        connection,
+        "SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time')")}
+    try:
+        rows = query(connection, "SELECT COUNT AS n FROM information_schema.INNODB_METRICS "
+                                 "WHERE NAME = 'lock_deadlocks'")
+        counters['deadlocks'] = int(rows[0]['n']) if rows else None
+    except Error:
+        counters['deadlocks'] = None
+    return counters
+
+
+def choose_sections(connection, args):
+    """Hot sections from --sections, or the first open sections without prerequisites."""
+    if args.sections:
+        sections = []
+        for item in args.sections.split(','):
+            course_id, section_no = item.strip().split(':')
+            rows = query(connection, SECTION_SQL, (int(course_id), section_no))
+            if not rows:
+                raise RuntimeError(f"Section {item} does not exist")
+            sections.extend(rows)
+        return sections
+    return query(connection, HOT_SECTIONS_SQL, (args.hot_sections,))
+
+
+def create_logins(connection, student_ids):
+    """Give every rush student a throwaway login (cheap hash: logins are not what we measure)."""
+    password_hash = generate_password_hash(RUSH_PASSWORD, method='pbkdf2:sha256:1000')
+    cursor = connection.cursor()
+    try:
+        cursor.executemany(CREATE_LOGIN_SQL, [(f"{RUSH_USER_PREFIX}{s}", password_hash, s)
+                                              for s in student_ids])
+        connection.commit()
+    finally:
+        cursor.close()
+
+
+def cleanup(connection, student_ids, courses):
+    """Delete the rush enrollments (the triggers fix section_stats) and logins."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"DELETE FROM enrolls_in WHERE status = 'enrolled' "
+            f"AND courseId IN ({placeholders(courses)}) AND studentId IN ({placeholders(student_ids)})",
+            tuple(courses) + tuple(student_ids))
+        enrollments = cursor.rowcount
+        cursor.execute("DELETE FROM app_users WHERE username LIKE %s", (RUSH_USER_PREFIX.replace('_', '\\_') + '%',))
+        connection.commit()
+        return enrollments
+    finally:
+        cursor.close()
+
+
+def log_in(client, student):
+    status, _, response, _ = client.post(
+        student, '/auth/login',
+        {'username': f"{RUSH_USER_PREFIX}{student.student_id}", 'password': RUSH_PASSWORD},
+        json_result=False)
+    return status in (302, 303) and '/student' in (response.getheader('Location') or '')
+
+
+def rush(client, student, sections, churn, rng, start, results, lock):
+    """One student's registration: enroll, maybe drop and enroll elsewhere."""
+    start.wait()
+    targets = rng.sample(sections, len(sections))
+    attempts = 2 if rng.random() < churn and len(targets) > 1 else 1
+    for attempt, section in enumerate(targets[:attempts]):
+        course_id, section_no = section['courseId'], section['sectionNo']
+        try:
+            status, data, _, elapsed = client.post(
+                student, '/student/enroll', {'course_id': course_id, 'section_no': section_no})
+            data = data or {}
+            if data.get('status') == 'enrolled':
+                outcome = 'enrolled'
+            else:
+                outcome = data.get('reason') or f"http_{status}"
+            retries = data.get('retries', 0)
+        except (OSError, http.client.HTTPException) as e:
+            outcome, retries, elapsed = f"client_{type(e).__name__}", 0, None
+        with lock:
+            results['enroll'].append((outcome, elapsed, retries))
+
+        if outcome != 'enrolled' or attempt == attempts - 1:
+            continue
+        try:
+            status, data, _, elapsed = client.post(
+                student, f"/student/drop/{course_id}/{int(section_no)}")
+            outcome = 'dropped' if (data or {}).get('rows') else f"drop_http_{status}"
+        except (OSError, http.client.HTTPException) as e:
+            outcome, elapsed = f"drop_client_{type(e).__name__}", None
+        with lock:
+            results['drop'].append((outcome, elapsed))
+
+
+def percentiles(seconds):
+    if not seconds:
+        return '-'
+    ordered = sorted(seconds)
+
+    def pick(pct):
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000
+
+    return (f"p50 {pick(50):.0f}ms  p95 {pick(95):.0f}ms  p99 {pick(99):.0f}ms  "
+            f"mean {statistics.mean(ordered) * 1000:.0f}ms")
+
+
+def format_mix(counts):
+    return ', '.join(f"{outcome} {n}" for outcome, n in counts.most_common())
+
+
+def check_invariants(connection, courses, student_ids, expected):
+    """Return a list of violation messages (empty if every invariant holds)."""
+    course_ph = placeholders(courses)
+    violations = []
+    for row in query(connection, OVER_CAPACITY_SQL.format(courses=course_ph), tuple(courses)):
+        violations.append(f"section {row['courseId']}:{row['sectionNo']} has {row['enrolled']} "
+                          f"enrolled, capacity {row['capacity']}")
+    for row in query(connection, DUPLICATES_SQL.format(courses=course_ph), tuple(courses)):
+        violations.append(f"student {row['studentId']} has {row['rows_found']} enrollments "
+                          f"in course {row['courseId']}")
+    for row in query(connection, COUNTER_DRIFT_SQL.format(courses=course_ph), tuple(courses)):
+        violations.append(f"section_stats {row['courseId']}:{row['sectionNo']} says "
+                          f"{row['enrolled_count']}, actual {row['actual']}")
+    found = query(connection, RUSH_ENROLLMENTS_SQL.format(courses=course_ph,
+                                                          students=placeholders(student_ids)),
+                  tuple(courses) + tuple(student_ids))[0]['n']
+    if found != expected:
+        violations.append(f"{expected} enrollments reported (net of drops), {found} in the database")
+    return violations
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://localhost:5001')
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--hot-sections', type=int, default=5)
+    parser.add_argument('--sections', help='hot sections as COURSE:SECTION,... (overrides --hot-sections)')
+    parser.add_argument('--concurrency', type=int, default=200, help='simultaneous clients')
+    parser.add_argument('--churn', type=float, default=0.1,
+                        help='share of students who drop and enroll in another section')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=60, help='HTTP timeout in seconds')
+    parser.add_argument('--keep', action='store_true', help='keep the rush enrollments and logins')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    client = RushClient(args.url, args.timeout)
+    connection = None
+    student_ids, courses = [], []
+
+    print("=" * 70)
+    print(f"Registration rush against {args.url}")
+    print("=" * 70)
+
+    try:
+        connection = connect()
+        sections = choose_sections(connection, args)
+        if not sections:
+            raise RuntimeError("No open sections without prerequisites; load a larger dataset")
+        courses = sorted({s['courseId'] for s in sections})
+        student_ids = [row['studentId'] for row in query(
+            connection, RUSH_STUDENTS_SQL.format(courses=placeholders(courses)),
+            tuple(courses) + (args.students,))]
+        seats = sum(s['open_seats'] for s in sections)
+        hot = ', '.join(f"{s['courseId']}:{s['sectionNo']}" for s in sections)
+        print(f"Hot sections: {hot} ({seats} open seats)")
+        print(f"Students:     {len(student_ids)}  concurrency {args.concurrency}  churn {args.churn:.0%}")
+
+        create_logins(connection, student_ids)
+        students = [Student(s) for s in student_ids]
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            logged_in = list(pool.map(lambda s: log_in(client, s), students))
+        students = [s for s, ok in zip(students, logged_in) if ok]
+        print(f"✓ Logged in {len(students)} of {len(student_ids)} students")
+        if not students:
+            raise RuntimeError("No student could log in; is the instance using this database?")
+
+        results = {'enroll': [], 'drop': []}
+        lock = threading.Lock()
+        start = threading.Event()
+        before = lock_counters(connection)
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [pool.submit(rush, client, s, sections, args.churn,
+                                   random.Random(rng.random()), start, results, lock)
+                       for s in students]
+            started = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - started
+        after = lock_counters(connection)
+
+        enroll_mix = Counter(outcome for outcome, _, _ in results['enroll'])
+        drop_mix = Counter(outcome for outcome, _ in results['drop'])
+        successes = enroll_mix['enrolled']
+        print(f"\nRush finished in {elapsed:.2f}s: {len(results['enroll'])} enroll and "
+              f"{len(results['drop'])} drop requests")
+        print(f"  Successful enrollments: {successes} ({successes / elapsed:.1f}/s)")
+        print(f"  Enroll results:  {format_mix(enroll_mix)}")
+        if drop_mix:
+            print(f"  Drop results:    {format_mix(drop_mix)}")
+        print(f"  Enroll latency:  {percentiles([e for _, e, _ in results['enroll'] if e is not None])}")
+        print(f"  App retries:     {sum(r for _, _, r in results['enroll'])} (deadlock / lock wait timeout)")
+        waits = after['Innodb_row_lock_waits'] - before['Innodb_row_lock_waits']
+        wait_ms = after['Innodb_row_lock_time'] - before['Innodb_row_lock_time']
+        print(f"  Row lock waits:  {waits} ({wait_ms} ms waited, server-wide)")
+        if before['deadlocks'] is not None and after['deadlocks'] is not None:
+            print(f"  Deadlocks:       {after['deadlocks'] - before['deadlocks']} (server-wide)")
+
+        connection.commit()  # see the rows committed during the rush
+        expected = successes - drop_mix['dropped']
+        violations = check_invariants(connection, courses, student_ids, expected)
+
+        print("\n" + "=" * 70)
+        if violations:
+            for violation in violations:
+                print(f"✗ {violation}")
+        else:
+            print("✓ Invariants hold: no section over capacity, no duplicate enrollments, "
+                  "seat counters exact.")
+
+        if not args.keep:
+            removed = cleanup(connection, student_ids, courses)
+            print(f"  Removed {removed} rush enrollment(s) and the rush logins.")
+        sys.exit(1 if violations else 0)
+
+    except (Error, RuntimeError, OSError) as e:
+        print(f"\n✗ Registration rush failed: {e}")
+        if connection is not None and student_ids and not args.keep:
+            try:
+                cleanup(connection, student_ids, courses)
+            except Error:
+                pass
+        sys.exit(2)
+    finally:
+        if connection and connection.is_connected():
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
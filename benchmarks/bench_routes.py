@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+End-to-end route benchmark: every page through the Flask test client
+
+For each dataset scale the benchmark builds a scratch database with init_db
+and a synthetic dataset (utils/synthetic_data.py), never the application
+database. It then builds the app with create_app() against that database and
+logs in as teststudent and testadmin through authenticate_user(), storing
+the result in the session the way the login route does. After a few warm-up
+requests it requests each route repeatedly and reports per route:
+    - p50 / p95 / p99 latency
+    - statements per request (X-DB-Queries header, see utils/metrics.py)
+    - peak resident set size while the route ran (sampled every few ms)
+
+Results are compared with a JSON baseline (benchmarks/baselines/routes.json
+by default). A route is a regression if its p95 grows by more than
+--tolerance (and by at least --min-delta ms), if it issues more statements,
+or if it fails. --save-baseline records the current results instead.
+
+Usage:
+    python -m benchmarks.bench_routes [--scales small,medium] [--runs N]
+        [--warmup N] [--baseline PATH] [--save-baseline] [--tolerance F]
+        [--min-delta MS] [--database-prefix NAME] [--reuse] [--keep]
+
+Exit status is 1 on a regression or failed request, 2 if the benchmark
+cannot run.
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import sys
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import Error
+from app import create_app
+from config import Config
+from utils.analytics_rollup import refresh_rollups
+from utils.auth import authenticate_user
+from utils.cache import bump_catalog_version
+from utils.db_connection import close_pool
+from utils.init_db import initialize_database
+from utils.metrics import reset_metrics
+from utils.prereq_graph import refresh_prerequisite_graph
+from utils.synthetic_data import SCALES, SyntheticDataset
+
+STUDENT_ROUTES = ('/student/', '/student/courses', '/student/enroll', '/student/gpa')
+ADMIN_ROUTES = ('/admin/', '/admin/salary-report', '/admin/analytics')
+
+ACCOUNTS = {
+    'student': ('teststudent', 'student123'),
+    'admin': ('testadmin', 'admin123'),
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'routes.json')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def rss_mb():
+    """Current resident set size in MB (peak so far where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+class RssSampler:
+    """
+    Track the peak resident set size from a background thread.
+
+    Usage:
+        with RssSampler() as sampler:
+            ...
+        sampler.peak_mb
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            self.peak_mb = max(self.peak_mb, rss_mb())
+            if self._stop.wait(self.interval):
+                break
+
+    def __enter__(self):
+        self.peak_mb = rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, rss_mb())
+        return False
+
+
+def database_exists(db_name):
+    """True if the scratch database is already there (for --reuse)."""
+    config = Config.DB_CONFIG.copy()
+    config.pop('database', None)
+    connection = mysql.connector.connect(**config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SHOW DATABASES LIKE %s", (db_name,))
+        return cursor.fetchone() is not None
+    finally:
+        connection.close()
+
+
+def drop_database(db_name):
+    """Drop a scratch database."""
+    config = Config.DB_CONFIG.copy()
+    config.pop('database', None)
+    connection = mysql.connector.connect(**config)
+    try:
+        connection.cursor().execute(f"DROP DATABASE IF EXISTS {db_name}")
+    finally:
+        connection.close()
+
+
+def build_app(db_name):
+    """
+    Create the app against a scratch database with fresh caches and rollups.
+
+    The background analytics refresh is off; the rollups are rebuilt once
+    here so the analytics page has data.
+    """
+    Config.DB_CONFIG = dict(Config.DB_CONFIG, database=db_name)
+    Config.ANALYTICS_REFRESH_INTERVAL = 0
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        bump_catalog_version()
+        refresh_prerequisite_graph()
+        refresh_rollups(full=True)
+    reset_metrics()
+    return app
+
+
+def login(app, role):
+    """
+    Test client with a logged-in session for one of the test accounts.
+
+    Raises:
+        RuntimeError: If the account does not authenticate
+    """
+    username, password = ACCOUNTS[role]
+    with app.app_context():
+        user = authenticate_user(username, password)
+    if user is None:
+        raise RuntimeError(f"Could not log in as {username}")
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user['user_id']
+        session['username'] = user['username']
+        session['role'] = user['role']
+        session['student_id'] = user['student_id']
+        session['student_name'] = user['student_name']
+    return client
+
+
+def measure_route(client, path, runs, warmup):
+    """
+    Request one route repeatedly.
+
+    Returns:
+        dict: p50_ms, p95_ms, p99_ms, queries (per request, max), rss_mb (peak)
+        and failures (requests that did not return 200)
+    """
+    for _ in range(warmup):
+        client.get(path)
+
+    timings, queries = [], []
+    failures = 0
+    with RssSampler() as sampler:
+        for _ in range(runs):
+            started = time.perf_counter()
+            response = client.get(path)
+            response.get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                failures += 1
+            queries.append(int(response.headers.get('X-DB-Queries', 0)))
+
+    return {
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'queries': max(queries),
+        'rss_mb': round(sampler.peak_mb, 1),
+        'failures': failures,
+    }
+
+
+def regressions(result, baseline, tolerance, min_delta):
+    """Reasons a route's result is worse than its baseline."""
+    reasons = []
+    if result['failures']:
+        reasons.append(f"{result['failures']} failed request(s)")
+    if baseline is None:
+        return reasons
+    limit = max(baseline['p95_ms'] * (1 + tolerance), baseline['p95_ms'] + min_delta)
+    if result['p95_ms'] > limit:
+        reasons.append(f"p95 {result['p95_ms']:.1f}ms > {limit:.1f}ms")
+    if result['queries'] > baseline['queries']:
+        reasons.append(f"{result['queries']} queries > {baseline['queries']}")
+    return reasons
+
+
+def run_scale(scale, args):
+    """Build (or reuse) one scale's database and measure every route."""
+    db_name = f"{args.database_prefix}_{scale}"
+    if not (args.reuse and database_exists(db_name)):
+        print(f"\nBuilding {db_name} ({scale})...")
+        if not initialize_database(force=True, dataset=SyntheticDataset(**SCALES[scale]),
+                                   db_name=db_name):
+            raise RuntimeError(f"Failed to build {db_name}")
+
+    app = build_app(db_name)
+    clients = {'student': login(app, 'student'), 'admin': login(app, 'admin')}
+
+    results = {}
+    for role, routes in (('student', STUDENT_ROUTES), ('admin', ADMIN_ROUTES)):
+        for path in routes:
+            results[path] = measure_route(clients[role], path, args.runs, args.warmup)
+
+    close_pool()
+    if not args.keep and not args.reuse:
+        drop_database(db_name)
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='small', help=f"comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument('--runs', type=int, default=50, help='measured requests per route')
+    parser.add_argument('--warmup', type=int, default=3, help='unmeasured requests per route')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='record the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 growth (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=2.0, help='p95 growth in ms always allowed')
+    parser.add_argument('--database-prefix', default=f"{Config.DB_CONFIG['database']}_routes")
+    parser.add_argument('--reuse', action='store_true', help='reuse existing scratch databases')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch databases afterwards')
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        print(f"ERROR: unknown scale(s): {', '.join(unknown)}")
+        sys.exit(2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("=" * 70)
+    print("CourseTracker route benchmark")
+    print("=" * 70)
+
+    failed = False
+    measured = {}
+    try:
+        for scale in scales:
+            results = measured[scale] = run_scale(scale, args)
+            print(f"\n[{scale}]  {args.runs} requests per route")
+            print(f"  {'route':24} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'rss MB':>8}")
+            for path, r in results.items():
+                reasons = regressions(r, baseline.get(scale, {}).get(path),
+                                      args.tolerance, args.min_delta)
+                mark = '✗' if reasons else '✓'
+                print(f"{mark} {path:24} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>6.1f}ms "
+                      f"{r['p99_ms']:>6.1f}ms {r['queries']:>8} {r['rss_mb']:>8.1f}"
+                      + (f"  ({'; '.join(reasons)})" if reasons else ''))
+                failed = failed or (bool(reasons) and not args.save_baseline)
+    except (Error, RuntimeError) as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        sys.exit(2)
+
+    print("\n" + "=" * 70)
+    if args.save_baseline:
+        for scale, results in measured.items():
+            baseline[scale] = {path: {k: v for k, v in r.items() if k != 'failures'}
+                               for path, r in results.items()}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✓ Baseline saved to {args.baseline}")
+    elif failed:
+        print("✗ Regressions against the baseline.")
+    elif not any(scale in baseline for scale in measured):
+        print("⚠️  No baseline for these scales; run with --save-baseline to record one.")
+    else:
+        print("✓ No regressions against the baseline.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Serving throughput: requests per second a running instance sustains
+
+Logs in as the test student over HTTP, then keeps --concurrency clients
+requesting the student pages (round robin) for --duration seconds and reports
+requests per second, latency percentiles and errors. Run it once against the
+development server (python run.py) and once against Gunicorn
+(gunicorn -c gunicorn.conf.py wsgi:app) on the same database to compare them;
+see "Production Serving" in the README.
+
+Usage:
+    python -m benchmarks.bench_serving [--url URL] [--concurrency N]
+        [--duration S] [--routes PATH,...] [--timeout S]
+
+Exit status is 1 if any request failed, 2 if the benchmark cannot run.
+"""
+
+import argparse
+import http.client
+import itertools
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_ROUTES = '/student/,/student/courses,/student/enroll,/student/gpa'
+ACCOUNT = ('teststudent', 'student123')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def log_in(url, timeout):
+    """
+    Log in as the test student.
+
+    Returns:
+        str: The session cookie (name=value)
+
+    Raises:
+        RuntimeError: If the login is rejected
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    try:
+        connection.request('POST', '/auth/login',
+                           body=urlencode({'username': ACCOUNT[0], 'password': ACCOUNT[1]}),
+                           headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        response = connection.getresponse()
+        response.read()
+    finally:
+        connection.close()
+    cookie = response.getheader('Set-Cookie')
+    if response.status not in (302, 303) or not cookie:
+        raise RuntimeError(f"Could not log in as {ACCOUNT[0]} (HTTP {response.status})")
+    return cookie.split(';', 1)[0]
+
+
+def client_loop(url, cookie, routes, deadline, timeout, results, lock):
+    """One client: keep-alive connection, request routes until the deadline."""
+    parts = urlsplit(url)
+    connection = None
+    timings, errors = [], Counter()
+    for path in itertools.cycle(routes):
+        if time.perf_counter() >= deadline:
+            break
+        if connection is None:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers={'Cookie': cookie})
+            response = connection.getresponse()
+            response.read()
+            timings.append(time.perf_counter() - started)
+            if response.status != 200:
+                errors[f"http_{response.status}"] += 1
+            if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            errors[type(e).__name__] += 1
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+    with lock:
+        results['timings'].extend(timings)
+        results['errors'].update(errors)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://localhost:5001')
+    parser.add_argument('--concurrency', type=int, default=32, help='simultaneous clients')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to measure')
+    parser.add_argument('--routes', default=DEFAULT_ROUTES, help='comma-separated paths')
+    parser.add_argument('--timeout', type=float, default=30, help='HTTP timeout in seconds')
+    args = parser.parse_args()
+
+    routes = [r.strip() for r in args.routes.split(',') if r.strip()]
+
+    print("=" * 70)
+    print(f"Serving throughput against {args.url}")
+    print("=" * 70)
+
+    try:
+        cookie = log_in(args.url, args.timeout)
+    except (OSError, http.client.HTTPException, RuntimeError) as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        sys.exit(2)
+
+    results = {'timings': [], 'errors': Counter()}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(client_loop, args.url, cookie, routes, deadline, args.timeout, results, lock)
+    elapsed = time.perf_counter() - started
+
+    timings, errors = results['timings'], results['errors']
+    print(f"{args.concurrency} clients, {elapsed:.1f}s, routes: {', '.join(routes)}")
+    print(f"  Responses:  {len(timings)} ({len(timings) / elapsed:.1f}/s)")
+    if timings:
+        print(f"  Latency:    p50 {percentile(timings, 50) * 1000:.1f}ms  "
+              f"p95 {percentile(timings, 95) * 1000:.1f}ms  p99 {percentile(timings, 99) * 1000:.1f}ms")
+    print("\n" + "=" * 70)
+    if errors:
+        print(f"✗ Errors: {', '.join(f'{k} {v}' for k, v in errors.most_common())}")
+    else:
+        print("✓ No errors.")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Plan and latency benchmark: correlated subqueries vs pre-aggregated joins
+
+Compares the original definitions of current_student_enrollments and the
+student course catalog query (three correlated subqueries per row for
+cross-list codes, professor and TAs) with the rewritten versions that join the
+course_code_list / course_professor / section_ta_list helper views once.
+For one student's rows the helper views are no help (they are materialized
+whole), so the student dashboard is also compared with the LATERAL lookups
+the student routes use (STUDENT_SCHEDULE_SQL).
+
+The benchmark builds a scratch database (never the application database),
+loads database/schema.sql, indexes.sql and views.sql into it, fills it with a
+synthetic dataset generated server-side, then for each query:
+    - prints the optimizer's estimated cost (EXPLAIN FORMAT=JSON)
+    - optionally prints the EXPLAIN ANALYZE tree for both plans
+    - times several runs of each and reports the median
+    - checks that both versions return identical rows
+
+Usage:
+    python -m benchmarks.bench_view_plans [--students N] [--courses N]
+        [--sections N] [--enrollments N] [--runs N] [--database NAME]
+        [--show-plans] [--keep]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import mysql.connector
+from mysql.connector import Error
+from config import Config
+from utils.init_db import get_database_dir, read_sql_file, execute_sql_statements
+from routes.student_routes import STUDENT_SCHEDULE_SQL
+
+GRADES = "'A+','A','A-','B+','B','B-','C+','C','C-','D+','D','D-','F'"
+
+# Original view definition (correlated subqueries), recreated for comparison
+LEGACY_VIEW_SQL = """
+    CREATE VIEW legacy_current_student_enrollments AS
+    SELECT
+        s.studentId, s.name AS studentName, s.gender, s.year,
+        c.courseId, c.title, c.credits, se.sectionNo, se.capacity,
+        e.status, e.grade, e.enrolledDate,
+        (SELECT GROUP_CONCAT(cl.code SEPARATOR ', ')
+         FROM cross_lists cl
+         WHERE cl.courseId = c.courseId) AS code,
+        (SELECT prof_emp.name
+         FROM teaches t
+         JOIN Professor p ON t.employeeId = p.employeeId
+         JOIN Employee prof_emp ON p.employeeId = prof_emp.employeeId
+         WHERE t.courseId = c.courseId
+         LIMIT 1) AS professor,
+        (SELECT GROUP_CONCAT(ta_emp.name SEPARATOR ', ')
+         FROM assists a
+         JOIN TA ta ON a.employeeId = ta.employeeId
+         JOIN Employee ta_emp ON ta.employeeId = ta_emp.employeeId
+         WHERE a.courseId = c.courseId AND a.sectionNo = se.sectionNo) AS tas
+    FROM Student s
+    JOIN enrolls_in e ON s.studentId = e.studentId
+    JOIN Section se ON e.courseId = se.courseId AND e.sectionNo = se.sectionNo
+    JOIN Course c ON se.courseId = c.courseId
+    WHERE e.status = 'enrolled'
+"""
+
+LEGACY_CATALOG_SQL = """
+    SELECT
+        c.title, s.courseId, s.sectionNo, s.capacity, c.credits,
+        (SELECT GROUP_CONCAT(cl2.code SEPARATOR ', ')
+         FROM cross_lists cl2
+         WHERE cl2.courseId = c.courseId) AS code,
+        (SELECT prof_emp2.name
+         FROM teaches t2
+         JOIN Professor p2 ON t2.employeeId = p2.employeeId
+         JOIN Employee prof_emp2 ON p2.employeeId = prof_emp2.employeeId
+         WHERE t2.courseId = s.courseId
+         LIMIT 1) AS professor,
+        (SELECT GROUP_CONCAT(ta_emp2.name SEPARATOR ', ')
+         FROM assists a2
+         JOIN TA ta2 ON a2.employeeId = ta2.employeeId
+         JOIN Employee ta_emp2 ON ta2.employeeId = ta_emp2.employeeId
+         WHERE a2.courseId = s.courseId AND a2.sectionNo = s.sectionNo) AS tas,
+        COALESCE(ss.enrolled_count, 0) AS num_enrolled
+    FROM Section s
+    JOIN Course c ON c.courseId = s.courseId
+    LEFT JOIN section_stats ss ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
+    ORDER BY c.title ASC, s.sectionNo ASC
+"""
+
+CATALOG_SQL = """
+    SELECT
+        c.title, s.courseId, s.sectionNo, s.capacity, c.credits,
+        ccl.code, cp.professor, stl.tas,
+        COALESCE(ss.enrolled_count, 0) AS num_enrolled
+    FROM Section s
+    JOIN Course c ON c.courseId = s.courseId
+    LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+    LEFT JOIN course_professor cp ON cp.courseId = s.courseId
+    LEFT JOIN section_ta_list stl ON stl.courseId = s.courseId AND stl.sectionNo = s.sectionNo
+    LEFT JOIN section_stats ss ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
+    ORDER BY c.title ASC, s.sectionNo ASC
+"""
+
+ADMIN_DASHBOARD_SQL = """
+    SELECT studentId, studentName, courseId, title, credits, sectionNo, grade, code, professor
+    FROM {view}
+    ORDER BY studentName ASC, title ASC, studentId, courseId, sectionNo
+"""
+
+STUDENT_DASHBOARD_SQL = """
+    SELECT title, courseId, credits, sectionNo, grade, code, professor, tas
+    FROM {view}
+    WHERE studentId = %s
+    ORDER BY title ASC, sectionNo
+"""
+
+
+def seq_cte(name, upper):
+    """Recursive CTE producing integers 1..upper."""
+    return (f"{name}(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM {name} "
+            f"WHERE n < {int(upper)})")
+
+
+def build_scratch_database(cursor, db_name, students, courses, sections, enrollments):
+    """
+    Create the scratch database, load schema and views, and generate data.
+
+    Every course gets one professor and one or two cross-listed codes; every
+    section gets one TA. Each student has `enrollments` rows spread over
+    different courses: the first two are 'enrolled', the rest 'completed'.
+    """
+    database_dir = get_database_dir()
+
+    cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+    cursor.execute(f"CREATE DATABASE {db_name}")
+    cursor.execute(f"USE {db_name}")
+
+    for filename in ('schema.sql', 'indexes.sql', 'views.sql'):
+        sql_content = read_sql_file(os.path.join(database_dir, filename))
+        if sql_content is None or not execute_sql_statements(cursor, sql_content, filename, db_name=db_name):
+            raise RuntimeError(f"Failed to load {filename} into {db_name}")
+
+    professors = max(1, courses // 4)
+    tas = max(1, courses // 2)
+    ta_base = professors
+
+    cursor.execute("SET SESSION cte_max_recursion_depth = %s",
+                   (max(students, courses, professors + tas) + 1,))
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+
+    statements = [
+        "INSERT INTO College (collegeId, name) VALUES (1, 'Benchmark College')",
+        f"INSERT INTO Department (deptId, name, collegeId) "
+        f"WITH RECURSIVE {seq_cte('seq', 20)} "
+        f"SELECT n, CONCAT('Department ', n), 1 FROM seq",
+        f"INSERT INTO Employee (employeeId, name, gender, salary, role) "
+        f"WITH RECURSIVE {seq_cte('seq', professors + tas)} "
+        f"SELECT n, CONCAT(IF(n <= {professors}, 'Professor ', 'TA '), LPAD(n, 6, '0')), 'X', "
+        f"40000 + (n * 7919) % 90000, IF(n <= {professors}, 'Professor', 'TA') FROM seq",
+        "INSERT INTO Professor (employeeId) SELECT employeeId FROM Employee WHERE role = 'Professor'",
+        "INSERT INTO TA (employeeId) SELECT employeeId FROM Employee WHERE role = 'TA'",
+        f"INSERT INTO Student (studentId, name, gender, year) "
+        f"WITH RECURSIVE {seq_cte('seq', students)} "
+        f"SELECT n, CONCAT('Student ', LPAD(n, 7, '0')), ELT(1 + n % 3, 'M', 'F', 'X'), 1 + n % 4 FROM seq",
+        f"INSERT INTO Course (courseId, title, credits, building) "
+        f"WITH RECURSIVE {seq_cte('seq', courses)} "
+        f"SELECT n, CONCAT('Course ', LPAD(n, 5, '0')), 1 + n % 4, 'Benchmark Hall' FROM seq",
+        f"INSERT INTO Section (courseId, sectionNo, capacity) "
+        f"WITH RECURSIVE {seq_cte('k', sections)} "
+        f"SELECT c.courseId, LPAD(k.n, 4, '0'), 500 FROM Course c CROSS JOIN k",
+        "INSERT INTO cross_lists (deptId, courseId, code) "
+        "SELECT 1 + courseId % 20, courseId, CONCAT('D', 1 + courseId % 20, ':', courseId) FROM Course",
+        "INSERT INTO cross_lists (deptId, courseId, code) "
+        "SELECT 1 + (courseId + 7) % 20, courseId, CONCAT('D', 1 + (courseId + 7) % 20, ':', courseId) "
+        "FROM Course WHERE courseId % 5 = 0",
+        f"INSERT INTO teaches (employeeId, courseId) "
+        f"SELECT 1 + courseId % {professors}, courseId FROM Course",
+        f"INSERT INTO assists (employeeId, courseId, sectionNo) "
+        f"SELECT {ta_base} + 1 + (courseId * 3 + CAST(sectionNo AS UNSIGNED)) % {tas}, courseId, sectionNo "
+        f"FROM Section",
+        f"INSERT IGNORE INTO enrolls_in (studentId, courseId, sectionNo, status, grade, enrolledDate) "
+        f"WITH RECURSIVE {seq_cte('st', students)}, {seq_cte('j', enrollments)} "
+        f"SELECT st.n, 1 + (st.n * 7 + j.n * 131) % {courses}, LPAD(1 + (st.n + j.n) % {sections}, 4, '0'), "
+        f"IF(j.n <= 2, 'enrolled', 'completed'), "
+        f"IF(j.n <= 2, NULL, ELT(1 + (st.n + j.n) % 13, {GRADES})), "
+        f"DATE_SUB('2025-01-13', INTERVAL j.n * 120 DAY) "
+        f"FROM st CROSS JOIN j",
+        "INSERT INTO section_stats (courseId, sectionNo, capacity, enrolled_count) "
+        "SELECT s.courseId, s.sectionNo, s.capacity, COUNT(e.studentId) "
+        "FROM Section s LEFT JOIN enrolls_in e ON e.courseId = s.courseId "
+        "AND e.sectionNo = s.sectionNo AND e.status = 'enrolled' "
+        "GROUP BY s.courseId, s.sectionNo, s.capacity",
+        "INSERT INTO student_gpa (studentId, quality_points, credits, courses_completed) "
+        "SELECT e.studentId, SUM(g.points * c.credits), SUM(c.credits), COUNT(*) "
+        "FROM enrolls_in e JOIN grade_scale g ON g.grade = e.grade "
+        "JOIN Course c ON c.courseId = e.courseId "
+        "WHERE e.status = 'completed' GROUP BY e.studentId",
+    ]
+    for stmt in statements:
+        cursor.execute(stmt)
+
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.execute(LEGACY_VIEW_SQL)
+    cursor.execute("ANALYZE TABLE Student, Course, Section, enrolls_in, cross_lists, teaches, assists, Employee")
+    cursor.fetchall()
+
+
+def estimated_cost(cursor, sql, params):
+    """Optimizer cost estimate from EXPLAIN FORMAT=JSON."""
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params)
+    plan = json.loads(cursor.fetchone()[0])
+    return float(plan['query_block'].get('cost_info', {}).get('query_cost', 0))
+
+
+def analyze_tree(cursor, sql, params):
+    """Actual plan with timings from EXPLAIN ANALYZE."""
+    cursor.execute(f"EXPLAIN ANALYZE {sql}", params)
+    return cursor.fetchone()[0]
+
+
+def time_query(cursor, sql, params, runs):
+    """Run a query several times and return (median seconds, rows)."""
+    timings = []
+    rows = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), rows
+
+
+def compare(cursor, label, old_sql, new_sql, params, runs, show_plans):
+    """Benchmark one old/new query pair and print the result."""
+    old_cost = estimated_cost(cursor, old_sql, params)
+    new_cost = estimated_cost(cursor, new_sql, params)
+    old_time, old_rows = time_query(cursor, old_sql, params, runs)
+    new_time, new_rows = time_query(cursor, new_sql, params, runs)
+
+    identical = old_rows == new_rows
+    speedup = old_time / new_time if new_time else float('inf')
+
+    print(f"\n[{label}]  rows={len(new_rows)}  identical={'yes' if identical else 'NO'}")
+    print(f"  {'':10} {'est. cost':>14} {'median time':>14}")
+    print(f"  {'old':10} {old_cost:>14.1f} {old_time * 1000:>12.1f}ms")
+    print(f"  {'new':10} {new_cost:>14.1f} {new_time * 1000:>12.1f}ms")
+    print(f"  speedup: {speedup:.1f}x")
+
+    if show_plans:
+        print("\n  -- old plan --")
+        print(analyze_tree(cursor, old_sql, params))
+        print("\n  -- new plan --")
+        print(analyze_tree(cursor, new_sql, params))
+
+    return identical
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--sections', type=int, default=3, help='sections per course')
+    parser.add_argument('--enrollments', type=int, default=6, help='enrolls_in rows per student')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--database', default=f"{Config.DB_CONFIG['database']}_bench")
+    parser.add_argument('--show-plans', action='store_true', help='print EXPLAIN ANALYZE trees')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch database afterwards')
+    args = parser.parse_args()
+
+    if args.database == Config.DB_CONFIG['database']:
+        print("ERROR: --database must not be the application database.")
+        sys.exit(2)
+
+    config = Config.DB_CONFIG.copy()
+    config.pop('database', None)
+    config['raise_on_warnings'] = False
+
+    connection = None
+    cursor = None
+    try:
+        connection = mysql.connector.connect(**config)
+        cursor = connection.cursor()
+
+        print("=" * 70)
+        print("Correlated subqueries vs pre-aggregated joins")
+        print("=" * 70)
+        print(f"Building {args.database}: {args.students} students, {args.courses} courses, "
+              f"{args.sections} sections/course, {args.enrollments} enrollments/student...")
+        start = time.perf_counter()
+        build_scratch_database(cursor, args.database, args.students, args.courses,
+                               args.sections, args.enrollments)
+        connection.commit()
+        print(f"✓ Built in {time.perf_counter() - start:.1f}s")
+
+        sample_student = (max(1, args.students // 2),)
+        results = [
+            compare(cursor, 'admin dashboard (full view scan)',
+                    ADMIN_DASHBOARD_SQL.format(view='legacy_current_student_enrollments'),
+                    ADMIN_DASHBOARD_SQL.format(view='current_student_enrollments'),
+                    (), args.runs, args.show_plans),
+            compare(cursor, 'student dashboard (one student)',
+                    STUDENT_DASHBOARD_SQL.format(view='legacy_current_student_enrollments'),
+                    STUDENT_DASHBOARD_SQL.format(view='current_student_enrollments'),
+                    sample_student, args.runs, args.show_plans),
+            compare(cursor, 'student dashboard (one student, LATERAL lookups)',
+                    STUDENT_DASHBOARD_SQL.format(view='legacy_current_student_enrollments'),
+                    STUDENT_SCHEDULE_SQL, sample_student, args.runs, args.show_plans),
+            compare(cursor, 'course catalog',
+                    LEGACY_CATALOG_SQL, CATALOG_SQL, (), args.runs, args.show_plans),
+        ]
+
+        if not args.keep:
+            cursor.execute(f"DROP DATABASE {args.database}")
+
+        print("\n" + "=" * 70)
+        if all(results):
+            print("✓ Old and new queries returned identical rows.")
+        else:
+            print("✗ Result mismatch between old and new queries.")
+        sys.exit(0 if all(results) else 1)
+
+    except (Error, RuntimeError) as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        sys.exit(2)
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,7 @@ class Config:
     
     # Flask settings
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    DEBUG = True  # Set to False in production
+    DEBUG = (os.environ.get('FLASK_DEBUG') or 'false').lower() in ('1', 'true', 'yes')  # never enable in production
     
     # MySQL Database settings
     DB_CONFIG = {
@@ -19,4 +19,72 @@ class Config:
         'database': os.environ.get('DB_NAME') or 'CourseTracker',
         'raise_on_warnings': True,
         'autocommit': False  # We want explicit transaction control
-    }
\ No newline at end of file
+    }
+
+    # Production server (see gunicorn.conf.py); every worker has its own connection pool
+    WEB_BIND = os.environ.get('WEB_BIND') or '0.0.0.0:5001'
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS') or (os.cpu_count() or 1) * 2 + 1)  # worker processes
+    WEB_THREADS = int(os.environ.get('WEB_THREADS') or 4)  # request threads per worker (keep <= DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW)
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT') or 30)  # seconds before a stuck worker is killed and replaced
+    WEB_GRACEFUL_TIMEOUT = int(os.environ.get('WEB_GRACEFUL_TIMEOUT') or 30)  # seconds workers get to finish requests on reload/shutdown
+    WEB_KEEPALIVE = int(os.environ.get('WEB_KEEPALIVE') or 5)  # seconds to hold idle keep-alive connections
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS') or 0)  # restart a worker after this many requests (0 = never)
+
+    # Startup warm-up and health checks (see utils/warmup.py)
+    WARMUP_ON_START = (os.environ.get('WARMUP_ON_START') or 'true').lower() in ('1', 'true', 'yes')  # /readyz fails until warm-up has run
+    WARMUP_CONNECTIONS = int(os.environ.get('WARMUP_CONNECTIONS') or 0)  # pool connections opened at start (0 = DB_POOL_SIZE)
+    READY_CHECK_TIMEOUT = float(os.environ.get('READY_CHECK_TIMEOUT') or 2)  # seconds /readyz waits for SELECT 1 (connect and read)
+
+    # Connection pool settings (see utils/db_pool.py)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 30)  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)  # max connection age in seconds (0 = never)
+    DB_POOL_PRE_PING = (os.environ.get('DB_POOL_PRE_PING') or 'true').lower() in ('1', 'true', 'yes')
+
+    # Query metrics (see utils/metrics.py)
+    QUERY_TIMING_HEADERS = (os.environ.get('QUERY_TIMING_HEADERS') or 'true').lower() in ('1', 'true', 'yes')  # X-DB-* and Server-Timing response headers
+
+    # Slow query log (see utils/slow_queries.py)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS') or 250)  # capture statements at least this slow (0 = off)
+    SLOW_QUERY_BUFFER_SIZE = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE') or 200)  # captures kept in memory
+    SLOW_QUERY_LOG_FILE = os.environ.get('SLOW_QUERY_LOG_FILE') or ''  # JSON lines file to persist captures ('' = memory only)
+    SLOW_QUERY_EXPLAIN_INTERVAL = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL') or 300)  # seconds before a statement's plan is captured again
+    SLOW_QUERY_EXPLAIN_TIMEOUT = float(os.environ.get('SLOW_QUERY_EXPLAIN_TIMEOUT') or 0.5)  # seconds to wait for a connection to EXPLAIN on (none free = no plan)
+
+    # Independent page queries run concurrently (see utils/parallel.py)
+    PARALLEL_QUERY_WORKERS = int(os.environ.get('PARALLEL_QUERY_WORKERS') or 4)  # threads per process, each on its own pooled connection (1 = sequential)
+
+    # Course catalog cache (see utils/cache.py)
+    CATALOG_CACHE_SIZE = int(os.environ.get('CATALOG_CACHE_SIZE') or 64)  # max cached entries
+    CATALOG_CACHE_TTL = float(os.environ.get('CATALOG_CACHE_TTL') or 30)  # seconds (0 = no expiry)
+
+    # Admin enrollment dashboard pagination (see routes/admin_routes.py)
+    ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE') or 50)  # rows per page
+    ADMIN_PAGE_SIZE_MAX = int(os.environ.get('ADMIN_PAGE_SIZE_MAX') or 500)  # upper bound for ?page_size=
+
+    # Streaming exports (see utils/export.py)
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE') or 1000)  # rows fetched per round trip
+
+    # Enrollment retries on deadlock / lock wait timeout (see utils/enrollment.py)
+    ENROLL_MAX_RETRIES = int(os.environ.get('ENROLL_MAX_RETRIES') or 4)
+    ENROLL_RETRY_BACKOFF = float(os.environ.get('ENROLL_RETRY_BACKOFF') or 0.02)  # base delay in seconds, doubled per retry
+
+    # Prerequisite graph (see utils/prereq_graph.py)
+    PREREQ_GRAPH_CHECK_INTERVAL = float(os.environ.get('PREREQ_GRAPH_CHECK_INTERVAL') or 30)  # seconds between change checks
+
+    # Grade analytics rollups (see utils/analytics_rollup.py)
+    ANALYTICS_REFRESH_INTERVAL = float(os.environ.get('ANALYTICS_REFRESH_INTERVAL') or 60)  # seconds between refreshes (0 = no background refresh)
+
+    # Bulk enrollment API (see utils/enrollment.py)
+    BULK_ENROLL_BATCH_SIZE = int(os.environ.get('BULK_ENROLL_BATCH_SIZE') or 500)  # rows per batched INSERT
+    BULK_ENROLL_MAX_ROWS = int(os.environ.get('BULK_ENROLL_MAX_ROWS') or 50000)  # rows per request
+
+    # Grade import (see utils/grades.py)
+    GRADE_IMPORT_BATCH_SIZE = int(os.environ.get('GRADE_IMPORT_BATCH_SIZE') or 500)  # rows per UPDATE statement
+
+    # Degree audit (see utils/degree_audit.py)
+    DEGREE_AUDIT_BATCH_SIZE = int(os.environ.get('DEGREE_AUDIT_BATCH_SIZE') or 1000)  # rows per executemany() call
+
+    # Synthetic data loads (see utils/synthetic_data.py)
+    DATA_LOAD_BATCH_SIZE = int(os.environ.get('DATA_LOAD_BATCH_SIZE') or 5000)  # rows per multi-row INSERT
@@ -0,0 +1,52 @@
+-- ================================================================================
+-- SECTION 1 (continued): Secondary Indexes
+--
+-- schema.sql only declares primary keys (plus the single-column indexes InnoDB
+-- creates implicitly for foreign keys). This file adds composite indexes for
+-- the hot predicates used by the triggers, procedures, views and routes.
+--
+-- init_db runs this file after data.sql. To add the indexes to an existing
+-- database, run it once:
+--     mysql -u root -p CourseTracker < database/indexes.sql
+--
+-- Check plans against a large dataset with: python -m utils.plan_check
+-- ================================================================================
+
+USE CourseTracker;
+
+-- enrolls_in: per-section counts by status
+-- Used by: seat reconciliation (section_stats rebuild), analytics per course/section
+-- Also replaces the implicit FK index on (courseId, sectionNo)
+CREATE INDEX idx_enrolls_section_status
+    ON enrolls_in (courseId, sectionNo, status);
+
+-- enrolls_in: "has this student taken/enrolled in this course" lookups
+-- Used by: prereq_check, student_enrollment_status_check (covering: no row lookup)
+CREATE INDEX idx_enrolls_student_course_status
+    ON enrolls_in (studentId, courseId, status);
+
+-- prerequisite_of: prerequisites of a target course
+-- Used by: prereq_check (WHERE targetCourseId = NEW.courseId), covering
+CREATE INDEX idx_prereq_target
+    ON prerequisite_of (targetCourseId, prereqCourseId);
+
+-- cross_lists: codes of a course
+-- Used by: course_code_list view (GROUP BY courseId, covering)
+CREATE INDEX idx_cross_lists_course
+    ON cross_lists (courseId, code);
+
+-- assists: TAs of a section
+-- Used by: section_ta_list view (GROUP BY courseId, sectionNo, covering)
+CREATE INDEX idx_assists_section
+    ON assists (courseId, sectionNo, employeeId);
+
+-- teaches: professors of a course
+-- Used by: course_professor view (GROUP BY courseId, covering)
+CREATE INDEX idx_teaches_course
+    ON teaches (courseId, employeeId);
+
+-- Student: name-ordered walk of students
+-- Used by: admin dashboard keyset pagination (student name window, range on
+-- current_student_enrollments.studentName)
+CREATE INDEX idx_student_name
+    ON Student (name, studentId);
@@ -3,6 +3,7 @@
 --
 -- This section creates 1 stored procedure and 1 function as required by
 -- Deliverable 5. At least one includes input parameters.
+-- It also creates the enroll_student procedure used by the enrollment page.
 -- ================================================================================
 
 USE CourseTracker;
@@ -13,30 +14,119 @@ USE CourseTracker;
 -- Purpose: Validates section capacity before enrollment
 -- Parameters: courseParam (INT), sectionParam (CHAR(4))
 -- Called by: Enrollment page before inserting into enrolls_in
--- Demonstrates: Input parameters, JOIN, aggregation, conditional logic
+-- Demonstrates: Input parameters, conditional logic (reads section_stats)
 
 DELIMITER //
 CREATE PROCEDURE update_open_seats (IN courseParam INT, IN sectionParam CHAR(4))
 BEGIN
     DECLARE open_seats INT;
 
-    SELECT s.capacity - COUNT(e.studentId)
+    -- Primary-key read of the trigger-maintained counter
+    SELECT ss.open_seats
     INTO open_seats
-    FROM Section s
-    LEFT JOIN enrolls_in e
-        ON s.courseId = e.courseId
-        AND s.sectionNo = e.sectionNo
-        AND e.status = 'enrolled'
-    WHERE s.courseId = courseParam AND s.sectionNo = sectionParam
-    GROUP BY s.capacity;
+    FROM section_stats ss
+    WHERE ss.courseId = courseParam AND ss.sectionNo = sectionParam;
 
     IF open_seats <= 0 THEN
-        SIGNAL SQLSTATE '45000'
+        SIGNAL SQLSTATE '45002'
         SET MESSAGE_TEXT = 'Section at full capacity. Enrollment unavailable.';
     END IF;
 END //
 DELIMITER ;
 
+-- ==================================================
+-- PROCEDURE: enroll_student
+-- ==================================================
+-- Purpose: Enrolls a student in a section, running every enrollment check once
+-- Parameters: studentParam (INT), courseParam (INT), sectionParam (CHAR(4))
+-- Called by: Enrollment page (utils/enrollment.py enroll_student)
+-- Demonstrates: Locking read, handlers, SIGNAL/RESIGNAL with distinct SQLSTATEs
+--
+-- Replaces the three BEFORE INSERT triggers for this path: each check is one
+-- indexed lookup, then the INSERT runs with @enroll_checked set so the
+-- triggers do not repeat them. Failures signal (see triggers.sql header):
+--     45001 prerequisites, 45002 full, 45003 already enrolled,
+--     45004 already completed, 45005 no such section
+
+DELIMITER //
+CREATE PROCEDURE enroll_student (IN studentParam INT, IN courseParam INT, IN sectionParam CHAR(4))
+BEGIN
+    DECLARE section_capacity INT DEFAULT NULL;
+    DECLARE section_enrolled INT DEFAULT NULL;
+    DECLARE missing_prereqs INT;
+    DECLARE has_enrolled INT;
+    DECLARE has_completed INT;
+
+    -- No counter row: the section does not exist
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET section_capacity = NULL;
+
+    -- Never leave the trigger bypass flag set on this connection
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        SET @enroll_checked = NULL;
+        RESIGNAL;
+    END;
+
+    -- 1. Lock the section's seat counter (primary key) until commit, so
+    --    concurrent enrollments in this section queue here
+    SELECT ss.capacity, ss.enrolled_count
+    INTO section_capacity, section_enrolled
+    FROM section_stats ss
+    WHERE ss.courseId = courseParam AND ss.sectionNo = sectionParam
+    FOR UPDATE;
+
+    IF section_capacity IS NULL THEN
+        SIGNAL SQLSTATE '45005'
+        SET MESSAGE_TEXT = 'Section does not exist';
+    END IF;
+
+    -- 2. Prerequisites not completed (idx_prereq_target, idx_enrolls_student_course_status)
+    SELECT COUNT(*)
+    INTO missing_prereqs
+    FROM prerequisite_of p
+    WHERE p.targetCourseId = courseParam
+    AND NOT EXISTS (
+        SELECT 1
+        FROM enrolls_in e
+        WHERE e.studentId = studentParam
+        AND e.courseId = p.prereqCourseId
+        AND e.status = 'completed'
+    );
+
+    IF missing_prereqs > 0 THEN
+        SIGNAL SQLSTATE '45001'
+        SET MESSAGE_TEXT = 'Prerequisite(s) not met';
+    END IF;
+
+    -- 3. Capacity, from the counter read under the lock
+    IF section_enrolled >= section_capacity THEN
+        SIGNAL SQLSTATE '45002'
+        SET MESSAGE_TEXT = 'Section is full!';
+    END IF;
+
+    -- 4. Existing enrollment in any section of the course (one index range read)
+    SELECT COALESCE(MAX(e.status = 'enrolled'), 0), COALESCE(MAX(e.status = 'completed'), 0)
+    INTO has_enrolled, has_completed
+    FROM enrolls_in e
+    WHERE e.studentId = studentParam AND e.courseId = courseParam;
+
+    IF has_enrolled THEN
+        SIGNAL SQLSTATE '45003'
+        SET MESSAGE_TEXT = 'Student already enrolled in this course!';
+    ELSEIF has_completed THEN
+        SIGNAL SQLSTATE '45004'
+        SET MESSAGE_TEXT = 'Student already completed this course!';
+    END IF;
+
+    -- 5. Insert; the BEFORE INSERT triggers skip their checks, the AFTER
+    --    INSERT trigger increments the counter
+    SET @enroll_checked = 1;
+    INSERT INTO enrolls_in (studentId, courseId, sectionNo, status, grade, enrolledDate)
+    VALUES (studentParam, courseParam, sectionParam, 'enrolled', NULL, CURDATE());
+    SET @enroll_checked = NULL;
+END //
+DELIMITER ;
+
 -- ==================================================
 -- FUNCTION: average_department_salary
 -- ==================================================
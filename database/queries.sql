@@ -17,7 +17,7 @@ USE CourseTracker;
 -- QUERY 1: Course Catalog with Enrollment Info
 -- ==================================================
 -- Description: Displays all course sections with professor, TAs, and enrollment
--- Requirements: JOIN (Section-Course), correlated subqueries
+-- Requirements: JOIN (Section-Course), pre-aggregated helper views
 -- Website: Student Portal > Browse Courses
 
 SELECT
@@ -26,26 +26,16 @@ SELECT
     s.sectionNo,
     s.capacity,
     c.credits,
-    (SELECT GROUP_CONCAT(cl2.code SEPARATOR ', ')
-     FROM cross_lists cl2
-     WHERE cl2.courseId = c.courseId) AS code,
-    (SELECT prof_emp2.name
-     FROM teaches t2
-     JOIN Professor p2 ON t2.employeeId = p2.employeeId
-     JOIN Employee prof_emp2 ON p2.employeeId = prof_emp2.employeeId
-     WHERE t2.courseId = s.courseId
-     LIMIT 1) AS professor,
-    (SELECT GROUP_CONCAT(ta_emp2.name SEPARATOR ', ')
-     FROM assists a2
-     JOIN TA ta2 ON a2.employeeId = ta2.employeeId
-     JOIN Employee ta_emp2 ON ta2.employeeId = ta_emp2.employeeId
-     WHERE a2.courseId = s.courseId AND a2.sectionNo = s.sectionNo) AS tas,
-    (SELECT COUNT(*)
-     FROM enrolls_in e2
-     WHERE e2.courseId = s.courseId AND e2.sectionNo = s.sectionNo
-     AND e2.status = 'enrolled') AS num_enrolled
+    ccl.code,
+    cp.professor,
+    stl.tas,
+    COALESCE(ss.enrolled_count, 0) AS num_enrolled
 FROM Section s
 JOIN Course c ON c.courseId = s.courseId
+LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+LEFT JOIN course_professor cp ON cp.courseId = s.courseId
+LEFT JOIN section_ta_list stl ON stl.courseId = s.courseId AND stl.sectionNo = s.sectionNo
+LEFT JOIN section_stats ss ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
 ORDER BY c.title ASC, s.sectionNo ASC;
 
 -- ==================================================
@@ -63,28 +53,19 @@ ORDER BY title ASC;
 -- ==================================================
 -- QUERY 3: GPA Calculator (Aggregation + JOIN)
 -- ==================================================
--- Description: Calculates weighted GPA for a student based on completed courses
--- Requirements: JOINs (Student-enrolls_in-Course), aggregation (SUM, COUNT), GROUP BY
+-- Description: Reads a student's weighted GPA from the trigger-maintained student_gpa summary
+-- Requirements: JOIN (Student-student_gpa), primary-key lookup
 -- Website: Student Portal > GPA Calculator
 
 SELECT
     s.studentId,
     s.name,
-    SUM(CASE e.grade
-        WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-        WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-        WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-        WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-        WHEN 'F' THEN 0.0
-        ELSE 0.0
-    END * c.credits) / NULLIF(SUM(c.credits), 0) AS gpa,
-    COUNT(e.courseId) AS courses_completed,
-    SUM(c.credits) AS total_credits
+    g.gpa,
+    g.courses_completed,
+    g.credits AS total_credits
 FROM Student s
-JOIN enrolls_in e ON s.studentId = e.studentId
-JOIN Course c ON e.courseId = c.courseId
-WHERE s.studentId = 4001 AND e.status = 'completed' AND e.grade IS NOT NULL
-GROUP BY s.studentId, s.name;
+JOIN student_gpa g ON g.studentId = s.studentId
+WHERE s.studentId = 4001 AND g.courses_completed > 0;
 
 -- ==================================================
 -- QUERY 4: Salary Report (Aggregation + Subquery)
@@ -118,18 +99,12 @@ ORDER BY e.role, e.salary DESC;
 SELECT
     c.courseId,
     c.title,
-    AVG(CASE e.grade
-        WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-        WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-        WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-        WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-        WHEN 'F' THEN 0.0
-        ELSE 0.0
-    END) AS avg_grade,
+    AVG(gs.points) AS avg_grade,
     COUNT(e.studentId) AS student_count
 FROM Course c
 JOIN enrolls_in e ON c.courseId = e.courseId
-WHERE e.status = 'completed' AND e.grade IS NOT NULL
+JOIN grade_scale gs ON gs.grade = e.grade
+WHERE e.status = 'completed'
 GROUP BY c.courseId, c.title
 ORDER BY avg_grade DESC;
 
@@ -143,21 +118,15 @@ ORDER BY avg_grade DESC;
 SELECT
     p.employeeId,
     emp.name,
-    AVG(CASE e.grade
-        WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-        WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-        WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-        WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-        WHEN 'F' THEN 0.0
-        ELSE 0.0
-    END) AS avg_grade,
+    AVG(gs.points) AS avg_grade,
     COUNT(DISTINCT e.studentId) AS student_count,
     COUNT(DISTINCT t.courseId) AS courses_taught
 FROM Professor p
 JOIN Employee emp ON p.employeeId = emp.employeeId
 JOIN teaches t ON p.employeeId = t.employeeId
 JOIN enrolls_in e ON t.courseId = e.courseId
-WHERE e.status = 'completed' AND e.grade IS NOT NULL
+JOIN grade_scale gs ON gs.grade = e.grade
+WHERE e.status = 'completed'
 GROUP BY p.employeeId, emp.name
 ORDER BY avg_grade DESC;
 
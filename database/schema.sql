@@ -84,6 +84,21 @@ CREATE TABLE Requirement (
     reqType ENUM('genEd', 'core', 'other') NOT NULL
 );
 
+-- grade_scale: Grade points per letter grade (the single source of the
+-- A+ = 4.33 ... F = 0.0 mapping used by the GPA summary, views and analytics)
+CREATE TABLE grade_scale (
+    grade  ENUM('A+','A','A-','B+','B','B-',
+                'C+','C','C-','D+','D','D-','F') PRIMARY KEY,
+    points DECIMAL(3,2) NOT NULL CHECK (points >= 0)
+);
+
+INSERT INTO grade_scale (grade, points) VALUES
+('A+', 4.33), ('A', 4.00), ('A-', 3.67),
+('B+', 3.33), ('B', 3.00), ('B-', 2.67),
+('C+', 2.33), ('C', 2.00), ('C-', 1.67),
+('D+', 1.33), ('D', 1.00), ('D-', 0.67),
+('F',  0.00);
+
 -- Major: Degree programs with composite primary key (majorId, degreeType)
 CREATE TABLE Major (
     majorId    INTEGER      NOT NULL,
@@ -206,3 +221,96 @@ CREATE TABLE prerequisite_of (
     FOREIGN KEY (prereqCourseId) REFERENCES Course(courseId),
     FOREIGN KEY (targetCourseId) REFERENCES Course(courseId)
 );
+
+-- ==================================================
+-- 1.4 Derived Tables
+-- ==================================================
+
+-- section_stats: Materialized seat counters, one row per Section
+-- Maintained by the section_stats_* triggers in triggers.sql so that open-seat
+-- lookups are a primary-key read instead of a COUNT(*) over enrolls_in.
+-- Rebuild and check for drift with: python -m utils.reconcile_seats
+CREATE TABLE section_stats (
+    courseId       INTEGER NOT NULL,
+    sectionNo      CHAR(4) NOT NULL,
+    capacity       INTEGER NOT NULL DEFAULT 0,
+    enrolled_count INTEGER NOT NULL DEFAULT 0,
+    open_seats     INTEGER AS (capacity - enrolled_count) STORED,
+    PRIMARY KEY (courseId, sectionNo),
+    FOREIGN KEY (courseId, sectionNo) REFERENCES Section(courseId, sectionNo)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- course_grade_stats / professor_grade_stats: Grade analytics rollups.
+-- Refreshed by utils/analytics_rollup.py (background scheduler, "Refresh Now"
+-- on the analytics page, or python -m utils.analytics_rollup) for the courses
+-- and professors queued in analytics_dirty.
+CREATE TABLE course_grade_stats (
+    courseId      INTEGER       NOT NULL PRIMARY KEY,
+    student_count INTEGER       NOT NULL,
+    points_sum    DECIMAL(12,2) NOT NULL,
+    avg_grade     DECIMAL(6,4) AS (ROUND(points_sum / NULLIF(student_count, 0), 4)) STORED,
+    refreshedAt   DATETIME      NOT NULL,
+    FOREIGN KEY (courseId) REFERENCES Course(courseId) ON DELETE CASCADE
+);
+
+CREATE TABLE professor_grade_stats (
+    employeeId     INTEGER       NOT NULL PRIMARY KEY,
+    graded_count   INTEGER       NOT NULL,
+    points_sum     DECIMAL(12,2) NOT NULL,
+    avg_grade      DECIMAL(6,4) AS (ROUND(points_sum / NULLIF(graded_count, 0), 4)) STORED,
+    student_count  INTEGER       NOT NULL,
+    courses_taught INTEGER       NOT NULL,
+    refreshedAt    DATETIME      NOT NULL,
+    FOREIGN KEY (employeeId) REFERENCES Professor(employeeId) ON DELETE CASCADE
+);
+
+-- analytics_dirty: Courses and professors whose rollup rows are out of date,
+-- queued by the analytics_dirty_* triggers in triggers.sql
+-- (version is bumped on every re-mark, so a refresh only dequeues what it saw)
+CREATE TABLE analytics_dirty (
+    entity   ENUM('course', 'professor') NOT NULL,
+    entityId INTEGER NOT NULL,
+    version  INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (entity, entityId)
+);
+
+-- analytics_refresh: When each rollup was last refreshed (freshness shown on
+-- the analytics page)
+CREATE TABLE analytics_refresh (
+    rollup      VARCHAR(32) NOT NULL PRIMARY KEY,
+    refreshedAt DATETIME    NULL,
+    fullAt      DATETIME    NULL
+);
+
+-- NULL refreshedAt: never refreshed; the first refresh rebuilds everything
+INSERT INTO analytics_refresh (rollup) VALUES ('grade_stats');
+
+-- degree_audit: Requirement status per student, declared major and required
+-- requirement, for the advisor and registrar views. Written in one transaction
+-- by the batch degree audit: python -m utils.degree_audit
+CREATE TABLE degree_audit (
+    studentId  INTEGER NOT NULL,
+    majorId    INTEGER NOT NULL,
+    degreeType ENUM('BA', 'BS', 'BFA', 'BBA', 'BSE') NOT NULL,
+    reqId      INTEGER NOT NULL,
+    status     ENUM('met', 'in_progress', 'missing') NOT NULL,
+    auditedAt  DATETIME NOT NULL,
+    PRIMARY KEY (studentId, majorId, degreeType, reqId),
+    FOREIGN KEY (studentId, majorId, degreeType) REFERENCES declares(studentId, majorId, degreeType)
+        ON DELETE CASCADE,
+    FOREIGN KEY (reqId) REFERENCES Requirement(reqId)
+);
+
+-- student_gpa: Running GPA totals, one row per student with a graded completed
+-- course. Maintained by the student_gpa_* triggers in triggers.sql from the
+-- enrolls_in rows with status 'completed' and a grade, so the GPA page is a
+-- primary-key read instead of an aggregate over the student's history.
+CREATE TABLE student_gpa (
+    studentId         INTEGER       NOT NULL PRIMARY KEY,
+    quality_points    DECIMAL(10,2) NOT NULL DEFAULT 0,
+    credits           INTEGER       NOT NULL DEFAULT 0,
+    courses_completed INTEGER       NOT NULL DEFAULT 0,
+    gpa               DECIMAL(6,4) AS (ROUND(quality_points / NULLIF(credits, 0), 4)) STORED,
+    FOREIGN KEY (studentId) REFERENCES Student(studentId) ON DELETE CASCADE
+);
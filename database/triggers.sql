@@ -4,6 +4,23 @@
 -- This section creates 3 triggers as required by Deliverable 5.
 -- All triggers fire BEFORE INSERT on enrolls_in to validate enrollment requests.
 -- The website enrollment page demonstrates these triggers in action.
+--
+-- It also creates the AFTER triggers that keep the section_stats seat
+-- counters and the student_gpa totals current and queue analytics rollup
+-- refreshes (see the end of this file).
+--
+-- Each check signals its own SQLSTATE so callers can tell failures apart
+-- without parsing the message text:
+--     45001  Prerequisite(s) not met
+--     45002  Section is full
+--     45003  Student already enrolled in this course
+--     45004  Student already completed this course
+--     45005  Section does not exist (enroll_student procedure only)
+--
+-- The enroll_student procedure (procedures_functions.sql) runs all of these
+-- checks itself in one pass and sets @enroll_checked around its INSERT; the
+-- BEFORE INSERT triggers skip their checks for that insert. Direct INSERTs
+-- (bulk enrollment, data loads) are still fully checked by the triggers.
 -- ================================================================================
 
 USE CourseTracker;
@@ -22,22 +39,25 @@ FOR EACH ROW
 BEGIN
     DECLARE missing_prereqs INT;
 
-    -- Count prerequisites that the student has NOT completed
-    SELECT COUNT(*)
-    INTO missing_prereqs
-    FROM prerequisite_of p
-    WHERE p.targetCourseId = NEW.courseId
-    AND NOT EXISTS (
-        SELECT 1
-        FROM enrolls_in e
-        WHERE e.studentId = NEW.studentId
-        AND e.courseId = p.prereqCourseId
-        AND e.status = 'completed'
-    );
-
-    IF missing_prereqs > 0 THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Prerequisite(s) not met';
+    -- Already checked by the enroll_student procedure
+    IF @enroll_checked IS NULL THEN
+        -- Count prerequisites that the student has NOT completed
+        SELECT COUNT(*)
+        INTO missing_prereqs
+        FROM prerequisite_of p
+        WHERE p.targetCourseId = NEW.courseId
+        AND NOT EXISTS (
+            SELECT 1
+            FROM enrolls_in e
+            WHERE e.studentId = NEW.studentId
+            AND e.courseId = p.prereqCourseId
+            AND e.status = 'completed'
+        );
+
+        IF missing_prereqs > 0 THEN
+            SIGNAL SQLSTATE '45001'
+            SET MESSAGE_TEXT = 'Prerequisite(s) not met';
+        END IF;
     END IF;
 END //
 DELIMITER ;
@@ -57,21 +77,23 @@ BEGIN
     DECLARE section_capacity INTEGER;
     DECLARE section_enrolled INTEGER;
 
-    SELECT Section.capacity INTO section_capacity
-    FROM Section
-    WHERE Section.courseId = NEW.courseId
-    AND Section.sectionNo = NEW.sectionNo;
-
-    -- Only count currently enrolled students (not completed or withdrawn)
-    SELECT COUNT(*) INTO section_enrolled
-    FROM enrolls_in
-    WHERE enrolls_in.courseId = NEW.courseId
-    AND enrolls_in.sectionNo = NEW.sectionNo
-    AND enrolls_in.status = 'enrolled';
-
-    IF section_enrolled >= section_capacity THEN
-        SIGNAL SQLSTATE '45000'
-        SET MESSAGE_TEXT = 'Section is full!';
+    -- Already checked (under the same row lock) by the enroll_student procedure
+    IF @enroll_checked IS NULL THEN
+        -- O(1) lookup of the materialized counter (only counts status = 'enrolled').
+        -- FOR UPDATE reads the latest committed count and holds the row lock until
+        -- commit, so two concurrent inserts cannot both take the last seat: the
+        -- second one waits, then sees the first one's increment.
+        SELECT section_stats.capacity, section_stats.enrolled_count
+        INTO section_capacity, section_enrolled
+        FROM section_stats
+        WHERE section_stats.courseId = NEW.courseId
+        AND section_stats.sectionNo = NEW.sectionNo
+        FOR UPDATE;
+
+        IF section_enrolled >= section_capacity THEN
+            SIGNAL SQLSTATE '45002'
+            SET MESSAGE_TEXT = 'Section is full!';
+        END IF;
     END IF;
 END //
 DELIMITER ;
@@ -90,21 +112,303 @@ FOR EACH ROW
 BEGIN
     DECLARE existing_status VARCHAR(20);
 
-    -- Check if student has any existing enrollment for this course
-    SELECT enrolls_in.status INTO existing_status
-    FROM enrolls_in
-    WHERE enrolls_in.studentId = NEW.studentId
-    AND enrolls_in.courseId = NEW.courseId
-    LIMIT 1;
-
-    IF existing_status IS NOT NULL THEN
-        IF existing_status = 'enrolled' THEN
-            SIGNAL SQLSTATE '45000'
-            SET MESSAGE_TEXT = 'Student already enrolled in this course!';
-        ELSEIF existing_status = 'completed' THEN
-            SIGNAL SQLSTATE '45000'
-            SET MESSAGE_TEXT = 'Student already completed this course!';
+    -- Already checked by the enroll_student procedure
+    IF @enroll_checked IS NULL THEN
+        -- Check if student has any existing enrollment for this course
+        SELECT enrolls_in.status INTO existing_status
+        FROM enrolls_in
+        WHERE enrolls_in.studentId = NEW.studentId
+        AND enrolls_in.courseId = NEW.courseId
+        LIMIT 1;
+
+        IF existing_status IS NOT NULL THEN
+            IF existing_status = 'enrolled' THEN
+                SIGNAL SQLSTATE '45003'
+                SET MESSAGE_TEXT = 'Student already enrolled in this course!';
+            ELSEIF existing_status = 'completed' THEN
+                SIGNAL SQLSTATE '45004'
+                SET MESSAGE_TEXT = 'Student already completed this course!';
+            END IF;
+        END IF;
+    END IF;
+END //
+DELIMITER ;
+
+-- ==================================================
+-- section_stats maintenance
+-- ==================================================
+-- Purpose: Keeps section_stats.enrolled_count / open_seats in step with enrolls_in
+-- so capacity checks never need COUNT(*) over enrolls_in.
+-- Seed first: Section and enrolls_in rows loaded before these triggers exist
+-- are counted here. Rebuild at any time with: python -m utils.reconcile_seats
+
+INSERT INTO section_stats (courseId, sectionNo, capacity, enrolled_count)
+SELECT s.courseId, s.sectionNo, s.capacity, COUNT(e.studentId)
+FROM Section s
+LEFT JOIN enrolls_in e
+    ON e.courseId = s.courseId
+    AND e.sectionNo = s.sectionNo
+    AND e.status = 'enrolled'
+GROUP BY s.courseId, s.sectionNo, s.capacity
+ON DUPLICATE KEY UPDATE
+    capacity = VALUES(capacity),
+    enrolled_count = VALUES(enrolled_count);
+
+DELIMITER //
+CREATE TRIGGER section_stats_after_insert
+AFTER INSERT ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'enrolled' THEN
+        UPDATE section_stats
+        SET enrolled_count = enrolled_count + 1
+        WHERE courseId = NEW.courseId AND sectionNo = NEW.sectionNo;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER section_stats_after_update
+AFTER UPDATE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    -- Handles status changes (enrolled -> completed/withdrawn) and section moves
+    IF OLD.status = 'enrolled' THEN
+        UPDATE section_stats
+        SET enrolled_count = enrolled_count - 1
+        WHERE courseId = OLD.courseId AND sectionNo = OLD.sectionNo;
+    END IF;
+    IF NEW.status = 'enrolled' THEN
+        UPDATE section_stats
+        SET enrolled_count = enrolled_count + 1
+        WHERE courseId = NEW.courseId AND sectionNo = NEW.sectionNo;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER section_stats_after_delete
+AFTER DELETE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'enrolled' THEN
+        UPDATE section_stats
+        SET enrolled_count = enrolled_count - 1
+        WHERE courseId = OLD.courseId AND sectionNo = OLD.sectionNo;
+    END IF;
+END //
+DELIMITER ;
+
+-- New sections get a counter row; capacity changes flow into open_seats.
+-- Deleting a Section removes its counter row through ON DELETE CASCADE.
+
+DELIMITER //
+CREATE TRIGGER section_stats_section_insert
+AFTER INSERT ON Section
+FOR EACH ROW
+BEGIN
+    INSERT INTO section_stats (courseId, sectionNo, capacity, enrolled_count)
+    VALUES (NEW.courseId, NEW.sectionNo, NEW.capacity, 0);
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER section_stats_section_update
+AFTER UPDATE ON Section
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.capacity <=> OLD.capacity) THEN
+        UPDATE section_stats
+        SET capacity = NEW.capacity
+        WHERE courseId = NEW.courseId AND sectionNo = NEW.sectionNo;
+    END IF;
+END //
+DELIMITER ;
+
+-- ==================================================
+-- student_gpa maintenance
+-- ==================================================
+-- Purpose: Keeps the student_gpa running totals in step with enrolls_in so the
+-- GPA page reads one row instead of aggregating the student's history.
+-- A row counts toward the GPA when status = 'completed' and grade IS NOT NULL;
+-- it adds grade_scale.points x credits quality points, its credits and one
+-- completed course. Updates subtract the old row's share and add the new one's.
+-- Seed first: graded courses loaded before these triggers exist are summed here.
+-- Re-run this seed after changing grade_scale.
+
+INSERT INTO student_gpa (studentId, quality_points, credits, courses_completed)
+SELECT e.studentId, SUM(g.points * COALESCE(c.credits, 0)), SUM(COALESCE(c.credits, 0)), COUNT(*)
+FROM enrolls_in e
+JOIN grade_scale g ON g.grade = e.grade
+JOIN Course c ON c.courseId = e.courseId
+WHERE e.status = 'completed'
+GROUP BY e.studentId
+ON DUPLICATE KEY UPDATE
+    quality_points = VALUES(quality_points),
+    credits = VALUES(credits),
+    courses_completed = VALUES(courses_completed);
+
+DELIMITER //
+CREATE TRIGGER student_gpa_after_insert
+AFTER INSERT ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'completed' AND NEW.grade IS NOT NULL THEN
+        INSERT INTO student_gpa (studentId, quality_points, credits, courses_completed)
+        SELECT NEW.studentId, g.points * COALESCE(c.credits, 0), COALESCE(c.credits, 0), 1
+        FROM grade_scale g
+        JOIN Course c ON c.courseId = NEW.courseId
+        WHERE g.grade = NEW.grade
+        ON DUPLICATE KEY UPDATE
+            quality_points = student_gpa.quality_points + VALUES(quality_points),
+            credits = student_gpa.credits + VALUES(credits),
+            courses_completed = student_gpa.courses_completed + 1;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER student_gpa_after_update
+AFTER UPDATE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    -- Handles grade changes, completion (enrolled -> completed) and reversals
+    IF NOT (OLD.status <=> NEW.status AND OLD.grade <=> NEW.grade
+            AND OLD.studentId = NEW.studentId AND OLD.courseId = NEW.courseId) THEN
+        IF OLD.status = 'completed' AND OLD.grade IS NOT NULL THEN
+            UPDATE student_gpa sg
+            JOIN grade_scale g ON g.grade = OLD.grade
+            JOIN Course c ON c.courseId = OLD.courseId
+            SET sg.quality_points = sg.quality_points - g.points * COALESCE(c.credits, 0),
+                sg.credits = sg.credits - COALESCE(c.credits, 0),
+                sg.courses_completed = sg.courses_completed - 1
+            WHERE sg.studentId = OLD.studentId;
         END IF;
+        IF NEW.status = 'completed' AND NEW.grade IS NOT NULL THEN
+            INSERT INTO student_gpa (studentId, quality_points, credits, courses_completed)
+            SELECT NEW.studentId, g.points * COALESCE(c.credits, 0), COALESCE(c.credits, 0), 1
+            FROM grade_scale g
+            JOIN Course c ON c.courseId = NEW.courseId
+            WHERE g.grade = NEW.grade
+            ON DUPLICATE KEY UPDATE
+                quality_points = student_gpa.quality_points + VALUES(quality_points),
+                credits = student_gpa.credits + VALUES(credits),
+                courses_completed = student_gpa.courses_completed + 1;
+        END IF;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER student_gpa_after_delete
+AFTER DELETE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'completed' AND OLD.grade IS NOT NULL THEN
+        UPDATE student_gpa sg
+        JOIN grade_scale g ON g.grade = OLD.grade
+        JOIN Course c ON c.courseId = OLD.courseId
+        SET sg.quality_points = sg.quality_points - g.points * COALESCE(c.credits, 0),
+            sg.credits = sg.credits - COALESCE(c.credits, 0),
+            sg.courses_completed = sg.courses_completed - 1
+        WHERE sg.studentId = OLD.studentId;
     END IF;
 END //
 DELIMITER ;
+
+-- A change to a course's credits re-weights every graded completion of it.
+
+DELIMITER //
+CREATE TRIGGER student_gpa_course_update
+AFTER UPDATE ON Course
+FOR EACH ROW
+BEGIN
+    IF NOT (NEW.credits <=> OLD.credits) THEN
+        UPDATE student_gpa sg
+        JOIN (
+            SELECT e.studentId, SUM(g.points) AS points, COUNT(*) AS courses
+            FROM enrolls_in e
+            JOIN grade_scale g ON g.grade = e.grade
+            WHERE e.courseId = NEW.courseId AND e.status = 'completed'
+            GROUP BY e.studentId
+        ) d ON d.studentId = sg.studentId
+        SET sg.quality_points = sg.quality_points
+                + d.points * (CAST(COALESCE(NEW.credits, 0) AS SIGNED) - CAST(COALESCE(OLD.credits, 0) AS SIGNED)),
+            sg.credits = sg.credits
+                + d.courses * (CAST(COALESCE(NEW.credits, 0) AS SIGNED) - CAST(COALESCE(OLD.credits, 0) AS SIGNED));
+    END IF;
+END //
+DELIMITER ;
+
+-- ==================================================
+-- Analytics rollup change queue
+-- ==================================================
+-- Purpose: Queues the courses and professors whose grade statistics changed in
+-- analytics_dirty, so utils/analytics_rollup.py refreshes only those rows of
+-- course_grade_stats / professor_grade_stats. Only completed, graded
+-- enrollments feed the rollups; enrolling and dropping do not queue anything.
+
+DELIMITER //
+CREATE TRIGGER analytics_dirty_after_insert
+AFTER INSERT ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF NEW.status = 'completed' AND NEW.grade IS NOT NULL THEN
+        INSERT INTO analytics_dirty (entity, entityId) VALUES ('course', NEW.courseId)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER analytics_dirty_after_update
+AFTER UPDATE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status AND OLD.grade <=> NEW.grade
+            AND OLD.studentId = NEW.studentId AND OLD.courseId = NEW.courseId) THEN
+        IF OLD.status = 'completed' AND OLD.grade IS NOT NULL THEN
+            INSERT INTO analytics_dirty (entity, entityId) VALUES ('course', OLD.courseId)
+            ON DUPLICATE KEY UPDATE version = version + 1;
+        END IF;
+        IF NEW.status = 'completed' AND NEW.grade IS NOT NULL THEN
+            INSERT INTO analytics_dirty (entity, entityId) VALUES ('course', NEW.courseId)
+            ON DUPLICATE KEY UPDATE version = version + 1;
+        END IF;
+    END IF;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER analytics_dirty_after_delete
+AFTER DELETE ON enrolls_in
+FOR EACH ROW
+BEGIN
+    IF OLD.status = 'completed' AND OLD.grade IS NOT NULL THEN
+        INSERT INTO analytics_dirty (entity, entityId) VALUES ('course', OLD.courseId)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END //
+DELIMITER ;
+
+-- Teaching assignments change which grades count toward a professor.
+
+DELIMITER //
+CREATE TRIGGER analytics_dirty_teaches_insert
+AFTER INSERT ON teaches
+FOR EACH ROW
+BEGIN
+    INSERT INTO analytics_dirty (entity, entityId) VALUES ('professor', NEW.employeeId)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
+
+DELIMITER //
+CREATE TRIGGER analytics_dirty_teaches_delete
+AFTER DELETE ON teaches
+FOR EACH ROW
+BEGIN
+    INSERT INTO analytics_dirty (entity, entityId) VALUES ('professor', OLD.employeeId)
+    ON DUPLICATE KEY UPDATE version = version + 1;
+END //
+DELIMITER ;
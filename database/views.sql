@@ -3,16 +3,62 @@
 --
 -- This section creates 2 relational views as required by Deliverable 5.
 -- These views simplify common queries and demonstrate view creation skills.
+-- Three small helper views pre-aggregate per-course details for them.
 -- ================================================================================
 
 USE CourseTracker;
 
+-- ==================================================
+-- Helper views: pre-aggregated course details
+-- ==================================================
+-- Purpose: One row per course (or section) with the cross-listed codes,
+-- professor and TA names already aggregated. The enrollment views and the
+-- catalog queries join these once instead of running a correlated subquery
+-- for every output row, so their cost grows with rows + courses rather than
+-- rows x subqueries. Because they GROUP BY, MySQL materializes them whole and
+-- cannot push a studentId filter into them: per-student reads (the student
+-- dashboard and GPA page) use LATERAL lookups instead (routes/student_routes.py).
+
+-- Cross-listed codes per course (e.g., 'CS:1210, ECE:1210')
+CREATE VIEW course_code_list AS
+SELECT
+    cl.courseId,
+    GROUP_CONCAT(cl.code SEPARATOR ', ') AS code
+FROM cross_lists cl
+GROUP BY cl.courseId;
+
+-- Professor name per course. When several teach it, the one with the lowest
+-- employeeId: the row the original per-row LIMIT 1 lookup read first through
+-- the teaches (courseId, employeeId) index.
+CREATE VIEW course_professor AS
+SELECT
+    first_prof.courseId,
+    prof_emp.name AS professor
+FROM (
+    SELECT t.courseId, MIN(t.employeeId) AS employeeId
+    FROM teaches t
+    JOIN Professor p ON t.employeeId = p.employeeId
+    GROUP BY t.courseId
+) first_prof
+JOIN Employee prof_emp ON prof_emp.employeeId = first_prof.employeeId;
+
+-- TA names per section
+CREATE VIEW section_ta_list AS
+SELECT
+    a.courseId,
+    a.sectionNo,
+    GROUP_CONCAT(ta_emp.name SEPARATOR ', ') AS tas
+FROM assists a
+JOIN TA ta ON a.employeeId = ta.employeeId
+JOIN Employee ta_emp ON ta.employeeId = ta_emp.employeeId
+GROUP BY a.courseId, a.sectionNo;
+
 -- ==================================================
 -- VIEW 1: current_student_enrollments
 -- ==================================================
 -- Purpose: Shows all currently enrolled students with course details
--- Used by: Student dashboard to display current schedule
--- Demonstrates: JOINs across 4 tables, correlated subqueries
+-- Used by: Admin dashboard, analytics sample and the current-enrollments export
+-- Demonstrates: JOINs across 4 tables plus pre-aggregated helper views
 
 CREATE VIEW current_student_enrollments AS
 SELECT
@@ -28,32 +74,24 @@ SELECT
     e.status,
     e.grade,
     e.enrolledDate,
-    (SELECT GROUP_CONCAT(cl.code SEPARATOR ', ')
-     FROM cross_lists cl
-     WHERE cl.courseId = c.courseId) AS code,
-    (SELECT prof_emp.name
-     FROM teaches t
-     JOIN Professor p ON t.employeeId = p.employeeId
-     JOIN Employee prof_emp ON p.employeeId = prof_emp.employeeId
-     WHERE t.courseId = c.courseId
-     LIMIT 1) AS professor,
-    (SELECT GROUP_CONCAT(ta_emp.name SEPARATOR ', ')
-     FROM assists a
-     JOIN TA ta ON a.employeeId = ta.employeeId
-     JOIN Employee ta_emp ON ta.employeeId = ta_emp.employeeId
-     WHERE a.courseId = c.courseId AND a.sectionNo = se.sectionNo) AS tas
+    ccl.code,
+    cp.professor,
+    stl.tas
 FROM Student s
 JOIN enrolls_in e ON s.studentId = e.studentId
 JOIN Section se ON e.courseId = se.courseId AND e.sectionNo = se.sectionNo
 JOIN Course c ON se.courseId = c.courseId
+LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+LEFT JOIN course_professor cp ON cp.courseId = c.courseId
+LEFT JOIN section_ta_list stl ON stl.courseId = se.courseId AND stl.sectionNo = se.sectionNo
 WHERE e.status = 'enrolled';
 
 -- ==================================================
 -- VIEW 2: completed_student_courses
 -- ==================================================
 -- Purpose: Shows all completed courses with grades and grade points
--- Used by: GPA calculator and transcript generation
--- Demonstrates: JOINs, CASE expression for grade point conversion
+-- Used by: Analytics sample and the completed-courses export
+-- Demonstrates: JOINs, grade_scale lookup for grade point conversion
 
 CREATE VIEW completed_student_courses AS
 SELECT
@@ -68,19 +106,12 @@ SELECT
     e.status,
     e.grade,
     e.enrolledDate,
-    (SELECT GROUP_CONCAT(cl.code SEPARATOR ', ')
-     FROM cross_lists cl
-     WHERE cl.courseId = c.courseId) AS code,
-    CASE e.grade
-        WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-        WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-        WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-        WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-        WHEN 'F' THEN 0.0
-        ELSE 0.0
-    END AS grade_points
+    ccl.code,
+    COALESCE(gs.points, 0.0) AS grade_points
 FROM Student s
 JOIN enrolls_in e ON s.studentId = e.studentId
 JOIN Section se ON e.courseId = se.courseId AND e.sectionNo = se.sectionNo
 JOIN Course c ON se.courseId = c.courseId
+LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+LEFT JOIN grade_scale gs ON gs.grade = e.grade
 WHERE e.status = 'completed';
@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration for CourseTracker
+
+Serves wsgi:app with WEB_WORKERS processes of WEB_THREADS threads each
+(gthread workers). The app is preloaded in the master, so workers fork with
+templates, routes and configuration already imported and start quickly;
+each worker then opens its own connection pool (see get_pool()) and starts
+its own analytics refresh thread here, and opens its connections before
+taking requests (warm-up, see utils/warmup.py). Point the load balancer's
+health check at /readyz.
+
+Every setting comes from config.Config and so from the environment / .env.
+Size the pools so that WEB_WORKERS * (DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW)
+stays below MySQL's max_connections.
+
+Signals (sent to the master):
+    HUP:  graceful reload - start new workers with the current config,
+          let the old ones finish their requests (WEB_GRACEFUL_TIMEOUT)
+    USR2 then QUIT to the old master: load new code with zero downtime
+          (with preload_app, HUP alone keeps the already imported code)
+    TERM: graceful shutdown
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from config import Config
+
+wsgi_app = 'wsgi:app'
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+worker_class = 'gthread'
+threads = Config.WEB_THREADS
+preload_app = True
+
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = Config.WEB_KEEPALIVE
+max_requests = Config.WEB_MAX_REQUESTS
+max_requests_jitter = Config.WEB_MAX_REQUESTS // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Print the serving banner once the master is listening."""
+    print("=" * 70)
+    print(f"CourseTracker serving on {Config.WEB_BIND}: {Config.WEB_WORKERS} worker(s) x "
+          f"{Config.WEB_THREADS} thread(s)")
+    print("=" * 70)
+
+
+def post_fork(server, worker):
+    """
+    Start the worker's analytics refresh thread (threads do not survive fork)
+    and open its pool connections.
+    """
+    from utils.analytics_rollup import start_refresh_scheduler
+    from utils.warmup import warm_up, print_report
+    from wsgi import app
+
+    start_refresh_scheduler(Config.ANALYTICS_REFRESH_INTERVAL)
+    if Config.WARMUP_ON_START:
+        print_report(warm_up(app, steps=('connections',)), prefix=f"[worker {worker.pid}] ")
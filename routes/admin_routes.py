@@ -1,39 +1,304 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from utils.db_connection import execute_query, execute_update, call_function, call_procedure
+from itertools import chain
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort, Response
+from mysql.connector import Error
+from utils.db_connection import execute_query, execute_update, call_function_many, unit_of_work, stream_query
 from utils.auth import login_required
+from utils.cache import catalog_cache, bump_catalog_version
+from utils.metrics import render_metrics
+from utils.slow_queries import slow_query_log
+from utils.warmup import register_warmer
+from utils.parallel import run_parallel
+from utils.pagination import encode_cursor, decode_cursor, keyset_params
+from utils.export import EXPORT_DATASETS, EXPORT_FORMATS, csv_stream, ndjson_stream, gzip_stream
+from utils.enrollment import parse_enrollment_rows, bulk_enroll, ENROLLMENT_ERROR_MESSAGES
+from utils.grades import GRADES, parse_grade_csv, import_grades
+from utils.degree_audit import audit_students, run_audit
+from utils.analytics_rollup import refresh_rollups
+from config import Config
 
 admin_bp = Blueprint('admin', __name__)
 
+# Sort key of the enrollment dashboard; the last row's values form the page cursor
+ENROLLMENT_SORT_KEY = ('studentName', 'title', 'studentId', 'courseId', 'sectionNo')
+
+
+def _page_size():
+    """Rows per dashboard page from ?page_size=, clamped to the configured bounds."""
+    size = request.args.get('page_size', type=int) or Config.ADMIN_PAGE_SIZE
+    return max(1, min(size, Config.ADMIN_PAGE_SIZE_MAX))
+
+
+def _student_name_window(start_name, limit):
+    """
+    Find the range of student names the next dashboard page can come from.
+
+    Walks idx_student_name from start_name and returns the first `limit`
+    distinct names that have a current enrollment. Each name contributes at
+    least one row, so `limit` = page size + 2 names always cover a full page
+    plus the look-ahead row, whatever the cursor's own name still holds.
+
+    Args:
+        start_name (str): Name of the last student shown ('' for the first page)
+        limit (int): Number of distinct names to return
+
+    Returns:
+        tuple: (upper_bound, loaded) where upper_bound is the last name in the
+        window (None if it runs to the end of the table) and loaded is False
+        if the query failed
+    """
+    sql = """
+        SELECT s.name
+        FROM Student s
+        WHERE s.name >= %s
+          AND EXISTS (
+              SELECT 1 FROM enrolls_in e
+              WHERE e.studentId = s.studentId AND e.status = 'enrolled'
+          )
+        GROUP BY s.name
+        ORDER BY s.name
+        LIMIT %s
+    """
+    names = execute_query(sql, (start_name, limit))
+    if names is None:
+        return None, False
+    if len(names) < limit:
+        return None, True
+    return names[-1]['name'], True
+
+
+def _dashboard_filter_options():
+    """Courses and professors for the dashboard filter dropdowns (cached)."""
+    def load():
+        courses = execute_query("SELECT courseId, title FROM Course ORDER BY title, courseId")
+        professors = execute_query("""
+            SELECT p.employeeId, e.name
+            FROM Professor p
+            JOIN Employee e ON p.employeeId = e.employeeId
+            ORDER BY e.name, p.employeeId
+        """)
+        if courses is None or professors is None:
+            return None
+        return {'courses': courses, 'professors': professors}
+
+    return catalog_cache.get_or_load('admin_filter_options', load) or {'courses': [], 'professors': []}
+
+register_warmer('admin filter options', _dashboard_filter_options)
+
+
+def _redirect_to_dashboard():
+    """Redirect back to the dashboard page (filters and cursor) the form was posted from."""
+    target = request.form.get('next', '')
+    if target.startswith(url_for('admin.index')) and not target.startswith('//'):
+        return redirect(target)
+    return redirect(url_for('admin.index'))
+
+
 @admin_bp.route('/')
 @login_required(role='admin')
 def index():
-    """Admin dashboard/home page with all current enrollments using database view"""
+    """
+    Admin dashboard/home page with current enrollments using database view.
+
+    The enrollment list is keyset-paginated on (studentName, title, studentId,
+    courseId, sectionNo): ?after= carries the sort key of the last row shown and
+    the next page is read with a range predicate instead of OFFSET, so deep
+    pages cost the same as the first one. Optional filters: ?course=<courseId>,
+    ?professor=<employeeId>, ?student=<studentId or name prefix>.
+    """
+    page_size = _page_size()
+    cursor = decode_cursor(request.args.get('after'), len(ENROLLMENT_SORT_KEY))
+    course_id = request.args.get('course', type=int)
+    professor_id = request.args.get('professor', type=int)
+    student = request.args.get('student', '').strip()
+    filters = {'course': course_id, 'professor': professor_id, 'student': student}
+
+    # Available grades for dropdown
+    grades = GRADES
+
     try:
-        # Get all current enrollments using the current_student_enrollments view
+        student_id = int(student) if student.isdigit() else None
+        name_prefix = None
+        if student and student_id is None:
+            name_prefix = student.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+        lower_name = cursor[0] if cursor else ''
+        upper_name = None
+        if not (course_id or professor_id or student):
+            # Unfiltered: ORDER BY spans Student and Course, so bound the rows
+            # MySQL has to sort to a small window of student names first
+            upper_name, ok = _student_name_window(lower_name, page_size + 2)
+            if not ok:
+                raise RuntimeError('could not read the student name window')
+
+        # NULL parameters switch their condition off; MySQL folds the
+        # "NULL IS NULL OR ..." branches away before choosing a plan
         current_enrollments_sql = """
             SELECT studentId, studentName, courseId, title, credits, sectionNo, grade, code, professor
             FROM current_student_enrollments
-            ORDER BY studentName ASC, title ASC
+            WHERE studentName >= %s
+              AND (%s IS NULL OR studentName <= %s)
+              AND (%s IS NULL OR courseId = %s)
+              AND (%s IS NULL OR courseId IN (SELECT t.courseId FROM teaches t WHERE t.employeeId = %s))
+              AND (%s IS NULL OR studentId = %s)
+              AND (%s IS NULL OR studentName LIKE %s)
+              AND (%s IS NULL
+                   OR studentName > %s OR (studentName = %s AND (
+                      title > %s OR (title = %s AND (
+                      studentId > %s OR (studentId = %s AND (
+                      courseId > %s OR (courseId = %s AND sectionNo > %s))))))))
+            ORDER BY studentName ASC, title ASC, studentId ASC, courseId ASC, sectionNo ASC
+            LIMIT %s
         """
+        keyset = keyset_params(cursor) if cursor else [None] * (2 * len(ENROLLMENT_SORT_KEY) - 1)
+        params = [lower_name,
+                  upper_name, upper_name,
+                  course_id, course_id,
+                  professor_id, professor_id,
+                  student_id, student_id,
+                  name_prefix, name_prefix,
+                  1 if cursor else None] + keyset + [page_size + 1]
 
-        current_enrollments = execute_query(current_enrollments_sql)
+        current_enrollments = execute_query(current_enrollments_sql, tuple(params))
 
         if current_enrollments is None:
             current_enrollments = []
+            flash('Error loading enrollments.', 'error')
 
-        # Available grades for dropdown
-        grades = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F']
+        # One look-ahead row tells us whether there is a next page
+        next_cursor = None
+        if len(current_enrollments) > page_size:
+            current_enrollments = current_enrollments[:page_size]
+            last = current_enrollments[-1]
+            next_cursor = encode_cursor([last[column] for column in ENROLLMENT_SORT_KEY])
 
         return render_template('admin/index.html',
                              current_enrollments=current_enrollments,
-                             grades=grades)
+                             grades=grades,
+                             filters=filters,
+                             filter_options=_dashboard_filter_options(),
+                             page_size=page_size,
+                             next_cursor=next_cursor,
+                             is_first_page=cursor is None)
 
     except Exception as e:
         flash('Error loading enrollments.', 'error')
         print(f"Error in admin index route: {e}")
         return render_template('admin/index.html',
                              current_enrollments=[],
-                             grades=[])
+                             grades=[],
+                             filters=filters,
+                             filter_options={'courses': [], 'professors': []},
+                             page_size=page_size,
+                             next_cursor=None,
+                             is_first_page=True)
+
+
+@admin_bp.route('/export/<dataset>.<fmt>')
+@login_required(role='admin')
+def export(dataset, fmt):
+    """
+    Stream a full dump of an enrollment view as CSV or NDJSON.
+
+    Datasets: current-enrollments (current_student_enrollments) and
+    completed-courses (completed_student_courses). Add ?gzip=1 to compress the
+    download. Rows are read with an unbuffered cursor and sent chunk by chunk,
+    so the first bytes go out before the query finishes.
+    """
+    if dataset not in EXPORT_DATASETS or fmt not in EXPORT_FORMATS:
+        abort(404)
+
+    sql, columns = EXPORT_DATASETS[dataset]
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+    chunks = stream_query(sql, chunk_size=Config.EXPORT_CHUNK_SIZE)
+    try:
+        # Run the query now so connection and SQL errors are reported before
+        # the response headers are sent
+        first = next(chunks, [])
+    except Error as e:
+        flash('Error exporting data.', 'error')
+        print(f"Error in admin export route: {e}")
+        return redirect(url_for('admin.index'))
+
+    encode = csv_stream if fmt == 'csv' else ndjson_stream
+    body = encode(chain([first], chunks), columns)
+    filename = f"{dataset}.{fmt}"
+    mimetype = EXPORT_FORMATS[fmt]
+    if compress:
+        body = gzip_stream(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        # Ask reverse proxies not to buffer the whole download
+        'X-Accel-Buffering': 'no',
+    })
+    # Release the connection promptly if the client disconnects mid-download
+    response.call_on_close(chunks.close)
+    return response
+
+
+@admin_bp.route('/bulk-enroll', methods=['POST'])
+@login_required(role='admin')
+def bulk_enroll_api():
+    """
+    Enroll a cohort of students in one request (JSON API).
+
+    Body: JSON list of {"studentId", "courseId", "sectionNo"} objects (or
+    [studentId, courseId, sectionNo] lists), or CSV as the request body
+    (Content-Type: text/csv) or as an uploaded "file". All rows run in one
+    transaction; a row rejected by a trigger or constraint is reported and
+    skipped without affecting the others. Optional ?batch_size=.
+
+    Returns:
+        JSON report: per-row results, counts and throughput in rows/second
+    """
+    upload = request.files.get('file')
+    try:
+        if upload:
+            rows, invalid = parse_enrollment_rows(text=upload.read().decode('utf-8-sig'))
+        elif request.is_json:
+            rows, invalid = parse_enrollment_rows(data=request.get_json(silent=True))
+        else:
+            rows, invalid = parse_enrollment_rows(text=request.get_data(as_text=True))
+    except UnicodeDecodeError:
+        return jsonify(error='The file must be UTF-8 encoded CSV.'), 400
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    total = len(rows) + len(invalid)
+    if total == 0:
+        return jsonify(error='No rows provided.'), 400
+    if total > Config.BULK_ENROLL_MAX_ROWS:
+        return jsonify(error=f'At most {Config.BULK_ENROLL_MAX_ROWS} rows per request.'), 413
+
+    batch_size = max(1, request.args.get('batch_size', type=int) or Config.BULK_ENROLL_BATCH_SIZE)
+
+    try:
+        results, elapsed = bulk_enroll(rows, batch_size=batch_size)
+    except Error as e:
+        print(f"Error in admin bulk_enroll route: {e}")
+        return jsonify(error=f'Bulk enrollment failed and was rolled back: {e.msg}'), 500
+
+    results.extend({'row': number, 'status': 'invalid', 'reason': 'invalid',
+                    'message': ENROLLMENT_ERROR_MESSAGES['invalid'], 'input': record}
+                   for number, record in invalid)
+    results.sort(key=lambda r: r['row'])
+
+    enrolled = sum(1 for r in results if r['status'] == 'enrolled')
+    if enrolled:
+        bump_catalog_version()
+
+    return jsonify(
+        total=total,
+        enrolled=enrolled,
+        failed=total - enrolled,
+        batch_size=batch_size,
+        elapsed_seconds=round(elapsed, 4),
+        rows_per_second=round(len(rows) / elapsed, 1) if elapsed else None,
+        results=results,
+    )
 
 
 @admin_bp.route('/drop/<int:student_id>/<course_id>/<int:section_no>', methods=['POST'])
@@ -45,14 +310,16 @@ def drop_enrollment(student_id, course_id, section_no):
             DELETE FROM enrolls_in
             WHERE studentId = %s AND courseId = %s AND sectionNo = %s AND status = 'enrolled'
         """
-        execute_update(sql, (student_id, course_id, section_no))
-        call_procedure('update_open_seats', (course_id, section_no))
+        # One transaction; the enrolls_in triggers keep section_stats in step
+        with unit_of_work() as uow:
+            uow.execute(sql, (student_id, course_id, section_no))
+        bump_catalog_version()
         flash('Successfully dropped the student from the course.', 'success')
     except Exception as e:
         flash(f'Error dropping enrollment: {str(e)}', 'error')
         print(f"Error in admin drop_enrollment route: {e}")
 
-    return redirect(url_for('admin.index'))
+    return _redirect_to_dashboard()
 
 
 @admin_bp.route('/update-grade/<int:student_id>/<course_id>/<int:section_no>', methods=['POST'])
@@ -78,12 +345,188 @@ def update_grade(student_id, course_id, section_no):
             """
             execute_update(sql, (new_grade, student_id, course_id, section_no))
 
+        bump_catalog_version()
         flash('Grade updated successfully.', 'success')
     except Exception as e:
         flash(f'Error updating grade: {str(e)}', 'error')
         print(f"Error in admin update_grade route: {e}")
 
-    return redirect(url_for('admin.index'))
+    return _redirect_to_dashboard()
+
+@admin_bp.route('/grade-import', methods=['GET', 'POST'])
+@login_required(role='admin')
+def grade_import():
+    """
+    Import grades from a CSV of studentId, courseId, sectionNo, grade, status.
+
+    The file is validated in memory first; if any row is invalid nothing is
+    applied. Valid files are compared with the stored grades and the changed
+    rows are written in one transaction, or only shown when "dry run" is
+    checked.
+    """
+    if request.method == 'GET':
+        return render_template('admin/grade_import.html', report=None, errors=[])
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Please choose a CSV file to import.', 'error')
+        return redirect(url_for('admin.grade_import'))
+
+    dry_run = bool(request.form.get('dry_run'))
+    try:
+        text = upload.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        flash('The file must be UTF-8 encoded CSV.', 'error')
+        return redirect(url_for('admin.grade_import'))
+
+    rows, errors = parse_grade_csv(text)
+    if errors:
+        flash(f'{len(errors)} invalid row(s); nothing was imported.', 'error')
+        return render_template('admin/grade_import.html', report=None, errors=errors)
+    if not rows:
+        flash('The file contains no grade rows.', 'error')
+        return redirect(url_for('admin.grade_import'))
+
+    try:
+        report = import_grades(rows, dry_run=dry_run, batch_size=Config.GRADE_IMPORT_BATCH_SIZE)
+    except Error as e:
+        flash(f'Error importing grades: {e.msg}', 'error')
+        print(f"Error in admin grade_import route: {e}")
+        return redirect(url_for('admin.grade_import'))
+
+    if report['updated']:
+        bump_catalog_version()
+        flash(f"✓ Updated {report['updated']} enrollment(s).", 'success')
+    elif dry_run:
+        flash(f"Dry run: {len(report['changes'])} enrollment(s) would change.", 'info')
+    else:
+        flash('No grades changed.', 'info')
+
+    return render_template('admin/grade_import.html', report=report, errors=[])
+
+
+@admin_bp.route('/degree-audit')
+@login_required(role='admin')
+def degree_audit():
+    """
+    Degree audit overview for the registrar, plus a live audit of one student.
+
+    The per-major summary reads the degree_audit table written by the last
+    batch audit. ?studentId= audits that student live (advisor view) with the
+    same set-based queries the batch uses.
+    """
+    summary_sql = """
+        SELECT
+            t.majorId,
+            t.degreeType,
+            m.name,
+            COUNT(*) AS students,
+            SUM(t.missing = 0 AND t.in_progress = 0) AS complete,
+            SUM(t.missing = 0 AND t.in_progress > 0) AS on_track,
+            SUM(t.missing > 0) AS behind,
+            AVG(t.met / t.required) AS avg_met,
+            MAX(t.auditedAt) AS auditedAt
+        FROM (
+            SELECT studentId, majorId, degreeType,
+                   SUM(status = 'met') AS met,
+                   SUM(status = 'in_progress') AS in_progress,
+                   SUM(status = 'missing') AS missing,
+                   COUNT(*) AS required,
+                   MAX(auditedAt) AS auditedAt
+            FROM degree_audit
+            GROUP BY studentId, majorId, degreeType
+        ) t
+        JOIN Major m ON m.majorId = t.majorId AND m.degreeType = t.degreeType
+        GROUP BY t.majorId, t.degreeType, m.name
+        ORDER BY m.name
+    """
+    summary = execute_query(summary_sql) or []
+
+    student_id = request.args.get('studentId', type=int)
+    student, audits = None, []
+    if student_id:
+        student = execute_query("SELECT studentId, name FROM Student WHERE studentId = %s",
+                                (student_id,), fetch_one=True)
+        if student is None:
+            flash(f'Student {student_id} not found.', 'error')
+        else:
+            requirements = catalog_cache.get_or_load('requirements', lambda: execute_query(
+                "SELECT reqId, name, reqType FROM Requirement ORDER BY reqId"))
+            majors = catalog_cache.get_or_load('majors', lambda: execute_query(
+                "SELECT majorId, degreeType, name FROM Major"))
+            req_by_id = {r['reqId']: r for r in requirements or []}
+            major_names = {(m['majorId'], m['degreeType']): m['name'] for m in majors or []}
+            try:
+                with unit_of_work() as uow:
+                    audits = audit_students(uow, student_id)
+            except Error as e:
+                flash(f'Error auditing student: {e.msg}', 'error')
+                print(f"Error in admin degree_audit route: {e}")
+            for audit in audits:
+                audit['name'] = major_names.get((audit['majorId'], audit['degreeType']))
+                audit['requirements'] = sorted(
+                    ({'reqId': req_id, 'status': status,
+                      'name': req_by_id.get(req_id, {}).get('name'),
+                      'reqType': req_by_id.get(req_id, {}).get('reqType')}
+                     for status in ('met', 'in_progress', 'missing')
+                     for req_id in audit[status]),
+                    key=lambda r: r['reqId'])
+
+    return render_template('admin/degree_audit.html',
+                           summary=summary,
+                           student_id=student_id,
+                           student=student,
+                           audits=audits)
+
+
+@admin_bp.route('/degree-audit/run', methods=['POST'])
+@login_required(role='admin')
+def run_degree_audit():
+    """Re-audit the whole student body and replace the degree_audit table."""
+    try:
+        report = run_audit()
+    except Error as e:
+        flash(f'Degree audit failed and was rolled back: {e.msg}', 'error')
+        print(f"Error in admin run_degree_audit route: {e}")
+        return redirect(url_for('admin.degree_audit'))
+
+    flash(f"✓ Audited {report['majors']} declared major(s) of {report['students']} student(s) "
+          f"in {report['timings']['total']:.2f}s.", 'success')
+    return redirect(url_for('admin.degree_audit'))
+
+
+@admin_bp.route('/cache-stats')
+@login_required(role='admin')
+def cache_stats():
+    """Catalog cache counters (version, size, hits, misses, hit ratio) as JSON"""
+    return jsonify(catalog=catalog_cache.stats())
+
+
+@admin_bp.route('/metrics')
+@login_required(role='admin')
+def metrics():
+    """Query, request, pool and cache metrics in the Prometheus text format"""
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@admin_bp.route('/slow-queries')
+@login_required(role='admin')
+def slow_queries():
+    """Slow statements captured by execute_query/execute_update, slowest total first"""
+    return render_template('admin/slow_queries.html',
+                           statements=slow_query_log.summary(),
+                           threshold_ms=slow_query_log.threshold * 1000,
+                           buffer_size=slow_query_log.maxlen,
+                           log_file=slow_query_log.path)
+
+
+@admin_bp.route('/slow-queries/clear', methods=['POST'])
+@login_required(role='admin')
+def clear_slow_queries():
+    """Empty the slow query log"""
+    slow_query_log.clear()
+    flash('✓ Slow query log cleared.', 'success')
+    return redirect(url_for('admin.slow_queries'))
 
 # ============================================================================
 # QUERY 4: Salary Analysis with Department Comparison
@@ -94,12 +537,13 @@ def update_grade(student_id, course_id, section_no):
 def salary_report():
     """
     Display employee salaries compared to role averages using subqueries, aggregation,
-    and the average_department_salary stored function.
+    and the average_department_salary stored function. The page runs three queries
+    regardless of the number of departments.
 
     SQL Requirements Met:
     - SUBQUERY ✓ (role average salary subquery)
     - AGGREGATION ✓ (AVG in subquery)
-    - FUNCTION ✓ (average_department_salary)
+    - FUNCTION ✓ (average_department_salary, every department in one call_function_many())
     - JOIN ✓ (Employee with subquery)
 
     Note: Database views are demonstrated in the analytics route.
@@ -127,21 +571,19 @@ def salary_report():
         if employees is None:
             employees = []
 
-        # Part 2: Department average salaries (demonstrates FUNCTION)
-        # Get all unique departments first
-        dept_sql = "SELECT DISTINCT deptId, name FROM Department ORDER BY name"
-        departments = execute_query(dept_sql)
-
-        department_averages = []
-        if departments:
-            for dept in departments:
-                avg_salary = call_function('average_department_salary', (dept['deptId'],))
-                if avg_salary is not None:
-                    department_averages.append({
-                        'deptId': dept['deptId'],
-                        'name': dept['name'],
-                        'average_salary': avg_salary
-                    })
+        # Part 2: Department average salaries (demonstrates FUNCTION). The
+        # function is evaluated for every department in one query rather than
+        # one call_function() per department.
+        dept_sql = "SELECT deptId, name FROM Department ORDER BY name"
+        departments = execute_query(dept_sql) or []
+
+        averages = call_function_many('average_department_salary',
+                                      [(dept['deptId'],) for dept in departments]) or []
+        department_averages = [
+            {'deptId': dept['deptId'], 'name': dept['name'], 'average_salary': avg_salary}
+            for dept, avg_salary in zip(departments, averages)
+            if avg_salary is not None
+        ]
 
         return render_template('admin/salary_report.html',
                              employees=employees,
@@ -162,85 +604,82 @@ def salary_report():
 @login_required(role='admin')
 def analytics():
     """
-    Display average grades per course and per professor using aggregation
-    with both database views (current_student_enrollments and completed_student_courses).
+    Display average grades per course and per professor from the grade
+    analytics rollups, plus samples of both database views
+    (current_student_enrollments and completed_student_courses).
 
     SQL Requirements Met:
-    - AGGREGATION ✓ (AVG, GROUP BY)
-    - JOIN ✓ (Multiple joins across tables)
+    - AGGREGATION ✓ (AVG, COUNT, GROUP BY - precomputed in the rollup tables)
+    - JOIN ✓ (rollups joined to Course / Employee)
     - VIEW ✓ (current_student_enrollments, completed_student_courses)
+
+    course_grade_stats and professor_grade_stats are refreshed in the
+    background (utils/analytics_rollup.py); the page shows when they were
+    last refreshed and how many changes are still queued. The reads are
+    independent and run concurrently (utils/parallel.py).
     """
     try:
-        # Part 1: Average grade per course (demonstrates AGGREGATION)
+        # Part 1: Average grade per course (rollup of AVG over completed grades)
         course_grades_sql = """
             SELECT
-                c.courseId,
+                cs.courseId,
                 c.title,
-                AVG(CASE e.grade
-                    WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-                    WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-                    WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-                    WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-                    WHEN 'F' THEN 0.0
-                    ELSE 0.0
-                END) AS avg_grade,
-                COUNT(e.studentId) AS student_count
-            FROM Course c
-            JOIN enrolls_in e ON c.courseId = e.courseId
-            WHERE e.status = 'completed' AND e.grade IS NOT NULL
-            GROUP BY c.courseId, c.title
-            ORDER BY avg_grade DESC
+                cs.avg_grade,
+                cs.student_count
+            FROM course_grade_stats cs
+            JOIN Course c ON c.courseId = cs.courseId
+            ORDER BY cs.avg_grade DESC
         """
-        course_grades = execute_query(course_grades_sql)
 
-        if course_grades is None:
-            course_grades = []
-
-        # Part 2: Average grade per professor (demonstrates JOIN and AGGREGATION)
+        # Part 2: Average grade per professor (rollup of the teaches x enrolls_in join)
         professor_grades_sql = """
             SELECT
-                p.employeeId,
+                ps.employeeId,
                 emp.name,
-                AVG(CASE e.grade
-                    WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-                    WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-                    WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-                    WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-                    WHEN 'F' THEN 0.0
-                    ELSE 0.0
-                END) AS avg_grade,
-                COUNT(DISTINCT e.studentId) AS student_count,
-                COUNT(DISTINCT t.courseId) AS courses_taught
-            FROM Professor p
-            JOIN Employee emp ON p.employeeId = emp.employeeId
-            JOIN teaches t ON p.employeeId = t.employeeId
-            JOIN enrolls_in e ON t.courseId = e.courseId
-            WHERE e.status = 'completed' AND e.grade IS NOT NULL
-            GROUP BY p.employeeId, emp.name
-            ORDER BY avg_grade DESC
+                ps.avg_grade,
+                ps.student_count,
+                ps.courses_taught
+            FROM professor_grade_stats ps
+            JOIN Employee emp ON emp.employeeId = ps.employeeId
+            ORDER BY ps.avg_grade DESC
         """
-        professor_grades = execute_query(professor_grades_sql)
 
-        if professor_grades is None:
-            professor_grades = []
+        # Rollup freshness: last refresh and changes queued since
+        freshness_sql = """
+            SELECT
+                r.refreshedAt,
+                r.fullAt,
+                (SELECT COUNT(*) FROM analytics_dirty) AS pending
+            FROM analytics_refresh r
+            WHERE r.rollup = 'grade_stats'
+        """
 
         # Part 3: Use completed courses view (demonstrates VIEW)
         completed_view_sql = "SELECT * FROM completed_student_courses ORDER BY studentId, title LIMIT 50"
-        completed_courses = execute_query(completed_view_sql)
-
-        if completed_courses is None:
-            completed_courses = []
 
         # Part 4: Use current enrollments view (demonstrates second VIEW)
         current_view_sql = "SELECT * FROM current_student_enrollments ORDER BY studentId, title LIMIT 50"
-        current_enrollments = execute_query(current_view_sql)
 
-        if current_enrollments is None:
-            current_enrollments = []
+        # The view samples come from the catalog cache; the other parts are
+        # independent reads: run them concurrently, each on its own pooled
+        # connection (utils/parallel.py)
+        completed_courses = catalog_cache.get_or_load(
+            'analytics_completed_sample', lambda: execute_query(completed_view_sql)) or []
+        current_enrollments = catalog_cache.get_or_load(
+            'analytics_current_sample', lambda: execute_query(current_view_sql)) or []
+        results = run_parallel({
+            'course_grades': lambda: execute_query(course_grades_sql),
+            'professor_grades': lambda: execute_query(professor_grades_sql),
+            'freshness': lambda: execute_query(freshness_sql, fetch_one=True),
+        })
+        course_grades = results['course_grades'] or []
+        professor_grades = results['professor_grades'] or []
+        freshness = results['freshness']
 
         return render_template('admin/analytics.html',
                              course_grades=course_grades,
                              professor_grades=professor_grades,
+                             freshness=freshness,
                              completed_courses=completed_courses,
                              current_enrollments=current_enrollments)
 
@@ -250,5 +689,26 @@ def analytics():
         return render_template('admin/analytics.html',
                              course_grades=[],
                              professor_grades=[],
+                             freshness=None,
                              completed_courses=[],
                              current_enrollments=[])
+
+
+@admin_bp.route('/analytics/refresh', methods=['POST'])
+@login_required(role='admin')
+def refresh_analytics():
+    """Refresh the grade analytics rollups now ("full" rebuilds them)."""
+    try:
+        report = refresh_rollups(full=bool(request.form.get('full')))
+    except Error as e:
+        flash(f'Error refreshing analytics: {e.msg}', 'error')
+        print(f"Error in admin refresh_analytics route: {e}")
+        return redirect(url_for('admin.analytics'))
+
+    if report is None:
+        flash('A refresh is already running. Try again in a moment.', 'info')
+    else:
+        kind = 'Rebuilt' if report['full'] else 'Refreshed'
+        flash(f"✓ {kind} {report['courses']} course and {report['professors']} professor "
+              f"statistic(s) in {report['elapsed']:.2f}s.", 'success')
+    return redirect(url_for('admin.analytics'))
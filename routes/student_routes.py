@@ -1,9 +1,140 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from utils.db_connection import execute_query, execute_update, call_procedure
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from utils.db_connection import execute_query, unit_of_work
 from utils.auth import login_required
+from utils.cache import catalog_cache, bump_catalog_version
+from utils.warmup import register_warmer
+from utils.enrollment import (enroll_student, student_eligibility, EnrollmentError, PrerequisitesNotMet,
+                              SectionFull, AlreadyEnrolled, AlreadyCompleted, SectionNotFound,
+                              EnrollmentBusy)
+
+# Enrollment failures (see utils/enrollment.py) -> messages for the student
+ENROLL_FAILURE_MESSAGES = {
+    AlreadyEnrolled: 'You are already enrolled in this course section.',
+    PrerequisitesNotMet: 'Prerequisites not met for this course.',
+    SectionFull: 'Section is at full capacity.',
+    AlreadyCompleted: 'You have already completed this course.',
+    SectionNotFound: 'This course section does not exist.',
+    EnrollmentBusy: 'Many students are enrolling in this section right now. Please try again.',
+}
+
+# HTTP status of each failure for JSON clients (unrecognised database errors: 500)
+ENROLL_FAILURE_STATUS = {cls: 409 for cls in ENROLL_FAILURE_MESSAGES}
+ENROLL_FAILURE_STATUS[SectionNotFound] = 404
+ENROLL_FAILURE_STATUS[EnrollmentBusy] = 503
+
+# Catalog reads shared by every student (courses page, enrollment form)
+CATALOG_SQL = """
+    SELECT
+        c.title,
+        s.courseId,
+        s.sectionNo,
+        s.capacity,
+        c.credits,
+        -- Cross-listed codes, professor name and TA names come from
+        -- pre-aggregated helper views joined once (no per-row subqueries)
+        ccl.code,
+        cp.professor,
+        stl.tas,
+        -- Enrolled students count (only currently enrolled, not completed/withdrawn)
+        -- read from the trigger-maintained section_stats counter
+        COALESCE(ss.enrolled_count, 0) AS num_enrolled
+    FROM Section s
+    JOIN Course c ON c.courseId = s.courseId
+    LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+    LEFT JOIN course_professor cp ON cp.courseId = s.courseId
+    LEFT JOIN section_ta_list stl ON stl.courseId = s.courseId AND stl.sectionNo = s.sectionNo
+    LEFT JOIN section_stats ss ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
+    ORDER BY c.title ASC, s.sectionNo ASC
+"""
+
+ENROLL_COURSES_SQL = """
+    SELECT c.courseId, c.title, c.credits, ccl.code
+    FROM Course c
+    LEFT JOIN course_code_list ccl ON ccl.courseId = c.courseId
+    ORDER BY c.title
+"""
+
+ENROLL_SECTIONS_SQL = """
+    SELECT s.courseId, s.sectionNo, s.capacity,
+        -- Enrolled student count (trigger-maintained section_stats counter)
+        COALESCE(ss.enrolled_count, 0) AS num_enrolled
+    FROM Section s
+    JOIN Course c ON c.courseId = s.courseId
+    LEFT JOIN section_stats ss ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
+    ORDER BY s.courseId, s.sectionNo
+"""
+
+# One student's sections. The helper views (course_code_list, course_professor,
+# section_ta_list) aggregate whole tables and MySQL cannot push the studentId
+# filter into them, so per-student reads look up the codes, professor and TAs
+# of just their own rows with LATERAL derived tables instead.
+STUDENT_SCHEDULE_SQL = """
+    SELECT c.title, c.courseId, c.credits, e.sectionNo, e.grade, ccl.code, cp.professor, stl.tas
+    FROM enrolls_in e
+    JOIN Course c ON c.courseId = e.courseId
+    LEFT JOIN LATERAL (
+        SELECT GROUP_CONCAT(cl.code SEPARATOR ', ') AS code
+        FROM cross_lists cl
+        WHERE cl.courseId = e.courseId
+    ) ccl ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT prof_emp.name AS professor
+        FROM teaches t
+        JOIN Professor p ON t.employeeId = p.employeeId
+        JOIN Employee prof_emp ON p.employeeId = prof_emp.employeeId
+        WHERE t.courseId = e.courseId
+        ORDER BY t.employeeId
+        LIMIT 1
+    ) cp ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT GROUP_CONCAT(ta_emp.name SEPARATOR ', ') AS tas
+        FROM assists a
+        JOIN TA ta ON a.employeeId = ta.employeeId
+        JOIN Employee ta_emp ON ta.employeeId = ta_emp.employeeId
+        WHERE a.courseId = e.courseId AND a.sectionNo = e.sectionNo
+    ) stl ON TRUE
+    WHERE e.studentId = %s AND e.status = 'enrolled'
+    ORDER BY c.title ASC, e.sectionNo
+"""
+
+# One student's graded completed courses (same columns as completed_student_courses)
+STUDENT_COMPLETED_SQL = """
+    SELECT c.courseId, c.title, c.credits, e.sectionNo, e.grade, e.enrolledDate, ccl.code,
+           COALESCE(gs.points, 0.0) AS grade_points
+    FROM enrolls_in e
+    JOIN Course c ON c.courseId = e.courseId
+    LEFT JOIN LATERAL (
+        SELECT GROUP_CONCAT(cl.code SEPARATOR ', ') AS code
+        FROM cross_lists cl
+        WHERE cl.courseId = e.courseId
+    ) ccl ON TRUE
+    LEFT JOIN grade_scale gs ON gs.grade = e.grade
+    WHERE e.studentId = %s AND e.status = 'completed' AND e.grade IS NOT NULL
+    ORDER BY e.enrolledDate DESC
+"""
+
+def _load_catalog():
+    """All sections with codes, professor, TAs and enrolled counts (cached)."""
+    return catalog_cache.get_or_load('catalog', lambda: execute_query(CATALOG_SQL))
+
+def _load_enroll_courses():
+    """Courses for the enrollment form (cached)."""
+    return catalog_cache.get_or_load('enroll_courses', lambda: execute_query(ENROLL_COURSES_SQL))
+
+def _load_enroll_sections():
+    """Sections with capacity and enrolled counts for the enrollment form (cached)."""
+    return catalog_cache.get_or_load('enroll_sections', lambda: execute_query(ENROLL_SECTIONS_SQL))
+
+register_warmer('student catalog', _load_catalog)
+register_warmer('enrollment courses', _load_enroll_courses)
+register_warmer('enrollment sections', _load_enroll_sections)
 
 student_bp = Blueprint('student', __name__)
 
+def _wants_json():
+    """True if the client asked for a JSON result (e.g. the registration-rush harness)."""
+    return request.accept_mimetypes.best == 'application/json'
+
 @student_bp.route('/')
 @login_required(role='student')
 def index():
@@ -16,15 +147,8 @@ def index():
         return redirect(url_for('auth.login'))
 
     try:
-        # Get current enrollments using the current_student_enrollments view
-        current_enrollments_sql = """
-            SELECT title, courseId, credits, sectionNo, grade, code, professor, tas
-            FROM current_student_enrollments
-            WHERE studentId = %s
-            ORDER BY title ASC
-        """
-
-        current_enrollments = execute_query(current_enrollments_sql, (student_id,))
+        # Current enrollments with codes, professor and TAs (per-row LATERAL lookups)
+        current_enrollments = execute_query(STUDENT_SCHEDULE_SQL, (student_id,))
 
         if current_enrollments is None:
             current_enrollments = []
@@ -48,46 +172,9 @@ def courses():
     course code, professor, TAs, and enrollment numbers.
     """
     try:
-        sql = """
-            SELECT
-                c.title,
-                s.courseId,
-                s.sectionNo,
-                s.capacity,
-                c.credits,
-                -- Cross-listed codes
-                (SELECT GROUP_CONCAT(cl2.code SEPARATOR ', ') 
-                FROM cross_lists cl2 
-                WHERE cl2.courseId = c.courseId) AS code,
-                -- Professor name
-                (SELECT prof_emp2.name 
-                FROM teaches t2 
-                JOIN Professor p2 ON t2.employeeId = p2.employeeId
-                JOIN Employee prof_emp2 ON p2.employeeId = prof_emp2.employeeId
-                WHERE t2.courseId = s.courseId
-                LIMIT 1) AS professor,
-                -- TA names
-                (SELECT GROUP_CONCAT(ta_emp2.name SEPARATOR ', ')
-                FROM assists a2
-                JOIN TA ta2 ON a2.employeeId = ta2.employeeId
-                JOIN Employee ta_emp2 ON ta2.employeeId = ta_emp2.employeeId
-                WHERE a2.courseId = s.courseId AND a2.sectionNo = s.sectionNo) AS tas,
-                -- Enrolled students count (only currently enrolled, not completed/withdrawn)
-                (SELECT COUNT(*)
-                FROM enrolls_in e2
-                WHERE e2.courseId = s.courseId AND e2.sectionNo = s.sectionNo
-                AND e2.status = 'enrolled') AS num_enrolled
-            FROM Section s
-            JOIN Course c ON c.courseId = s.courseId
-            ORDER BY c.title ASC, s.sectionNo ASC
-        """
+        # Served from the catalog cache until an enroll/drop/grade change bumps its version
+        courses = _load_catalog()
 
-        courses = execute_query(sql)
-        
-        # Debug: Print what we got back
-        print(f"DEBUG: courses = {courses}")
-        print(f"DEBUG: type = {type(courses)}")
-        
         if courses is None:
             flash('Error loading courses. Database query returned None.', 'error')
             courses = []
@@ -113,6 +200,9 @@ def courses():
 def drop_course(course_id, section_no):
     """
     Drop a course by deleting the enrollment record.
+
+    Redirects to the dashboard, or with Accept: application/json returns
+    {"status": "dropped", "rows": n}.
     """
     student_id = session.get('student_id')
 
@@ -127,15 +217,20 @@ def drop_course(course_id, section_no):
             WHERE studentId = %s AND courseId = %s AND sectionNo = %s AND status = 'enrolled'
         """
 
-        execute_update(sql, (student_id, course_id, section_no))
-
-        # Call stored procedure to update open seats
-        call_procedure('update_open_seats', (course_id, section_no))
+        # One transaction; the enrolls_in triggers keep section_stats in step
+        with unit_of_work() as uow:
+            dropped = uow.execute(sql, (student_id, course_id, section_no))
 
+        bump_catalog_version()
+        if _wants_json():
+            return jsonify(status='dropped', rows=dropped)
         flash('✓ Successfully dropped the course.', 'success')
         return redirect(url_for('student.index'))
 
     except Exception as e:
+        if _wants_json():
+            print(f"Error in drop_course route: {e}")
+            return jsonify(status='error', message=str(e)), 500
         flash(f'✗ Error dropping course: {str(e)}', 'error')
         print(f"Error in drop_course route: {e}")
         return redirect(url_for('student.index'))
@@ -149,17 +244,23 @@ def drop_course(course_id, section_no):
 def enroll():
     """
     Enroll a student in a course section after validating prerequisites and capacity
-    using triggers and the update_open_seats stored procedure.
+    with the enroll_student stored procedure.
 
     SQL Requirements Met:
-    - INSERT ✓
-    - Demonstrates 3 triggers ✓ (prereq_check, section_capacity_check, student_already_completed_check)
-    - Calls stored procedure ✓ (update_open_seats)
-
-    Triggers:
-    1. prereq_check: Validates prerequisites are met
-    2. section_capacity_check: Ensures section has available seats
-    3. student_already_completed_check: Prevents re-enrollment in completed courses
+    - INSERT ✓ (inside the procedure)
+    - Calls stored procedure ✓ (enroll_student)
+
+    enroll_student runs the checks of the 3 enrollment triggers in one pass and
+    signals a distinct SQLSTATE for each failure:
+    1. prerequisites not met (45001) - same check as prereq_check
+    2. section full (45002) - same check as section_capacity_check
+    3. already enrolled / completed (45003 / 45004) - same check as student_enrollment_status_check
+    The triggers still guard direct INSERTs (e.g. admin bulk enrollment).
+
+    With Accept: application/json a POST returns {"status": "enrolled",
+    "retries": n}, or {"status": "rejected", "reason": ..., "message": ...}
+    with the status from ENROLL_FAILURE_STATUS, instead of flashing and
+    redirecting.
     """
     # Get the logged-in student's ID from session
     student_id = session.get('student_id')
@@ -175,85 +276,54 @@ def enroll():
 
             # Validate inputs
             if not all([course_id, section_no]):
+                if _wants_json():
+                    return jsonify(status='rejected', reason='invalid',
+                                   message='Please select both course and section.'), 400
                 flash('Please select both course and section.', 'error')
                 return redirect(url_for('student.enroll'))
 
-            # Step 1: Call stored procedure to update open seats
-            # This demonstrates the use of stored procedures
-            call_procedure('update_open_seats', (course_id, section_no))
-
-            # Step 2: Insert enrollment record for the logged-in student
-            # This will trigger all 3 validation triggers (prereq, capacity, enrollment status)
-            sql = """
-                INSERT INTO enrolls_in (studentId, courseId, sectionNo, status, grade, enrolledDate)
-                VALUES (%s, %s, %s, 'enrolled', NULL, CURDATE())
-            """
+            # Calls the enroll_student stored procedure: locks the section's
+            # seat counter, runs the prerequisite, capacity and enrollment-status
+            # checks once and inserts the row, retrying on lock conflicts.
+            # Each failed check raises its own EnrollmentError subclass.
+            retries = enroll_student(student_id, course_id, section_no)
 
-            # If this succeeds, the enrollment was successful (all triggers passed)
-            # If any trigger fails, an exception will be raised and caught below
-            execute_update(sql, (student_id, course_id, section_no))
+            bump_catalog_version()
+            if _wants_json():
+                return jsonify(status='enrolled', retries=retries)
             flash('✓ Successfully enrolled in course! All prerequisites met and seat reserved.', 'success')
             return redirect(url_for('student.enroll'))
 
-        except Exception as e:
-            error_msg = str(e)
-            course_id = request.form.get('course_id')
-            section_no = request.form.get('section_no')
-
-            # Parse trigger error messages for user-friendly display with specific details
-            if 'already enrolled' in error_msg.lower() or 'Student already enrolled' in error_msg or 'Duplicate entry' in error_msg:
-                # Student is already enrolled in this section
-                flash('✗ Enrollment failed: You are already enrolled in this course section.', 'error')
-
-            elif 'prereq' in error_msg.lower() or 'Prerequisite(s) not met' in error_msg:
-                # Student has not met prerequisites
-                flash('✗ Enrollment failed: Prerequisites not met for this course.', 'error')
-
-            elif 'full' in error_msg.lower() or 'Section is full!' in error_msg:
-                # Section is at full capacity
-                flash('✗ Enrollment failed: Section is at full capacity.', 'error')
-
-            elif 'completed' in error_msg.lower() or 'Student already completed this course!' in error_msg:
-                # Student has already completed the course
-                flash('✗ Enrollment failed: You have already completed this course.', 'error')
-            else:
-                # Unknown error - show the raw message for debugging
-                flash(f'✗ Enrollment failed: {error_msg}', 'error')
+        except EnrollmentError as e:
+            # Unknown reasons show the raw database message for debugging
+            message = ENROLL_FAILURE_MESSAGES.get(type(e)) or str(e.cause or e)
+            print(f"Error in enroll route: {e.cause or e}")
+            if _wants_json():
+                code = ENROLL_FAILURE_STATUS.get(type(e), 500)
+                return jsonify(status='rejected', reason=e.reason, message=message), code
+            flash(f'✗ Enrollment failed: {message}', 'error')
+            return redirect(url_for('student.enroll'))
 
+        except Exception as e:
+            # Unknown error - show the raw message for debugging
+            if _wants_json():
+                print(f"Error in enroll route: {e}")
+                return jsonify(status='error', message=str(e)), 500
+            flash(f'✗ Enrollment failed: {str(e)}', 'error')
             print(f"Error in enroll route: {e}")
             return redirect(url_for('student.enroll'))
 
-    # GET request - Load form data
+    # GET request - Load form data (per-section eligibility is fetched by
+    # enroll.js from student.eligibility)
     try:
         # Get the logged-in student's info
         student_sql = "SELECT studentId, name, year FROM Student WHERE studentId = %s"
         student = execute_query(student_sql, (student_id,), fetch_one=True)
 
-        # Load all courses with cross-listed codes
-        courses_sql = """
-            SELECT c.courseId, c.title, c.credits,
-                (SELECT GROUP_CONCAT(cl.code SEPARATOR ', ')
-                FROM cross_lists cl
-                WHERE cl.courseId = c.courseId) AS code
-            FROM Course c
-            ORDER BY c.title
-        """
-        courses = execute_query(courses_sql)
-
-        # Load all sections with capacity, professor, and enrolled counts
-        sections_sql = """
-            SELECT s.courseId, s.sectionNo, s.capacity,
-                -- Enrolled student count
-                (SELECT COUNT(*)
-                FROM enrolls_in ei
-                WHERE ei.courseId = s.courseId
-                    AND ei.sectionNo = s.sectionNo
-                    AND ei.status = 'enrolled') AS num_enrolled
-            FROM Section s
-            JOIN Course c ON c.courseId = s.courseId
-            ORDER BY s.courseId, s.sectionNo
-        """
-        sections = execute_query(sections_sql)
+        # Courses with cross-listed codes, and sections with capacity and
+        # enrolled counts (catalog cache)
+        courses = _load_enroll_courses()
+        sections = _load_enroll_sections()
 
         # Handle None results
         if courses is None:
@@ -274,21 +344,47 @@ def enroll():
                              courses=[],
                              sections=[])
 
+@student_bp.route('/eligibility')
+@login_required(role='student')
+def eligibility():
+    """
+    Every section with whether the logged-in student can enroll in it (JSON).
+
+    Used by the enroll page to mark sections before the student submits. The
+    prerequisite check uses the in-memory prerequisite graph and checks direct
+    prerequisites, like prereq_check; open seats are read live.
+    """
+    student_id = session.get('student_id')
+    if not student_id:
+        return jsonify(error='Student ID not found in session.'), 401
+
+    sections = student_eligibility(student_id)
+    if sections is None:
+        return jsonify(error='Could not load eligibility. Please try again.'), 503
+
+    counts = {}
+    for section in sections:
+        counts[section['status']] = counts.get(section['status'], 0) + 1
+
+    return jsonify(studentId=student_id, counts=counts, sections=sections)
+
 # ============================================================================
-# QUERY 3: Student GPA Dashboard (AGGREGATION + JOIN + GROUP BY)
-# Requirements: JOIN, Aggregation, GROUP BY
+# QUERY 3: Student GPA Dashboard (JOIN + trigger-maintained summary)
+# Requirements: JOIN, VIEW
 # ============================================================================
 @student_bp.route('/gpa')
 @login_required(role='student')
 def gpa():
     """
-    Calculate weighted GPA for the logged-in student based on completed courses using
-    aggregation functions with JOIN and GROUP BY.
+    Show the weighted GPA of the logged-in student from the student_gpa summary.
 
     SQL Requirements Met:
-    - JOIN ✓ (Student, enrolls_in, Course)
-    - Aggregation ✓ (SUM, GROUP BY)
-    - GROUP BY ✓
+    - JOIN ✓ (Student, student_gpa; completed courses join Course and grade_scale)
+
+    student_gpa holds running totals (quality points, credits, courses
+    completed, GPA) that triggers on enrolls_in update whenever a grade or
+    status changes, so the GPA is a primary-key read instead of an aggregate
+    over every completed course.
     """
     # Get the logged-in student's ID from session
     student_id = session.get('student_id')
@@ -298,39 +394,23 @@ def gpa():
         return redirect(url_for('auth.login'))
 
     try:
-        # Calculate GPA for the logged-in student only
+        # GPA totals for the logged-in student (trigger-maintained student_gpa row)
         sql = """
             SELECT
                 s.studentId,
                 s.name,
-                SUM(CASE e.grade
-                    WHEN 'A+' THEN 4.33 WHEN 'A' THEN 4.0 WHEN 'A-' THEN 3.67
-                    WHEN 'B+' THEN 3.33 WHEN 'B' THEN 3.0 WHEN 'B-' THEN 2.67
-                    WHEN 'C+' THEN 2.33 WHEN 'C' THEN 2.0 WHEN 'C-' THEN 1.67
-                    WHEN 'D+' THEN 1.33 WHEN 'D' THEN 1.0 WHEN 'D-' THEN 0.67
-                    WHEN 'F' THEN 0.0
-                    ELSE 0.0
-                END * c.credits) / NULLIF(SUM(c.credits), 0) AS gpa,
-                COUNT(e.courseId) AS courses_completed,
-                SUM(c.credits) AS total_credits
+                g.gpa,
+                g.courses_completed,
+                g.credits AS total_credits
             FROM Student s
-            JOIN enrolls_in e ON s.studentId = e.studentId
-            JOIN Course c ON e.courseId = c.courseId
-            WHERE s.studentId = %s AND e.status = 'completed' AND e.grade IS NOT NULL
-            GROUP BY s.studentId, s.name
+            JOIN student_gpa g ON g.studentId = s.studentId
+            WHERE s.studentId = %s AND g.courses_completed > 0
         """
 
         student_data = execute_query(sql, (student_id,), fetch_one=True)
 
-        # Get completed courses using the completed_student_courses view
-        completed_courses_sql = """
-            SELECT courseId, title, credits, sectionNo, grade, enrolledDate, code, grade_points
-            FROM completed_student_courses
-            WHERE studentId = %s AND grade IS NOT NULL
-            ORDER BY enrolledDate DESC
-        """
-
-        completed_courses = execute_query(completed_courses_sql, (student_id,))
+        # Graded completed courses with grade points (per-row LATERAL code lookup)
+        completed_courses = execute_query(STUDENT_COMPLETED_SQL, (student_id,))
 
         if completed_courses is None:
             completed_courses = []
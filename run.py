@@ -3,7 +3,9 @@
 CourseTracker Application Entry Point
 
 This is the main entry point for the CourseTracker Flask application.
-Run this file to start the development server.
+Run this file to start the development server (one process; debugger and
+reloader when FLASK_DEBUG=1). In production serve wsgi:app with Gunicorn
+instead (see gunicorn.conf.py).
 
 Usage:
     python run.py
@@ -11,6 +13,7 @@ Usage:
 
 from app import create_app
 from utils.db_connection import test_connection
+from utils.warmup import warm_up, print_report
 
 def main():
     """Initialize and run the Flask application."""
@@ -30,13 +33,16 @@ def main():
         print("⚠️  WARNING: Database connection failed!")
         print("   Please check your database configuration in .env")
 
+    if app.config['WARMUP_ON_START']:
+        print_report(warm_up(app))
+
     print("="*70)
     print("Starting Flask development server...")
     print("="*70 + "\n")
 
     # Run the application
     app.run(
-        debug=app.config.get('DEBUG', True),
+        debug=app.config['DEBUG'],
         host='0.0.0.0',
         port=5001
     )
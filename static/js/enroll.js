@@ -14,6 +14,43 @@ document.addEventListener("DOMContentLoaded", () => {
     allSectionsData = [];
   }
 
+  // "courseId:sectionNo" -> eligibility entry from student.eligibility
+  let eligibility = null;
+
+  const courseNotes = {
+    blocked: "prerequisites missing",
+    enrolled: "already enrolled",
+    completed: "completed",
+    full: "full",
+  };
+
+  const sectionNote = (entry) => {
+    if (entry.status === "blocked") {
+      return `missing prerequisite ${entry.missing.join(", ")}`;
+    }
+    return courseNotes[entry.status];
+  };
+
+  const markCourses = () => {
+    const statuses = {};
+    Object.values(eligibility).forEach((entry) => {
+      const key = String(entry.courseId);
+      // A course is eligible if any of its sections is
+      if (statuses[key] !== "eligible") {
+        statuses[key] = entry.status;
+      }
+    });
+
+    Array.from(courseSelect.options).forEach((option) => {
+      const status = statuses[option.value];
+      if (!option.value || !status || status === "eligible") {
+        return;
+      }
+      option.textContent = `${option.textContent.trim()} [${courseNotes[status]}]`;
+      option.dataset.status = status;
+    });
+  };
+
   const renderSections = () => {
     sectionSelect.innerHTML = '<option value="">-- Select a section --</option>';
 
@@ -25,8 +62,12 @@ document.addEventListener("DOMContentLoaded", () => {
     let sectionsAdded = 0;
     allSectionsData.forEach((sectionData) => {
       if (String(sectionData.courseId) === selectedCourse) {
-        const openSeats =
-          Number(sectionData.capacity) - Number(sectionData.num_enrolled);
+        const entry =
+          eligibility &&
+          eligibility[`${sectionData.courseId}:${sectionData.sectionNo}`];
+        const openSeats = entry
+          ? entry.openSeats
+          : Number(sectionData.capacity) - Number(sectionData.num_enrolled);
 
         const newOption = document.createElement("option");
         newOption.value = sectionData.sectionNo;
@@ -34,6 +75,13 @@ document.addEventListener("DOMContentLoaded", () => {
         newOption.dataset.course = sectionData.courseId;
         newOption.dataset.capacity = sectionData.capacity;
         newOption.dataset.enrolled = sectionData.num_enrolled;
+        if (entry) {
+          newOption.dataset.status = entry.status;
+          if (entry.status !== "eligible") {
+            newOption.textContent += ` - ${sectionNote(entry)}`;
+            newOption.disabled = true;
+          }
+        }
         sectionSelect.appendChild(newOption);
         sectionsAdded++;
       }
@@ -50,4 +98,31 @@ document.addEventListener("DOMContentLoaded", () => {
   if (courseSelect.value) {
     renderSections();
   }
+
+  // Without eligibility data the form still works; the database checks
+  // every enrollment on submit.
+  const eligibilityUrl = sectionSelect.dataset.eligibilityUrl;
+  if (eligibilityUrl) {
+    fetch(eligibilityUrl, { headers: { Accept: "application/json" } })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((data) => {
+        if (!data || !data.sections) {
+          return;
+        }
+        eligibility = {};
+        data.sections.forEach((entry) => {
+          eligibility[`${entry.courseId}:${entry.sectionNo}`] = entry;
+        });
+        const selectedSection = sectionSelect.value;
+        markCourses();
+        renderSections();
+        const option = Array.from(sectionSelect.options).find(
+          (o) => o.value === selectedSection && !o.disabled
+        );
+        if (option) {
+          sectionSelect.value = selectedSection;
+        }
+      })
+      .catch((err) => console.error("Failed to load eligibility", err));
+  }
 });
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Grade Analytics Rollups for CourseTracker
+
+The analytics page reads per-course and per-professor grade statistics from
+the course_grade_stats and professor_grade_stats rollup tables instead of
+aggregating enrolls_in (joined to teaches for professors) on every view.
+
+Triggers on enrolls_in and teaches (see database/triggers.sql) queue the
+courses and professors whose statistics changed in analytics_dirty. A refresh
+recomputes only the queued courses, the professors who teach them and the
+queued professors, all read from one consistent snapshot, and then dequeues
+exactly the queue entries it saw (a row re-queued meanwhile has a new version
+and stays for the next refresh). The first refresh, or a --full one, rebuilds
+both rollups.
+
+Refreshes run in a background thread every ANALYTICS_REFRESH_INTERVAL
+seconds (started by create_app(), or by each worker under gunicorn.conf.py),
+from "Refresh Now" on the analytics page, or from the command line. Concurrent
+refreshes do not wait for each other: the one that cannot lock the
+analytics_refresh row is skipped.
+
+Usage:
+    python -m utils.analytics_rollup [--full]
+
+Options:
+    --full: Rebuild both rollups instead of refreshing the queued rows
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from mysql.connector import Error
+from config import Config
+from utils.db_connection import unit_of_work
+
+ROLLUP_NAME = 'grade_stats'
+
+# Ids per IN (...) list
+ID_BATCH_SIZE = 500
+
+COURSE_STATS_SQL = """
+    SELECT e.courseId, COUNT(*) AS student_count, SUM(gs.points) AS points_sum
+    FROM enrolls_in e
+    JOIN grade_scale gs ON gs.grade = e.grade
+    WHERE e.status = 'completed' {filter}
+    GROUP BY e.courseId
+"""
+
+PROFESSOR_STATS_SQL = """
+    SELECT
+        t.employeeId,
+        COUNT(*) AS graded_count,
+        SUM(gs.points) AS points_sum,
+        COUNT(DISTINCT e.studentId) AS student_count,
+        COUNT(DISTINCT t.courseId) AS courses_taught
+    FROM teaches t
+    JOIN Professor p ON p.employeeId = t.employeeId
+    JOIN enrolls_in e ON e.courseId = t.courseId
+    JOIN grade_scale gs ON gs.grade = e.grade
+    WHERE e.status = 'completed' {filter}
+    GROUP BY t.employeeId
+"""
+
+INSERT_COURSE_SQL = """
+    INSERT INTO course_grade_stats (courseId, student_count, points_sum, refreshedAt)
+    VALUES (%s, %s, %s, %s)
+"""
+
+INSERT_PROFESSOR_SQL = """
+    INSERT INTO professor_grade_stats
+        (employeeId, graded_count, points_sum, student_count, courses_taught, refreshedAt)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+_scheduler = None
+_scheduler_pid = None  # threads do not survive fork(): a forked worker starts its own
+_scheduler_lock = threading.Lock()
+
+
+def _batches(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        yield ids[start:start + ID_BATCH_SIZE]
+
+
+def _placeholders(ids):
+    return ', '.join(['%s'] * len(ids))
+
+
+def _recompute(uow, stats_sql, filter_column, table, insert_sql, columns, ids, now):
+    """
+    Replace the rollup rows of `ids` (every row if ids is None).
+
+    columns are the stats_sql result columns in insert_sql order; the first
+    one is the rollup table's key.
+
+    Returns:
+        int: Rollup rows written
+    """
+    if ids is None:
+        rows = uow.query(stats_sql.format(filter=''))
+        uow.execute(f"DELETE FROM {table}")
+    else:
+        rows = []
+        for batch in _batches(ids):
+            rows.extend(uow.query(
+                stats_sql.format(filter=f"AND {filter_column} IN ({_placeholders(batch)})"), batch))
+            uow.execute(f"DELETE FROM {table} WHERE {columns[0]} IN ({_placeholders(batch)})", batch)
+
+    params = [tuple(row[c] for c in columns) + (now,) for row in rows]
+    for start in range(0, len(params), ID_BATCH_SIZE):
+        uow.executemany(insert_sql, params[start:start + ID_BATCH_SIZE])
+    return len(params)
+
+
+def refresh_rollups(full=False):
+    """
+    Refresh the grade analytics rollups.
+
+    Args:
+        full (bool): Rebuild everything instead of the queued courses/professors
+
+    Returns:
+        dict: full, courses and professors (rollup rows written), dequeued,
+        refreshedAt and elapsed seconds; None if another refresh is running
+
+    Raises:
+        mysql.connector.Error: If the refresh fails; nothing is changed
+    """
+    started = time.perf_counter()
+    with unit_of_work() as uow:
+        status = uow.query(
+            "SELECT refreshedAt FROM analytics_refresh WHERE rollup = %s FOR UPDATE SKIP LOCKED",
+            (ROLLUP_NAME,), fetch_one=True)
+        if status is None:
+            return None
+        full = full or status['refreshedAt'] is None
+        now = datetime.now().replace(microsecond=0)
+
+        # First consistent read: the queue and the statistics come from one snapshot
+        queued = uow.query("SELECT entity, entityId, version FROM analytics_dirty")
+
+        if full:
+            courses = professors = None
+        else:
+            courses = {q['entityId'] for q in queued if q['entity'] == 'course'}
+            professors = {q['entityId'] for q in queued if q['entity'] == 'professor'}
+            for batch in _batches(courses):
+                professors.update(row['employeeId'] for row in uow.query(
+                    f"SELECT DISTINCT employeeId FROM teaches WHERE courseId IN ({_placeholders(batch)})",
+                    batch))
+
+        course_rows = _recompute(uow, COURSE_STATS_SQL, 'e.courseId', 'course_grade_stats',
+                                 INSERT_COURSE_SQL, ('courseId', 'student_count', 'points_sum'),
+                                 courses, now)
+        professor_rows = _recompute(uow, PROFESSOR_STATS_SQL, 't.employeeId', 'professor_grade_stats',
+                                    INSERT_PROFESSOR_SQL,
+                                    ('employeeId', 'graded_count', 'points_sum', 'student_count',
+                                     'courses_taught'),
+                                    professors, now)
+
+        if queued:
+            uow.executemany(
+                "DELETE FROM analytics_dirty WHERE entity = %s AND entityId = %s AND version = %s",
+                [(q['entity'], q['entityId'], q['version']) for q in queued])
+
+        uow.execute(
+            "UPDATE analytics_refresh SET refreshedAt = %s, fullAt = IF(%s, %s, fullAt) WHERE rollup = %s",
+            (now, full, now, ROLLUP_NAME))
+
+    return {
+        'full': full,
+        'courses': course_rows,
+        'professors': professor_rows,
+        'dequeued': len(queued),
+        'refreshedAt': now,
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def _run_scheduler(interval, stop):
+    """Background loop: refresh now, then every `interval` seconds until stopped."""
+    while True:
+        try:
+            refresh_rollups()
+        except Exception as e:
+            print(f"Error refreshing analytics rollups: {e}")
+        if stop.wait(interval):
+            return
+
+
+def start_refresh_scheduler(interval=None):
+    """
+    Start the background rollup refresh thread (once per process).
+
+    Args:
+        interval (float, optional): Seconds between refreshes
+            (default Config.ANALYTICS_REFRESH_INTERVAL; 0 disables the scheduler)
+
+    Returns:
+        threading.Event: Set it to stop the scheduler; None if disabled
+    """
+    global _scheduler, _scheduler_pid
+    interval = Config.ANALYTICS_REFRESH_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return None
+
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler_pid != os.getpid():
+            stop = threading.Event()
+            thread = threading.Thread(target=_run_scheduler, args=(interval, stop),
+                                      name='analytics-rollup', daemon=True)
+            thread.start()
+            _scheduler, _scheduler_pid = stop, os.getpid()
+        return _scheduler
+
+
+def main():
+    """Main entry point."""
+    full = '--full' in sys.argv
+
+    print("=" * 70)
+    print("CourseTracker Analytics Rollup Refresh")
+    print("=" * 70)
+
+    try:
+        report = refresh_rollups(full=full)
+    except Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(2)
+
+    if report is None:
+        print("⚠️  Another refresh is running; nothing done.")
+        sys.exit(1)
+
+    kind = 'Rebuilt' if report['full'] else 'Refreshed'
+    print(f"✓ {kind} {report['courses']} course and {report['professors']} professor row(s) "
+          f"({report['dequeued']} queued change(s)) in {report['elapsed']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
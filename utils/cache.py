@@ -0,0 +1,169 @@
+"""
+In-process caching for CourseTracker read paths.
+
+VersionedCache is a small thread-safe LRU cache with a TTL whose entries are
+tagged with a data version. Write paths call bump_version() after they commit;
+every entry cached under an older version is then treated as a miss, so readers
+never see data from before the last write made by this process.
+
+The cache lives in process memory. With several worker processes, a write in
+one worker does not invalidate the others; the TTL bounds how stale their
+entries can get.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from utils.metrics import register_collector
+
+
+class VersionedCache:
+    """
+    Bounded LRU cache with TTL, keyed on a data version.
+
+    Args:
+        maxsize (int): Maximum number of entries; least recently used are evicted
+        ttl (float): Seconds an entry stays valid. 0 disables expiry.
+    """
+
+    def __init__(self, maxsize=128, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (version, stored_at, value)
+        self._version = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def version(self):
+        """Current data version."""
+        return self._version
+
+    def get(self, key):
+        """
+        Look up a key.
+
+        Args:
+            key: Hashable cache key
+
+        Returns:
+            tuple: (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, stored_at, value = entry
+                fresh = version == self._version and (
+                    not self.ttl or time.monotonic() - stored_at < self.ttl)
+                if fresh:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._entries[key]
+            self._misses += 1
+            return False, None
+
+    def set(self, key, value, version=None):
+        """
+        Store a value under the current data version.
+
+        Args:
+            key: Hashable cache key
+            value: Value to cache
+            version (int, optional): Version the value was loaded under. If a
+                write bumped the version in the meantime the value is dropped.
+        """
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (self._version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for key, calling loader() on a miss.
+
+        None results (query errors) are returned but not cached.
+
+        Args:
+            key: Hashable cache key
+            loader (callable): Zero-argument function that produces the value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        version = self._version
+        value = loader()
+        if value is not None:
+            self.set(key, value, version=version)
+        return value
+
+    def bump_version(self):
+        """
+        Invalidate every entry by moving to a new data version.
+
+        Returns:
+            int: The new version
+        """
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            return self._version
+
+    def stats(self):
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: version, size, maxsize, ttl, hits, misses, hit_ratio, evictions
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'version': self._version,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+            }
+
+
+# Course catalog (sections, seats, professors, TAs). Bumped by the enroll, drop
+# and grade-update routes.
+catalog_cache = VersionedCache(maxsize=Config.CATALOG_CACHE_SIZE,
+                               ttl=Config.CATALOG_CACHE_TTL)
+
+
+def bump_catalog_version():
+    """
+    Invalidate cached catalog data after a write to enrolls_in.
+
+    Returns:
+        int: The new catalog version
+    """
+    return catalog_cache.bump_version()
+
+
+def _catalog_cache_samples():
+    """Catalog cache counters for /admin/metrics."""
+    stats = catalog_cache.stats()
+    yield 'coursetracker_catalog_cache_entries', 'gauge', 'Entries in the catalog cache.', stats['size']
+    yield 'coursetracker_catalog_cache_version', 'gauge', 'Current catalog data version.', stats['version']
+    yield 'coursetracker_catalog_cache_hits_total', 'counter', 'Catalog cache hits.', stats['hits']
+    yield 'coursetracker_catalog_cache_misses_total', 'counter', 'Catalog cache misses.', stats['misses']
+    yield 'coursetracker_catalog_cache_evictions_total', 'counter', 'Entries evicted from the catalog cache.', stats['evictions']
+
+register_collector(_catalog_cache_samples)
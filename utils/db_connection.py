@@ -1,21 +1,484 @@
-import mysql.connector
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, has_app_context
 from mysql.connector import Error
 from config import Config
+from utils.db_pool import ConnectionPool
+from utils.metrics import track_query, record_query, record_connect, register_collector
+from utils.slow_queries import slow_query_log
+
+# Process-wide connection pool, created by init_pool() or lazily on first use.
+# _pool_pid is the process that built it: a worker forked from a preloaded app
+# must not share the parent's sockets, so get_pool() builds its own pool.
+_pool = None
+_pool_pid = None
+_pool_settings = None
+_pool_lock = threading.Lock()
+
+def _build_pool(settings):
+    """Create a ConnectionPool from a settings mapping, falling back to Config."""
+    settings = settings or {}
+
+    def setting(name):
+        return settings.get(name, getattr(Config, name))
+
+    return ConnectionPool(
+        setting('DB_CONFIG'),
+        size=setting('DB_POOL_SIZE'),
+        max_overflow=setting('DB_POOL_MAX_OVERFLOW'),
+        timeout=setting('DB_POOL_TIMEOUT'),
+        recycle=setting('DB_POOL_RECYCLE'),
+        pre_ping=setting('DB_POOL_PRE_PING'),
+    )
+
+def init_pool(settings=None):
+    """
+    Create (or replace) the application connection pool.
+
+    Called from create_app() with app.config; any setting that is missing
+    falls back to the value in config.Config.
+
+    Args:
+        settings (mapping, optional): Flask config or dict with DB_CONFIG and DB_POOL_* keys
+
+    Returns:
+        ConnectionPool: The new pool
+    """
+    global _pool, _pool_pid, _pool_settings
+    pool = _build_pool(settings)
+
+    with _pool_lock:
+        old_pool, _pool = _pool, pool
+        _pool_pid, _pool_settings = os.getpid(), settings
+    if old_pool is not None:
+        old_pool.dispose()
+    return pool
+
+def get_pool():
+    """
+    Return the application connection pool, creating it from Config if needed.
+
+    In a process forked after the pool was built (a Gunicorn worker of a
+    preloaded app) the inherited pool is abandoned, not closed, since its
+    sockets belong to the parent, and a new pool is built with the same
+    settings.
+
+    Returns:
+        ConnectionPool: The process-wide pool
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _pool = _build_pool(_pool_settings)
+                _pool_pid = pid
+    return _pool
+
+def close_pool():
+    """
+    Dispose of the application connection pool; the next get_pool() builds a
+    new one with the same settings.
+    """
+    global _pool
+    with _pool_lock:
+        old_pool, _pool = _pool, None
+    if old_pool is not None:
+        old_pool.dispose()
+
+def get_pool_status():
+    """
+    Return connection pool metrics (in use, idle, wait time, ...).
+
+    Returns:
+        dict: See ConnectionPool.status()
+    """
+    return get_pool().status()
+
+def _pool_samples():
+    """Pool gauges and counters for /admin/metrics."""
+    if _pool is None or _pool_pid != os.getpid():
+        return
+    status = _pool.status()
+    for name, key, kind, help_text in (
+            ('in_use', 'in_use', 'gauge', 'Connections currently borrowed.'),
+            ('idle', 'idle', 'gauge', 'Open connections waiting in the pool.'),
+            ('open', 'total', 'gauge', 'Open connections.'),
+            ('checkouts_total', 'checkouts', 'counter', 'Connections borrowed.'),
+            ('waits_total', 'waits', 'counter', 'Checkouts that had to wait for a free connection.'),
+            ('wait_seconds_total', 'wait_time_total', 'counter', 'Time spent waiting for a free connection.'),
+            ('timeouts_total', 'timeouts', 'counter', 'Checkouts that timed out.'),
+            ('created_total', 'created', 'counter', 'Connections opened.'),
+            ('recycled_total', 'recycled', 'counter', 'Connections closed for age.'),
+            ('invalidated_total', 'invalidated', 'counter', 'Connections discarded as broken.')):
+        yield f'coursetracker_db_pool_{name}', kind, help_text, status[key]
+
+register_collector(_pool_samples)
 
 def get_connection():
     """
-    Create and return a MySQL database connection.
-    
+    Borrow a MySQL database connection from the pool.
+
+    Call close() on the returned connection when finished; this returns it
+    to the pool rather than closing the socket.
+
     Returns:
-        connection: MySQL connection object or None if connection fails
+        connection: Pooled MySQL connection object or None if connection fails
     """
+    started = time.perf_counter()
     try:
-        connection = mysql.connector.connect(**Config.DB_CONFIG)
-        if connection.is_connected():
-            return connection
+        # acquire() has already pinged the connection (pre_ping)
+        connection = get_pool().acquire()
+        record_connect(time.perf_counter() - started)
+        return connection
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
-        return None
+        error = e
+    record_connect(time.perf_counter() - started, error)
+    return None
+
+def init_app(app):
+    """
+    Wire database access into a Flask app.
+
+    Creates the connection pool from app.config and registers the teardown
+    handler that finishes and releases the request-scoped connection.
+
+    Args:
+        app: Flask application
+    """
+    init_pool(app.config)
+    app.teardown_appcontext(close_request_connection)
+
+def get_request_connection():
+    """
+    Return the connection bound to the current request, borrowing one on first use.
+
+    Every call during the same request (or app context) gets the same connection,
+    so several statements share one checkout and can share one transaction.
+    The connection is committed or rolled back and returned to the pool by
+    close_request_connection() when the request finishes.
+
+    Returns:
+        connection: Pooled MySQL connection
+
+    Raises:
+        mysql.connector.Error: If no connection can be established
+    """
+    connection = g.get('_db_connection')
+    if connection is None:
+        connection = get_connection()
+        if not connection:
+            raise Error("Failed to establish database connection")
+        g._db_connection = connection
+        g._db_uow_depth = 0
+    return connection
+
+def close_request_connection(exc=None):
+    """
+    Teardown handler: finish and release the request-scoped connection.
+
+    Work still pending on the connection is committed if the request succeeded
+    and rolled back if it raised.
+
+    Args:
+        exc (Exception, optional): Exception that ended the request, if any
+    """
+    connection = g.pop('_db_connection', None)
+    g.pop('_db_uow_depth', None)
+    if connection is None:
+        return
+
+    try:
+        if connection.in_transaction:
+            if exc is None:
+                connection.commit()
+            else:
+                connection.rollback()
+    except Error as e:
+        print(f"Error finishing request transaction: {e}")
+        try:
+            connection.rollback()
+        except Error:
+            pass
+    finally:
+        connection.close()
+
+class UnitOfWork:
+    """
+    Runs several statements on one connection inside one transaction.
+
+    Obtained from unit_of_work(); do not construct directly. Unlike the
+    module-level helpers, these methods never commit on their own and always
+    raise mysql.connector.Error on failure so the surrounding unit_of_work()
+    can roll back.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._savepoint_seq = 0
+
+    def query(self, sql, params=None, fetch_one=False):
+        """
+        Execute a SELECT query inside the transaction.
+
+        Args:
+            sql (str): SQL query string with %s placeholders
+            params (tuple/list): Parameters for the query
+            fetch_one (bool): If True, return single row; if False, return all rows
+
+        Returns:
+            list/dict: Query results as list of dictionaries (or single dict if fetch_one=True)
+        """
+        cursor = self.connection.cursor(dictionary=True, buffered=True)
+        try:
+            with track_query(sql) as timer:
+                cursor.execute(sql, params or ())
+                result = cursor.fetchone() if fetch_one else cursor.fetchall()
+                timer.rows = cursor.rowcount
+            return result
+        finally:
+            cursor.close()
+
+    def execute(self, sql, params=None):
+        """
+        Execute an INSERT, UPDATE, or DELETE inside the transaction.
+
+        Args:
+            sql (str): SQL query string with %s placeholders
+            params (tuple/list): Parameters for the query
+
+        Returns:
+            int: Number of affected rows
+        """
+        cursor = self.connection.cursor()
+        try:
+            with track_query(sql) as timer:
+                cursor.execute(sql, params or ())
+                timer.rows = cursor.rowcount
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def executemany(self, sql, seq_of_params):
+        """
+        Execute one statement for every parameter tuple (batched by the driver).
+
+        Args:
+            sql (str): SQL statement with %s placeholders
+            seq_of_params (list): List of parameter tuples
+
+        Returns:
+            int: Number of affected rows
+        """
+        cursor = self.connection.cursor()
+        try:
+            with track_query(sql) as timer:
+                cursor.executemany(sql, seq_of_params)
+                timer.rows = cursor.rowcount
+            return cursor.rowcount
+        finally:
+            cursor.close()
+
+    def call_procedure(self, proc_name, params=None):
+        """
+        Call a stored procedure inside the transaction.
+
+        Args:
+            proc_name (str): Name of the stored procedure
+            params (tuple/list): Parameters for the procedure
+
+        Returns:
+            list: List of result sets (each result set is a list of dictionaries)
+        """
+        cursor = self.connection.cursor(dictionary=True)
+        try:
+            with track_query(f"CALL {proc_name}") as timer:
+                cursor.callproc(proc_name, params or ())
+                results = [result.fetchall() for result in cursor.stored_results()]
+                timer.rows = sum(len(rows) for rows in results)
+            return results
+        finally:
+            cursor.close()
+
+    def call_function(self, func_name, params):
+        """
+        Call a stored function inside the transaction.
+
+        Args:
+            func_name (str): Name of the stored function
+            params (tuple/list): Parameters for the function
+
+        Returns:
+            The result of the function
+        """
+        placeholders = ', '.join(['%s'] * len(params))
+        row = self.query(f"SELECT {func_name}({placeholders}) AS result", params, fetch_one=True)
+        return row['result'] if row else None
+
+    def call_function_many(self, func_name, params_list):
+        """
+        Evaluate a stored function for many argument tuples in one query.
+
+        Args:
+            func_name (str): Name of the stored function
+            params_list (list): Argument tuples, all of the same length
+
+        Returns:
+            list: The function's result for each tuple, in order
+        """
+        if not params_list:
+            return []
+        sql, params = _function_batch_sql(func_name, params_list)
+        return [row['result'] for row in self.query(sql, params)]
+
+    @contextmanager
+    def savepoint(self, name=None):
+        """
+        Run a block under a savepoint.
+
+        If the block raises, only its changes are rolled back (ROLLBACK TO
+        SAVEPOINT) and the exception propagates; the rest of the transaction
+        is kept.
+
+        Args:
+            name (str, optional): Savepoint name; generated if omitted
+
+        Usage:
+            with unit_of_work() as uow:
+                for row in rows:
+                    try:
+                        with uow.savepoint():
+                            uow.execute(insert_sql, row)
+                    except Error as e:
+                        failures.append((row, e))
+        """
+        if name is None:
+            self._savepoint_seq += 1
+            name = f"sp_{self._savepoint_seq}"
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SAVEPOINT {name}")
+            try:
+                yield name
+            except BaseException:
+                # An error that aborts the transaction (deadlock, lost
+                # connection) also drops the savepoint; keep the original error
+                try:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+                except Error:
+                    pass
+                raise
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+        finally:
+            cursor.close()
+
+@contextmanager
+def unit_of_work():
+    """
+    Context manager that runs several statements as one atomic transaction.
+
+    Inside a request the request-scoped connection is used; outside a request
+    (scripts, CLI commands) a connection is borrowed for the duration of the block.
+    The transaction commits when the block exits normally and rolls back if it
+    raises. Nested unit_of_work() blocks become savepoints of the outer one.
+
+    Yields:
+        UnitOfWork: Object with query/execute/call_procedure/savepoint methods
+
+    Raises:
+        mysql.connector.Error: Re-raises database errors (including trigger errors) after rollback
+
+    Usage:
+        with unit_of_work() as uow:
+            uow.execute("DELETE FROM enrolls_in WHERE ...", old_section)
+            uow.execute("INSERT INTO enrolls_in ...", new_section)
+    """
+    if has_app_context():
+        connection = get_request_connection()
+        owned = False
+        depth = g._db_uow_depth
+    else:
+        connection = get_connection()
+        if not connection:
+            raise Error("Failed to establish database connection")
+        owned = True
+        depth = 0
+
+    uow = UnitOfWork(connection)
+
+    # Nested block: isolate it with a savepoint inside the outer transaction
+    if depth > 0:
+        g._db_uow_depth += 1
+        try:
+            with uow.savepoint(f"uow_{depth}"):
+                yield uow
+        finally:
+            g._db_uow_depth -= 1
+        return
+
+    try:
+        if not owned:
+            g._db_uow_depth = 1
+        # Start from a fresh transaction so earlier reads on this connection
+        # do not leave us on a stale snapshot
+        if connection.in_transaction:
+            connection.commit()
+        connection.start_transaction()
+        yield uow
+        connection.commit()
+    except BaseException as e:
+        try:
+            connection.rollback()
+        except Error:
+            pass
+        if isinstance(e, Error):
+            print(f"Error in unit of work, rolled back: {e}")
+        raise
+    finally:
+        if owned:
+            connection.close()
+        else:
+            g._db_uow_depth = 0
+
+def _explain(sql, params):
+    """
+    EXPLAIN FORMAT=JSON a statement on a connection of its own.
+
+    The connection is borrowed with SLOW_QUERY_EXPLAIN_TIMEOUT instead of the
+    pool timeout: when the pool is busy the capture goes without a plan rather
+    than holding up the request. EXPLAIN always emits a note, so warnings are
+    not raised while it runs.
+
+    Returns:
+        str: The JSON plan
+
+    Raises:
+        PoolTimeoutError: If no connection is free within the timeout
+    """
+    connection = get_pool().acquire(timeout=Config.SLOW_QUERY_EXPLAIN_TIMEOUT)
+    raw = connection.raw
+    raise_on_warnings, get_warnings = raw.raise_on_warnings, raw.get_warnings
+    cursor = None
+    try:
+        raw.raise_on_warnings = False
+        cursor = raw.cursor(buffered=True)
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params or ())
+        return cursor.fetchone()[0]
+    finally:
+        if cursor:
+            cursor.close()
+        raw.raise_on_warnings = raise_on_warnings
+        raw.get_warnings = get_warnings
+        connection.close()
+
+def _capture_slow_query(sql, params, timer):
+    """Hand a statement that passed SLOW_QUERY_THRESHOLD_MS to the slow query log."""
+    if slow_query_log.is_slow(timer.seconds):
+        slow_query_log.capture(sql, params, timer.seconds, timer.error, explain=_explain)
 
 def execute_query(sql, params=None, fetch_one=False):
     """
@@ -32,6 +495,7 @@ def execute_query(sql, params=None, fetch_one=False):
     """
     connection = None
     cursor = None
+    tracker = track_query(sql)
     try:
         connection = get_connection()
         if not connection:
@@ -39,13 +503,15 @@ def execute_query(sql, params=None, fetch_one=False):
         
         # Use dictionary cursor to get results as dictionaries
         cursor = connection.cursor(dictionary=True)
-        cursor.execute(sql, params or ())
-        
-        if fetch_one:
-            result = cursor.fetchone()
-        else:
-            result = cursor.fetchall()
-        
+        with tracker as timer:
+            cursor.execute(sql, params or ())
+
+            if fetch_one:
+                result = cursor.fetchone()
+            else:
+                result = cursor.fetchall()
+            timer.rows = cursor.rowcount
+
         return result
     
     except Error as e:
@@ -57,8 +523,71 @@ def execute_query(sql, params=None, fetch_one=False):
     finally:
         if cursor:
             cursor.close()
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
+        _capture_slow_query(sql, params, tracker.timer)
+
+def stream_query(sql, params=None, chunk_size=1000):
+    """
+    Execute a SELECT query and yield its rows in chunks as they arrive.
+
+    Uses an unbuffered cursor on a dedicated pooled connection: MySQL sends
+    rows as the query produces them and only `chunk_size` rows are held in
+    memory at a time. The connection is busy until the generator is exhausted
+    or closed. If it is abandoned part-way (e.g. the client disconnects),
+    the unread rows make the connection unusable, so it is discarded rather
+    than returned to the pool.
+
+    Args:
+        sql (str): SQL query string with %s placeholders
+        params (tuple/list): Parameters for the query
+        chunk_size (int): Rows per fetch
+
+    Yields:
+        list: Up to chunk_size rows as dictionaries
+
+    Raises:
+        mysql.connector.Error: If the connection or query fails
+    """
+    connection = get_connection()
+    if not connection:
+        raise Error("Failed to establish database connection")
+
+    cursor = None
+    finished = False
+    # Only time spent in the driver counts; the consumer's time between chunks does not
+    elapsed = 0.0
+    row_count = 0
+    error = None
+    started = time.perf_counter()
+    try:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        cursor.execute(sql, params or ())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            elapsed += time.perf_counter() - started
+            if not rows:
+                break
+            row_count += len(rows)
+            yield rows
+            started = time.perf_counter()
+        finished = True
+
+    except Error as e:
+        error = e
+        elapsed += time.perf_counter() - started
+        print(f"Error streaming query: {e}")
+        print(f"SQL: {sql}")
+        print(f"Params: {params}")
+        raise
+
+    finally:
+        record_query(sql, elapsed, row_count, error)
+        if finished:
+            cursor.close()
+            connection.close()
+        else:
+            connection.invalidate()
 
 def execute_update(sql, params=None):
     """
@@ -76,6 +605,7 @@ def execute_update(sql, params=None):
     """
     connection = None
     cursor = None
+    tracker = track_query(sql)
     try:
         connection = get_connection()
         if not connection:
@@ -85,7 +615,9 @@ def execute_update(sql, params=None):
 
         # Execute the query - triggers will fire during execution
         # If a trigger raises an error, this will raise mysql.connector.Error
-        cursor.execute(sql, params or ())
+        with tracker as timer:
+            cursor.execute(sql, params or ())
+            timer.rows = cursor.rowcount
 
         # Only commit if execute succeeded (no trigger errors)
         connection.commit()
@@ -106,8 +638,9 @@ def execute_update(sql, params=None):
     finally:
         if cursor:
             cursor.close()
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
+        _capture_slow_query(sql, params, tracker.timer)
 
 def execute_transaction(queries):
     """
@@ -130,7 +663,9 @@ def execute_transaction(queries):
         
         # Execute all queries
         for sql, params in queries:
-            cursor.execute(sql, params or ())
+            with track_query(sql) as timer:
+                cursor.execute(sql, params or ())
+                timer.rows = cursor.rowcount
         
         # Commit transaction
         connection.commit()
@@ -145,7 +680,7 @@ def execute_transaction(queries):
     finally:
         if cursor:
             cursor.close()
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
 
 def call_procedure(proc_name, params=None):
@@ -168,12 +703,14 @@ def call_procedure(proc_name, params=None):
             return None
 
         cursor = connection.cursor(dictionary=True)
-        cursor.callproc(proc_name, params or ())
+        with track_query(f"CALL {proc_name}") as timer:
+            cursor.callproc(proc_name, params or ())
 
-        # Stored procedures can return multiple result sets
-        results = []
-        for result in cursor.stored_results():
-            results.append(result.fetchall())
+            # Stored procedures can return multiple result sets
+            results = []
+            for result in cursor.stored_results():
+                results.append(result.fetchall())
+            timer.rows = sum(len(rows) for rows in results)
 
         connection.commit()
         return results
@@ -189,7 +726,7 @@ def call_procedure(proc_name, params=None):
     finally:
         if cursor:
             cursor.close()
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
 
 def call_function(func_name, params):
@@ -216,8 +753,10 @@ def call_function(func_name, params):
         placeholders = ', '.join(['%s'] * len(params))
         sql = f"SELECT {func_name}({placeholders}) AS result"
 
-        cursor.execute(sql, params)
-        result = cursor.fetchone()
+        with track_query(sql) as timer:
+            cursor.execute(sql, params)
+            result = cursor.fetchone()
+            timer.rows = 1 if result else 0
 
         return result[0] if result else None
 
@@ -230,9 +769,55 @@ def call_function(func_name, params):
     finally:
         if cursor:
             cursor.close()
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
 
+def _function_batch_sql(func_name, params_list):
+    """
+    Build one SELECT that applies a function to every argument tuple.
+
+    The tuples become rows of a UNION ALL derived table, numbered so results
+    come back in input order:
+        SELECT f(a.p0, a.p1) AS result
+        FROM (SELECT 0 AS i, %s AS p0, %s AS p1 UNION ALL SELECT 1, %s, %s ...) AS a
+        ORDER BY a.i
+    """
+    arity = len(params_list[0])
+    first = ', '.join(['0 AS i'] + [f'%s AS p{j}' for j in range(arity)])
+    rest = [', '.join([str(i)] + ['%s'] * arity) for i in range(1, len(params_list))]
+    rows = ' UNION ALL '.join(f'SELECT {columns}' for columns in [first] + rest)
+    args = ', '.join(f'a.p{j}' for j in range(arity))
+    sql = f"SELECT {func_name}({args}) AS result FROM ({rows}) AS a ORDER BY a.i"
+    return sql, [value for params in params_list for value in params]
+
+def call_function_many(func_name, params_list):
+    """
+    Evaluate a stored function for many argument tuples in one round trip.
+
+    Replaces a loop of call_function() calls (one query and one pooled
+    connection each) with a single SELECT over a derived table of the
+    arguments.
+
+    Args:
+        func_name (str): Name of the stored function
+        params_list (list): Argument tuples, all of the same length
+
+    Returns:
+        list: The function's result for each tuple, in order, or None if the call fails
+
+    Example:
+        averages = call_function_many('average_department_salary', [(10,), (11,), (12,)])
+    """
+    if not params_list:
+        return []
+
+    sql, params = _function_batch_sql(func_name, params_list)
+    rows = execute_query(sql, params)
+    if rows is None:
+        print(f"Function: {func_name}")
+        return None
+    return [row['result'] for row in rows]
+
 def test_connection():
     """
     Test database connection and print connection info.
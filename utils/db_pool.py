@@ -0,0 +1,313 @@
+"""
+MySQL connection pool for CourseTracker.
+
+Keeps a bounded set of open mysql-connector connections so that route handlers
+do not pay for a TCP handshake and MySQL authentication on every query.
+
+Features:
+    - Fixed pool size plus a bounded number of overflow connections
+    - Checkout timeout when every connection is in use
+    - Liveness check (ping) when a connection is borrowed
+    - Recycling of connections older than a maximum age
+    - Metrics: in use, idle, checkouts, wait time, timeouts
+
+Connections handed out by the pool are wrapped in PooledConnection. Calling
+close() on the wrapper returns the connection to the pool instead of closing it,
+so existing code that does `connection.close()` keeps working unchanged.
+"""
+
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a raw MySQL connection borrowed from a ConnectionPool.
+
+    Every attribute is forwarded to the underlying connection except close(),
+    which hands the connection back to the pool. close() is safe to call twice.
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    @property
+    def raw(self):
+        """The underlying mysql.connector connection (None once released)."""
+        return self._connection
+
+    def close(self):
+        """Return the connection to the pool."""
+        if self._connection is not None:
+            connection = self._connection
+            self._connection = None
+            self._pool.release(connection)
+
+    def invalidate(self):
+        """Close the underlying connection and free its pool slot."""
+        if self._connection is not None:
+            connection = self._connection
+            self._connection = None
+            self._pool.release(connection, discard=True)
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise Error("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of MySQL connections.
+
+    Args:
+        db_config (dict): Keyword arguments for mysql.connector.connect()
+        size (int): Number of connections kept open while idle
+        max_overflow (int): Extra connections allowed above `size` under load.
+            Overflow connections are closed when returned.
+        timeout (float): Seconds to wait for a free connection before raising
+            PoolTimeoutError
+        recycle (int): Maximum connection age in seconds; older connections are
+            replaced on checkout. 0 disables recycling.
+        pre_ping (bool): If True, ping each connection when it is borrowed and
+            replace it if the server has gone away
+    """
+
+    def __init__(self, db_config, size=5, max_overflow=10, timeout=30.0,
+                 recycle=1800, pre_ping=True):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        if max_overflow < 0:
+            raise ValueError("max_overflow cannot be negative")
+
+        self.db_config = dict(db_config)
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._cond = threading.Condition()
+        self._idle = deque()          # raw connections ready for checkout
+        self._created_at = {}         # id(connection) -> creation timestamp
+        self._total = 0               # open connections (idle + in use)
+        self._in_use = 0
+        self._disposed = False        # set by dispose(): close connections on return
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._invalidated = 0
+
+    # ------------------------------------------------------------------
+    # Checkout / return
+    # ------------------------------------------------------------------
+
+    def acquire(self, timeout=None):
+        """
+        Borrow a connection from the pool.
+
+        Args:
+            timeout (float, optional): Override the pool checkout timeout
+
+        Returns:
+            PooledConnection: Wrapper whose close() returns it to the pool
+
+        Raises:
+            PoolTimeoutError: If no connection is free within the timeout
+            mysql.connector.Error: If a new connection cannot be opened
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if self._total < self.size + self.max_overflow:
+                    # Reserve the slot now, open the connection outside the lock
+                    self._total += 1
+                    connection = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Connection pool exhausted: {self._in_use} connections in use, "
+                        f"no connection available after {timeout:.1f}s"
+                    )
+                waited = True
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._checkouts += 1
+            wait_time = time.monotonic() - start
+            if waited:
+                self._waits += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        try:
+            connection = self._prepare(connection)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, connection)
+
+    def release(self, connection, discard=False):
+        """
+        Return a raw connection to the pool.
+
+        An open transaction is rolled back so the next borrower starts from a
+        clean state (and does not see a stale REPEATABLE READ snapshot); a
+        connection whose rollback fails is discarded. There is no ping here:
+        the next checkout pings (pre_ping). Overflow connections, and every
+        connection returned to a disposed pool, are closed instead.
+
+        Args:
+            connection: Raw mysql.connector connection
+            discard (bool): Close the connection instead of keeping it
+        """
+        if not discard and connection.in_transaction:
+            try:
+                connection.rollback()
+            except Error:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._disposed or len(self._idle) >= self.size:
+                self._total -= 1
+                self._created_at.pop(id(connection), None)
+                if discard:
+                    self._invalidated += 1
+                keep = False
+            else:
+                self._idle.append(connection)
+                keep = True
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(connection)
+
+    def _prepare(self, connection):
+        """Recycle, ping or open a connection for checkout."""
+        if connection is not None:
+            created_at = self._created_at.get(id(connection), 0)
+            if self.recycle and time.time() - created_at > self.recycle:
+                self._forget(connection)
+                self._close_quietly(connection)
+                with self._cond:
+                    self._recycled += 1
+                connection = None
+            elif self.pre_ping and not self._is_alive(connection):
+                self._forget(connection)
+                self._close_quietly(connection)
+                with self._cond:
+                    self._invalidated += 1
+                connection = None
+
+        if connection is None:
+            connection = mysql.connector.connect(**self.db_config)
+            with self._cond:
+                self._created_at[id(connection)] = time.time()
+                self._created += 1
+
+        return connection
+
+    def _forget(self, connection):
+        with self._cond:
+            self._created_at.pop(id(connection), None)
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+    # ------------------------------------------------------------------
+    # Maintenance and metrics
+    # ------------------------------------------------------------------
+
+    def dispose(self):
+        """
+        Close every idle connection. Connections in use are closed when they
+        are returned, and so is every connection borrowed afterwards: build a
+        new pool to keep using the database.
+        """
+        with self._cond:
+            self._disposed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            for connection in idle:
+                self._created_at.pop(id(connection), None)
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def status(self):
+        """
+        Snapshot of pool state and counters.
+
+        Returns:
+            dict: size, max_overflow, in_use, idle, total, checkouts, waits,
+                wait_time_total, wait_time_avg, wait_time_max, timeouts,
+                created, recycled, invalidated
+        """
+        with self._cond:
+            return {
+                'size': self.size,
+                'max_overflow': self.max_overflow,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'total': self._total,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_total': self._wait_time_total,
+                'wait_time_avg': (self._wait_time_total / self._checkouts
+                                  if self._checkouts else 0.0),
+                'wait_time_max': self._wait_time_max,
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'recycled': self._recycled,
+                'invalidated': self._invalidated,
+            }
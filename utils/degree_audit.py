@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Degree Audit for CourseTracker
+
+For every declared major (declares) a student must satisfy each requirement
+the major requires (requires). A requirement is satisfied by any course that
+fulfills it (fulfills). Per student and declared major, each required
+requirement is:
+    met          - a fulfilling course was completed with a recorded passing
+                   grade (not F); an ungraded completion does not count
+    in_progress  - not met, but the student is enrolled in a fulfilling course
+    missing      - neither
+
+The audit reads the rules (requires, fulfills) and the students' declarations
+and enrollments with four set-based queries, for one student or the whole
+student body, and does the rest with set algebra in memory. The batch audit
+writes the result to the degree_audit table (one row per student, major and
+requirement) in one transaction, so readers see either the previous or the new
+audit.
+
+Usage:
+    python -m utils.degree_audit [--student ID]
+
+Options:
+    --student ID: Re-audit one student instead of the whole student body
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from mysql.connector import Error
+from config import Config
+from utils.db_connection import unit_of_work
+
+AUDIT_STATUSES = ('met', 'in_progress', 'missing')
+
+REQUIRES_SQL = "SELECT majorId, degreeType, reqId FROM requires"
+
+FULFILLS_SQL = "SELECT courseId, reqId FROM fulfills"
+
+DECLARES_SQL = """
+    SELECT studentId, majorId, degreeType
+    FROM declares
+    WHERE (%s IS NULL OR studentId = %s)
+"""
+
+# Completed (graded, passing) and current enrollments of students with a declared major
+COURSES_SQL = """
+    SELECT e.studentId, e.courseId, e.status
+    FROM enrolls_in e
+    WHERE e.status IN ('completed', 'enrolled')
+    AND (e.grade <> 'F' OR (e.grade IS NULL AND e.status = 'enrolled'))
+    AND (%s IS NULL OR e.studentId = %s)
+    AND e.studentId IN (SELECT studentId FROM declares)
+"""
+
+INSERT_AUDIT_SQL = """
+    INSERT INTO degree_audit (studentId, majorId, degreeType, reqId, status, auditedAt)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+def audit_students(uow, student_id=None):
+    """
+    Audit the declared majors of one student or of every student.
+
+    Args:
+        uow (UnitOfWork): Open unit of work (the reads share its snapshot)
+        student_id (int, optional): Student to audit; None audits everyone
+
+    Returns:
+        list: One dict per declared major with studentId, majorId, degreeType
+        and met, in_progress, missing (sets of reqIds), ordered by student
+    """
+    required = {}
+    for row in uow.query(REQUIRES_SQL):
+        required.setdefault((row['majorId'], row['degreeType']), set()).add(row['reqId'])
+
+    fulfills = {}
+    for row in uow.query(FULFILLS_SQL):
+        fulfills.setdefault(row['courseId'], set()).add(row['reqId'])
+
+    # Requirements each student has satisfied / is working on
+    satisfied, pending = {}, {}
+    for row in uow.query(COURSES_SQL, (student_id, student_id)):
+        reqs = fulfills.get(row['courseId'])
+        if reqs:
+            target = satisfied if row['status'] == 'completed' else pending
+            target.setdefault(row['studentId'], set()).update(reqs)
+
+    audits = []
+    empty = frozenset()
+    for row in uow.query(DECLARES_SQL, (student_id, student_id)):
+        student = row['studentId']
+        reqs = required.get((row['majorId'], row['degreeType']), empty)
+        met = reqs & satisfied.get(student, empty)
+        in_progress = (reqs & pending.get(student, empty)) - met
+        audits.append({
+            'studentId': student,
+            'majorId': row['majorId'],
+            'degreeType': row['degreeType'],
+            'met': met,
+            'in_progress': in_progress,
+            'missing': reqs - met - in_progress,
+        })
+
+    audits.sort(key=lambda a: (a['studentId'], a['majorId'], a['degreeType']))
+    return audits
+
+
+def audit_rows(audits, audited_at):
+    """Flatten audits into degree_audit parameter tuples."""
+    for audit in audits:
+        key = (audit['studentId'], audit['majorId'], audit['degreeType'])
+        for status in AUDIT_STATUSES:
+            for req_id in sorted(audit[status]):
+                yield key + (req_id, status, audited_at)
+
+
+def run_audit(student_id=None, batch_size=None):
+    """
+    Audit one student or the whole student body and store the result.
+
+    Replaces the student's (or every) degree_audit row in one transaction.
+
+    Args:
+        student_id (int, optional): Student to audit; None audits everyone
+        batch_size (int, optional): Rows per executemany() call
+            (default Config.DEGREE_AUDIT_BATCH_SIZE)
+
+    Returns:
+        dict: students, majors (declarations audited), rows written, counts per
+        status and timings in seconds (read, write, total)
+
+    Raises:
+        mysql.connector.Error: If the transaction fails; nothing is written
+    """
+    batch_size = batch_size or Config.DEGREE_AUDIT_BATCH_SIZE
+    started = time.perf_counter()
+    audited_at = datetime.now().replace(microsecond=0)
+
+    with unit_of_work() as uow:
+        audits = audit_students(uow, student_id)
+        read_done = time.perf_counter()
+
+        if student_id is None:
+            uow.execute("DELETE FROM degree_audit")
+        else:
+            uow.execute("DELETE FROM degree_audit WHERE studentId = %s", (student_id,))
+
+        rows = list(audit_rows(audits, audited_at))
+        for start in range(0, len(rows), batch_size):
+            uow.executemany(INSERT_AUDIT_SQL, rows[start:start + batch_size])
+
+    finished = time.perf_counter()
+    return {
+        'students': len({a['studentId'] for a in audits}),
+        'majors': len(audits),
+        'rows': len(rows),
+        'counts': {status: sum(len(a[status]) for a in audits) for status in AUDIT_STATUSES},
+        'timings': {
+            'read': read_done - started,
+            'write': finished - read_done,
+            'total': finished - started,
+        },
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Audit declared majors and store the result in degree_audit.')
+    parser.add_argument('--student', type=int, help='re-audit one student only')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("CourseTracker Degree Audit")
+    print("=" * 70)
+
+    try:
+        report = run_audit(student_id=args.student)
+    except Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(2)
+
+    counts = report['counts']
+    timings = report['timings']
+    print(f"✓ Audited {report['majors']} declared major(s) of {report['students']} student(s)")
+    print(f"  {counts['met']} met, {counts['in_progress']} in progress, {counts['missing']} missing")
+    print(f"  Wrote {report['rows']} degree_audit rows in {timings['total']:.2f}s "
+          f"(read {timings['read']:.2f}s, write {timings['write']:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+"""
+Enrollment helpers for CourseTracker.
+
+Shared by the student enrollment route and the admin bulk-enrollment API:
+    - enroll_student(): claim a seat and enroll one student, retrying on lock conflicts
+    - enrollment_error_from(): map a procedure/trigger/constraint error to a typed exception
+    - classify_enrollment_error(): the same, as a reason code
+    - student_eligibility(): which sections a student can enroll in right now
+    - parse_enrollment_rows(): read (studentId, courseId, sectionNo) rows from CSV or JSON
+    - bulk_enroll(): insert many enrollments in one transaction with per-row results
+"""
+
+import csv
+import io
+import random
+import time
+from mysql.connector import Error
+from config import Config
+from utils.db_connection import unit_of_work, execute_query
+from utils.prereq_graph import get_prerequisite_graph
+
+ENROLL_SQL = """
+    INSERT INTO enrolls_in (studentId, courseId, sectionNo, status, grade, enrolledDate)
+    VALUES (%s, %s, %s, 'enrolled', NULL, CURDATE())
+"""
+
+# Deadlock and lock wait timeout: the transaction can simply be run again
+RETRYABLE_ERRNOS = {1213, 1205}
+
+# Errors after which InnoDB has rolled back the whole transaction (deadlock,
+# or the savepoint is gone because of it); no per-row recovery is possible
+TRANSACTION_ABORTED_ERRNOS = {1213, 1305}
+
+# Reason codes -> user-facing messages
+ENROLLMENT_ERROR_MESSAGES = {
+    'duplicate': 'Already enrolled in this course section.',
+    'prerequisites': 'Prerequisites not met for this course.',
+    'full': 'Section is at full capacity.',
+    'completed': 'Course already completed.',
+    'not_found': 'Unknown student or course section.',
+    'invalid': 'Row must contain a numeric studentId and courseId and a sectionNo of 1-4 characters.',
+    'busy': 'The section is busy; please try again.',
+    'error': 'Enrollment failed.',
+}
+
+
+class EnrollmentError(Exception):
+    """
+    Raised when an enrollment is rejected.
+
+    Subclasses identify the reason; catch EnrollmentError for all of them.
+
+    Attributes:
+        reason (str): Key of ENROLLMENT_ERROR_MESSAGES
+        cause (Exception): Underlying database error, if any
+    """
+
+    reason = 'error'
+
+    def __init__(self, cause=None):
+        super().__init__(ENROLLMENT_ERROR_MESSAGES[self.reason])
+        self.cause = cause
+
+
+class PrerequisitesNotMet(EnrollmentError):
+    """A prerequisite of the course has not been completed (SQLSTATE 45001)."""
+    reason = 'prerequisites'
+
+
+class SectionFull(EnrollmentError):
+    """The section has no open seats (SQLSTATE 45002)."""
+    reason = 'full'
+
+
+class AlreadyEnrolled(EnrollmentError):
+    """The student is already enrolled in the course (SQLSTATE 45003 or duplicate key)."""
+    reason = 'duplicate'
+
+
+class AlreadyCompleted(EnrollmentError):
+    """The student has already completed the course (SQLSTATE 45004)."""
+    reason = 'completed'
+
+
+class SectionNotFound(EnrollmentError):
+    """The section or student does not exist (SQLSTATE 45005 or foreign key failure)."""
+    reason = 'not_found'
+
+
+class EnrollmentBusy(EnrollmentError):
+    """Lock conflicts persisted after every retry."""
+    reason = 'busy'
+
+
+# SQLSTATEs signalled by enroll_student, update_open_seats and the enrollment
+# triggers (see the header of database/triggers.sql)
+ENROLLMENT_SQLSTATES = {
+    '45001': PrerequisitesNotMet,
+    '45002': SectionFull,
+    '45003': AlreadyEnrolled,
+    '45004': AlreadyCompleted,
+    '45005': SectionNotFound,
+}
+
+# MySQL error numbers for constraint failures on the enrolls_in INSERT
+ENROLLMENT_ERRNOS = {
+    1062: AlreadyEnrolled,   # ER_DUP_ENTRY
+    1452: SectionNotFound,   # ER_NO_REFERENCED_ROW_2
+}
+
+
+def enrollment_error_from(error):
+    """
+    Convert a database error from an enrollment into a typed EnrollmentError.
+
+    Args:
+        error (mysql.connector.Error): Error raised by the CALL or INSERT
+
+    Returns:
+        EnrollmentError: Instance of the matching subclass (EnrollmentError
+        itself for unrecognised errors), with the database error as cause
+    """
+    cls = (ENROLLMENT_SQLSTATES.get(getattr(error, 'sqlstate', None))
+           or ENROLLMENT_ERRNOS.get(getattr(error, 'errno', None))
+           or EnrollmentError)
+    return cls(error)
+
+
+def classify_enrollment_error(error):
+    """
+    Map an enrollment INSERT error to a reason code.
+
+    Args:
+        error (Exception): Error raised by the INSERT
+
+    Returns:
+        str: One of the keys of ENROLLMENT_ERROR_MESSAGES
+    """
+    return enrollment_error_from(error).reason
+
+
+def enroll_student(student_id, course_id, section_no, max_retries=None, backoff=None):
+    """
+    Enroll one student in a section without overselling it.
+
+    Calls the enroll_student stored procedure, which locks the section's
+    section_stats row (SELECT ... FOR UPDATE), runs the prerequisite, capacity
+    and existing-enrollment checks once each with indexed lookups, and
+    inserts the row. Concurrent enrollments in the same section queue on the
+    counter row instead of racing; sections do not block each other.
+
+    Deadlocks and lock wait timeouts roll the transaction back; it is retried
+    up to max_retries times with jittered exponential backoff.
+
+    Must not be called inside another unit_of_work() block, because a retry
+    needs to restart the whole transaction.
+
+    Args:
+        student_id (int): Student to enroll
+        course_id (int): Course of the section
+        section_no (str): Section number
+        max_retries (int, optional): Defaults to Config.ENROLL_MAX_RETRIES
+        backoff (float, optional): Base delay in seconds; defaults to Config.ENROLL_RETRY_BACKOFF
+
+    Returns:
+        int: Number of retries that were needed
+
+    Raises:
+        EnrollmentError: PrerequisitesNotMet, SectionFull, AlreadyEnrolled,
+            AlreadyCompleted, SectionNotFound, EnrollmentBusy (retries
+            exhausted), or EnrollmentError itself for other database errors
+    """
+    max_retries = Config.ENROLL_MAX_RETRIES if max_retries is None else max_retries
+    backoff = Config.ENROLL_RETRY_BACKOFF if backoff is None else backoff
+
+    attempt = 0
+    while True:
+        try:
+            with unit_of_work() as uow:
+                uow.call_procedure('enroll_student', (student_id, course_id, section_no))
+            return attempt
+
+        except Error as e:
+            if e.errno not in RETRYABLE_ERRNOS:
+                raise enrollment_error_from(e) from e
+            if attempt >= max_retries:
+                raise EnrollmentBusy(e) from e
+            attempt += 1
+            # Full jitter keeps retrying transactions from colliding again in lockstep
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+def student_eligibility(student_id):
+    """
+    Classify every section by whether the student can enroll in it now.
+
+    Combines the student's enrollment history (one indexed query), live open
+    seats from section_stats (one query) and the in-memory prerequisite graph.
+    Statuses, in order of precedence:
+        completed  - the student already completed the course
+        enrolled   - the student is currently enrolled in the course
+        blocked    - a direct prerequisite is not completed (as prereq_check)
+        full       - no open seats
+        eligible   - enrollment would succeed (barring a race for the last seat)
+
+    Args:
+        student_id (int): Student to check
+
+    Returns:
+        list: One dict per section with courseId, sectionNo, openSeats, status
+        and, for blocked sections, missing (direct prerequisites not completed)
+        and missingChain (every prerequisite in the chain not completed).
+        None if the database is unavailable.
+    """
+    graph = get_prerequisite_graph()
+    history = execute_query("SELECT courseId, status FROM enrolls_in WHERE studentId = %s", (student_id,))
+    seats = execute_query("""
+        SELECT courseId, sectionNo, open_seats
+        FROM section_stats
+        ORDER BY courseId, sectionNo
+    """)
+    if graph is None or history is None or seats is None:
+        return None
+
+    completed = {row['courseId'] for row in history if row['status'] == 'completed'}
+    enrolled = {row['courseId'] for row in history if row['status'] == 'enrolled'}
+    completed_mask = graph.mask(completed)
+
+    course_status = {}
+    sections = []
+    for seat in seats:
+        course_id = seat['courseId']
+        if course_id not in course_status:
+            missing = graph.missing(course_id, completed_mask)
+            if course_id in completed:
+                course_status[course_id] = ('completed', None)
+            elif course_id in enrolled:
+                course_status[course_id] = ('enrolled', None)
+            elif missing:
+                chain = graph.missing(course_id, completed_mask, transitive=True)
+                course_status[course_id] = ('blocked', (graph.courses(missing), graph.courses(chain)))
+            else:
+                course_status[course_id] = (None, None)
+
+        status, blocked_by = course_status[course_id]
+        if status is None:
+            status = 'eligible' if seat['open_seats'] > 0 else 'full'
+
+        section = {'courseId': course_id, 'sectionNo': seat['sectionNo'],
+                   'openSeats': seat['open_seats'], 'status': status}
+        if blocked_by:
+            section['missing'], section['missingChain'] = blocked_by
+        sections.append(section)
+
+    return sections
+
+
+def _clean_row(student_id, course_id, section_no):
+    """Validate one input row; returns (studentId, courseId, sectionNo) or None."""
+    try:
+        student_id = int(str(student_id).strip())
+        course_id = int(str(course_id).strip())
+    except (TypeError, ValueError):
+        return None
+    section_no = str(section_no if section_no is not None else '').strip()
+    if not section_no or len(section_no) > 4:
+        return None
+    return student_id, course_id, section_no
+
+
+def parse_enrollment_rows(data=None, text=None):
+    """
+    Read enrollment rows from decoded JSON or CSV text.
+
+    JSON may be a list (or {"rows": [...]}) of objects with studentId, courseId
+    and sectionNo keys, or of [studentId, courseId, sectionNo] lists. CSV has
+    one row per enrollment with an optional studentId,courseId,sectionNo header.
+
+    Args:
+        data: Decoded JSON body
+        text (str): CSV text
+
+    Returns:
+        tuple: (rows, invalid) where rows is a list of (row number, (studentId,
+        courseId, sectionNo)) and invalid is a list of (row number, raw row)
+
+    Raises:
+        ValueError: If the JSON body is neither a list nor {"rows": [...]}
+    """
+    if text is not None:
+        records = [r for r in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in r)]
+        if records and records[0] and not records[0][0].strip().isdigit():
+            header = [cell.strip() for cell in records[0]]
+            records = [dict(zip(header, r)) for r in records[1:]]
+    else:
+        records = data.get('rows', []) if isinstance(data, dict) else (data or [])
+        if not isinstance(records, list):
+            raise ValueError('Expected a JSON list of rows or {"rows": [...]}.')
+
+    rows, invalid = [], []
+    for number, record in enumerate(records, start=1):
+        if isinstance(record, dict):
+            values = (record.get('studentId'), record.get('courseId'), record.get('sectionNo'))
+        elif isinstance(record, (list, tuple)) and len(record) == 3:
+            values = tuple(record)
+        else:
+            values = None
+
+        cleaned = _clean_row(*values) if values else None
+        if cleaned:
+            rows.append((number, cleaned))
+        else:
+            invalid.append((number, record))
+    return rows, invalid
+
+
+def _row_result(number, values, status, reason=None):
+    student_id, course_id, section_no = values
+    result = {'row': number, 'studentId': student_id, 'courseId': course_id,
+              'sectionNo': section_no, 'status': status}
+    if reason:
+        result['reason'] = reason
+        result['message'] = ENROLLMENT_ERROR_MESSAGES[reason]
+    return result
+
+
+def bulk_enroll(rows, batch_size=500):
+    """
+    Enroll many (studentId, courseId, sectionNo) rows in one transaction.
+
+    Each batch is first inserted with a single batched INSERT under a
+    savepoint. If any row in it fails a trigger or constraint, the batch is
+    rolled back to its savepoint and its rows are retried one by one, each
+    under its own savepoint, so a failing row only drops itself. The capacity,
+    prerequisite and duplicate checks all run in the enrolls_in triggers, so
+    update_open_seats is not called per row.
+
+    Args:
+        rows (list): (row number, (studentId, courseId, sectionNo)) tuples from parse_enrollment_rows()
+        batch_size (int): Rows per batched INSERT
+
+    Returns:
+        tuple: (results, elapsed seconds); results holds one dict per row in input order
+
+    Raises:
+        mysql.connector.Error: If the transaction itself fails (e.g. lost connection
+        or deadlock); nothing is committed in that case
+    """
+    results = []
+    started = time.perf_counter()
+
+    with unit_of_work() as uow:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                with uow.savepoint():
+                    uow.executemany(ENROLL_SQL, [values for _, values in batch])
+                results.extend(_row_result(number, values, 'enrolled') for number, values in batch)
+                continue
+            except Error as e:
+                if e.errno in TRANSACTION_ABORTED_ERRNOS:
+                    raise
+
+            # Slow path: isolate the failing rows
+            for number, values in batch:
+                try:
+                    with uow.savepoint():
+                        uow.execute(ENROLL_SQL, values)
+                    results.append(_row_result(number, values, 'enrolled'))
+                except Error as e:
+                    if e.errno in TRANSACTION_ABORTED_ERRNOS:
+                        raise
+                    results.append(_row_result(number, values, 'failed', classify_enrollment_error(e)))
+
+    return results, time.perf_counter() - started
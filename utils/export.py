@@ -0,0 +1,115 @@
+"""
+Streaming export encoders for CourseTracker.
+
+The admin export routes read rows in chunks from an unbuffered cursor
+(see db_connection.stream_query) and pass them through these generators, so
+a response is built and sent one chunk at a time. Memory use depends on the
+chunk size, not on the number of rows exported.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+# Export datasets: URL name -> (SQL, column order)
+# No ORDER BY: sorting would make MySQL read the whole result before the first row
+EXPORT_DATASETS = {
+    'current-enrollments': (
+        """
+        SELECT studentId, studentName, courseId, title, code, sectionNo, credits,
+               professor, tas, grade, enrolledDate
+        FROM current_student_enrollments
+        """,
+        ['studentId', 'studentName', 'courseId', 'title', 'code', 'sectionNo', 'credits',
+         'professor', 'tas', 'grade', 'enrolledDate'],
+    ),
+    'completed-courses': (
+        """
+        SELECT studentId, studentName, courseId, title, code, sectionNo, credits,
+               grade, grade_points, enrolledDate
+        FROM completed_student_courses
+        """,
+        ['studentId', 'studentName', 'courseId', 'title', 'code', 'sectionNo', 'credits',
+         'grade', 'grade_points', 'enrolledDate'],
+    ),
+}
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _json_default(value):
+    """Serialize the MySQL column types json.dumps does not handle."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def csv_stream(chunks, columns):
+    """
+    Encode row chunks as CSV, one bytes object per chunk.
+
+    Args:
+        chunks (iterable): Lists of row dictionaries
+        columns (list): Column order (also the header row)
+
+    Yields:
+        bytes: UTF-8 encoded CSV text
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        for row in rows:
+            writer.writerow([row.get(column) for column in columns])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode('utf-8')
+
+
+def ndjson_stream(chunks, columns):
+    """
+    Encode row chunks as newline-delimited JSON, one bytes object per chunk.
+
+    Args:
+        chunks (iterable): Lists of row dictionaries
+        columns (list): Keys to include, in order
+
+    Yields:
+        bytes: UTF-8 encoded JSON lines
+    """
+    for rows in chunks:
+        lines = [json.dumps({column: row.get(column) for column in columns},
+                            default=_json_default, ensure_ascii=False)
+                 for row in rows]
+        if lines:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def gzip_stream(pieces, level=6):
+    """
+    Gzip a stream of bytes incrementally.
+
+    Args:
+        pieces (iterable): bytes objects
+        level (int): zlib compression level (1-9)
+
+    Yields:
+        bytes: gzip-framed compressed data
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for piece in pieces:
+        data = compressor.compress(piece)
+        if data:
+            yield data
+    yield compressor.flush()
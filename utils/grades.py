@@ -0,0 +1,166 @@
+"""
+Grade import for CourseTracker.
+
+Applies end-of-term grades from a CSV of
+    studentId, courseId, sectionNo, grade, status
+in one transaction. Rows are validated in memory against the enrolls_in ENUMs
+before anything touches the database, compared with the stored values, and
+only the rows that change are written, one multi-row UPDATE ... JOIN (VALUES
+...) statement per batch. A dry run
+stops after the comparison and writes nothing.
+"""
+
+import csv
+import io
+import time
+from utils.db_connection import unit_of_work
+
+# Mirror of the enrolls_in.grade and enrolls_in.status ENUMs in schema.sql
+GRADES = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F']
+STATUSES = ['enrolled', 'completed', 'withdrawn']
+
+CSV_COLUMNS = ['studentId', 'courseId', 'sectionNo', 'grade', 'status']
+
+# Rows per IN (...) lookup of the current values
+LOOKUP_BATCH_SIZE = 500
+
+# Applies one batch of new values: one ROW per change, {more_rows} adding the
+# rows after the first (so utils/plan_check.py can EXPLAIN the one-row form).
+# An UPDATE rather than INSERT ... ON DUPLICATE KEY UPDATE, so only the
+# enrolls_in UPDATE triggers fire.
+UPDATE_GRADES_SQL = """
+    UPDATE enrolls_in e
+    JOIN (VALUES ROW(%s, %s, %s, %s, %s){more_rows}) AS v (studentId, courseId, sectionNo, grade, status)
+        ON e.studentId = v.studentId AND e.courseId = v.courseId AND e.sectionNo = v.sectionNo
+    SET e.grade = v.grade, e.status = v.status
+"""
+
+
+def parse_grade_csv(text):
+    """
+    Parse and validate a grade CSV in memory.
+
+    The header row is optional. An empty grade clears the grade (NULL); an empty
+    status keeps the stored status.
+
+    Args:
+        text (str): CSV content
+
+    Returns:
+        tuple: (rows, errors) where rows is a list of dicts with row, key
+        (studentId, courseId, sectionNo), grade and status, and errors is a list
+        of {'row', 'message'} dicts
+    """
+    records = [r for r in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in r)]
+    offset = 1
+    if records and [c.strip() for c in records[0]][:len(CSV_COLUMNS)] == CSV_COLUMNS:
+        records = records[1:]
+        offset = 2
+
+    rows, errors, seen = [], [], {}
+    for number, record in enumerate(records, start=offset):
+        cells = [cell.strip() for cell in record] + [''] * (len(CSV_COLUMNS) - len(record))
+        student_id, course_id, section_no, grade, status = cells[:len(CSV_COLUMNS)]
+
+        if not (student_id.isdigit() and course_id.isdigit()) or not 0 < len(section_no) <= 4:
+            errors.append({'row': number, 'message': 'studentId and courseId must be numbers and sectionNo 1-4 characters.'})
+            continue
+        if grade and grade not in GRADES:
+            errors.append({'row': number, 'message': f"Invalid grade '{grade}'."})
+            continue
+        if status and status not in STATUSES:
+            errors.append({'row': number, 'message': f"Invalid status '{status}'."})
+            continue
+
+        key = (int(student_id), int(course_id), section_no)
+        if key in seen:
+            errors.append({'row': number, 'message': f'Duplicate of row {seen[key]}.'})
+            continue
+        seen[key] = number
+        rows.append({'row': number, 'key': key, 'grade': grade or None, 'status': status or None})
+
+    return rows, errors
+
+
+def _current_values(uow, keys, lock):
+    """Stored (grade, status) for each key, read in batches by primary key."""
+    current = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        batch = keys[start:start + LOOKUP_BATCH_SIZE]
+        placeholders = ', '.join(['(%s, %s, %s)'] * len(batch))
+        sql = f"""
+            SELECT studentId, courseId, sectionNo, grade, status
+            FROM enrolls_in
+            WHERE (studentId, courseId, sectionNo) IN ({placeholders})
+            {'FOR UPDATE' if lock else ''}
+        """
+        params = [value for key in batch for value in key]
+        for row in uow.query(sql, params):
+            current[(row['studentId'], row['courseId'], row['sectionNo'])] = (row['grade'], row['status'])
+    return current
+
+
+def import_grades(rows, dry_run=False, batch_size=500):
+    """
+    Compare grade rows with the database and apply the changes.
+
+    Args:
+        rows (list): Validated rows from parse_grade_csv()
+        dry_run (bool): Only compute the diff; write nothing
+        batch_size (int): Rows per UPDATE statement
+
+    Returns:
+        dict: changes (list of diff dicts), unchanged, missing (list of diff
+        dicts for rows with no enrollment), updated, dry_run and timings in
+        seconds (read, write, total)
+
+    Raises:
+        mysql.connector.Error: If the transaction fails; nothing is written
+    """
+    started = time.perf_counter()
+    changes, missing, unchanged = [], [], 0
+
+    with unit_of_work() as uow:
+        current = _current_values(uow, [row['key'] for row in rows], lock=not dry_run)
+        read_done = time.perf_counter()
+
+        for row in rows:
+            stored = current.get(row['key'])
+            student_id, course_id, section_no = row['key']
+            diff = {'row': row['row'], 'studentId': student_id, 'courseId': course_id,
+                    'sectionNo': section_no, 'grade': row['grade']}
+            if stored is None:
+                missing.append(diff)
+                continue
+
+            old_grade, old_status = stored
+            new_status = row['status'] or old_status
+            if (row['grade'], new_status) == (old_grade, old_status):
+                unchanged += 1
+                continue
+            diff.update(old_grade=old_grade, old_status=old_status, status=new_status)
+            changes.append(diff)
+
+        updated = 0
+        if changes and not dry_run:
+            for start in range(0, len(changes), batch_size):
+                batch = changes[start:start + batch_size]
+                sql = UPDATE_GRADES_SQL.format(more_rows=', ROW(%s, %s, %s, %s, %s)' * (len(batch) - 1))
+                params = [value for c in batch
+                          for value in (c['studentId'], c['courseId'], c['sectionNo'], c['grade'], c['status'])]
+                uow.execute(sql, params)
+            updated = len(changes)
+
+    finished = time.perf_counter()
+    return {
+        'dry_run': dry_run,
+        'changes': changes,
+        'unchanged': unchanged,
+        'missing': missing,
+        'updated': updated,
+        'timings': {
+            'read': read_done - started,
+            'write': finished - read_done,
+            'total': finished - started,
+        },
+    }
@@ -4,31 +4,51 @@ Database Initialization Script for CourseTracker
 
 This script initializes the CourseTracker database by executing SQL files in the correct order:
 1. schema.sql - Creates all tables
-2. auth_table.sql - Creates authentication table and test accounts
-3. data.sql - Inserts sample data
-4. views.sql - Creates database views
-5. triggers.sql - Creates database triggers
-6. procedures_functions.sql - Creates stored procedures and functions
+2. data.sql - Inserts sample data
+3. indexes.sql - Creates secondary indexes
+4. auth_table.sql - Creates authentication table and test accounts
+5. views.sql - Creates database views
+6. triggers.sql - Creates database triggers
+7. procedures_functions.sql - Creates stored procedures and functions
+
+With --scale or --students/--courses, a generated dataset of that size
+(utils/synthetic_data.py) is loaded instead of data.sql, before the triggers
+are created.
 
 Usage:
-    python -m utils.init_db [--force]
+    python -m utils.init_db [--force] [--scale small|medium|large]
+        [--students N] [--courses N] [--sections N] [--seed N]
+        [--batch-size N] [--load-data-infile]
 
 Options:
     --force: Skip confirmation prompt and force re-initialization
+    --scale: Load a synthetic dataset of a preset size (large: about 1M enrollments)
+    --students/--courses: Load a synthetic dataset of this size (overrides --scale)
+    --sections: Average sections per course (default 2)
+    --seed: Random seed for the synthetic dataset (default 42)
+    --batch-size: Rows per multi-row INSERT (default DATA_LOAD_BATCH_SIZE)
+    --load-data-infile: Load with LOAD DATA LOCAL INFILE instead of INSERTs
+        (the server needs local_infile=ON)
 """
 
+import argparse
 import os
 import sys
+import time
 import mysql.connector
 from mysql.connector import Error
 from config import Config
+from utils.synthetic_data import SCALES, SyntheticDataset, load_dataset
 
 # SQL files to execute in order
 # IMPORTANT: data.sql must come before auth_table.sql because auth references Student table
 # Logic files (views, triggers) should run AFTER data is inserted to ensure data exists for them to act on.
+# Secondary indexes are built after the bulk data load, which is faster than
+# maintaining them row by row during the inserts.
 SQL_FILES = [
     'schema.sql',
     'data.sql',
+    'indexes.sql',
     'auth_table.sql',
     'views.sql',
     'triggers.sql',
@@ -61,7 +81,7 @@ def read_sql_file(filepath):
         print(f"ERROR: Failed to read {filepath}: {e}")
         return None
 
-def execute_sql_statements(cursor, sql_content, filename):
+def execute_sql_statements(cursor, sql_content, filename, db_name=None):
     """
     Execute SQL statements from a file, handling DELIMITER statements.
 
@@ -69,6 +89,7 @@ def execute_sql_statements(cursor, sql_content, filename):
         cursor: MySQL cursor object
         sql_content (str): SQL content to execute
         filename (str): Name of the file (for error messages)
+        db_name (str, optional): Database to target; defaults to the configured database
 
     Returns:
         bool: True if successful, False otherwise
@@ -76,7 +97,7 @@ def execute_sql_statements(cursor, sql_content, filename):
     try:
         # Replace any USE database statements with the correct database name from config
         import re
-        db_name = Config.DB_CONFIG['database']
+        db_name = db_name or Config.DB_CONFIG['database']
 
         # Remove DROP DATABASE, CREATE DATABASE, and DROP TABLE statements from SQL files
         # The init script handles database dropping/creation, and we're creating fresh tables
@@ -187,17 +208,44 @@ def create_database(cursor, db_name):
         print(f"ERROR: Failed to create database: {e}")
         return False
 
-def initialize_database(force=False):
+def load_synthetic_data(connection, dataset, batch_size=None, method='insert'):
+    """
+    Load a synthetic dataset in place of data.sql and print per-table timings.
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    print(f"  Generating {dataset.students} students and {dataset.courses} courses "
+          f"(seed {dataset.seed}) and loading with "
+          f"{'LOAD DATA LOCAL INFILE' if method == 'infile' else 'multi-row INSERTs'}...")
+    started = time.perf_counter()
+    try:
+        report = load_dataset(connection, dataset, batch_size=batch_size, method=method)
+    except (Error, RuntimeError) as e:
+        print(f"ERROR: Failed to load synthetic data: {e}")
+        return False
+
+    for table, (rows, seconds) in report.items():
+        print(f"    {table:<16} {rows:>10,} rows  {seconds:7.2f}s")
+    print(f"  ✓ Loaded {sum(rows for rows, _ in report.values()):,} rows "
+          f"in {time.perf_counter() - started:.1f}s.")
+    return True
+
+def initialize_database(force=False, dataset=None, batch_size=None, load_method='insert', db_name=None):
     """
     Initialize the database by executing all SQL files.
 
     Args:
         force (bool): If True, skip confirmation prompt
+        dataset (SyntheticDataset, optional): Load this instead of data.sql
+        batch_size (int, optional): Rows per multi-row INSERT for the dataset
+        load_method (str): 'insert' or 'infile' (LOAD DATA LOCAL INFILE) for the dataset
+        db_name (str, optional): Database to create; defaults to the configured database
 
     Returns:
         bool: True if successful, False otherwise
     """
-    db_name = Config.DB_CONFIG['database']
+    db_name = db_name or Config.DB_CONFIG['database']
     database_dir = get_database_dir()
 
     print("="*70)
@@ -237,6 +285,8 @@ def initialize_database(force=False):
         # Connect without specifying database
         config = Config.DB_CONFIG.copy()
         config.pop('database', None)
+        if dataset is not None and load_method == 'infile':
+            config['allow_local_infile'] = True
 
         print("\nConnecting to MySQL server...")
         connection = mysql.connector.connect(**config)
@@ -260,11 +310,17 @@ def initialize_database(force=False):
             filepath = os.path.join(database_dir, filename)
             print(f"\n[{filename}]")
 
+            if filename == 'data.sql' and dataset is not None:
+                print("  Replaced by synthetic data")
+                if not load_synthetic_data(connection, dataset, batch_size, load_method):
+                    return False
+                continue
+
             sql_content = read_sql_file(filepath)
             if sql_content is None:
                 return False
 
-            if not execute_sql_statements(cursor, sql_content, filename):
+            if not execute_sql_statements(cursor, sql_content, filename, db_name=db_name):
                 return False
 
             connection.commit()
@@ -295,9 +351,27 @@ def initialize_database(force=False):
 
 def main():
     """Main entry point."""
-    force = '--force' in sys.argv or '-f' in sys.argv
-
-    success = initialize_database(force=force)
+    parser = argparse.ArgumentParser(description='Create the CourseTracker database and load its data.')
+    parser.add_argument('--force', '-f', action='store_true', help='skip the confirmation prompt')
+    parser.add_argument('--scale', choices=sorted(SCALES), help='load a synthetic dataset of a preset size')
+    parser.add_argument('--students', type=int, help='synthetic dataset: number of students')
+    parser.add_argument('--courses', type=int, help='synthetic dataset: number of courses')
+    parser.add_argument('--sections', type=int, default=2, help='synthetic dataset: average sections per course')
+    parser.add_argument('--seed', type=int, default=42, help='synthetic dataset: random seed')
+    parser.add_argument('--batch-size', type=int, help='rows per multi-row INSERT')
+    parser.add_argument('--load-data-infile', action='store_true',
+                        help='load the synthetic dataset with LOAD DATA LOCAL INFILE')
+    args = parser.parse_args()
+
+    dataset = None
+    if args.scale or args.students or args.courses:
+        size = dict(SCALES[args.scale or 'small'])
+        size['students'] = args.students or size['students']
+        size['courses'] = args.courses or size['courses']
+        dataset = SyntheticDataset(sections_per_course=args.sections, seed=args.seed, **size)
+
+    success = initialize_database(force=args.force, dataset=dataset, batch_size=args.batch_size,
+                                  load_method='infile' if args.load_data_infile else 'insert')
     sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
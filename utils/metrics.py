@@ -0,0 +1,407 @@
+"""
+Query and request metrics for CourseTracker
+
+Every helper in utils/db_connection.py reports the statements it runs here:
+the statement's fingerprint (the SQL with literals and parameters replaced by
+?, so "WHERE studentId = 4001" and "WHERE studentId = 4002" are one
+statement), the rows it returned or changed, the time spent executing it and
+fetching its rows, and whether it failed. Borrowing a connection from the
+pool is timed separately.
+
+Observations are aggregated per route (the Flask endpoint, "background" for
+work outside a request) and per statement into in-process histograms and
+counters, rendered in the Prometheus text format by render_metrics() (served
+to admins at /admin/metrics). Each statement is labelled with a short id;
+coursetracker_db_statement_info maps the id to its fingerprint.
+
+init_app() also adds per-request totals to every response:
+    X-DB-Queries: 4
+    X-DB-Time: 12.31                  (ms executing statements)
+    Server-Timing: db;dur=12.31;desc="4 queries", db-connect;dur=0.42, app;dur=35.08
+Statements that run_parallel() (utils/parallel.py) runs in helper threads
+count towards the request that started them, so X-DB-Time can exceed the
+request's wall-clock time.
+
+Counters are per process; with several worker processes each one has its own.
+"""
+
+import contextvars
+import hashlib
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from flask import g, has_request_context, request
+
+# Seconds
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Statements per request
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+BACKGROUND_ROUTE = 'background'
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/|--[^\n]*', re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+_COMMA_RE = re.compile(r' ?, ?')
+_PAREN_RE = re.compile(r'\( | \)')
+_IN_LIST_RE = re.compile(r'\bIN \(\?(?:, \?)*\)', re.I)
+_VALUES_RE = re.compile(r'(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+')
+_UNION_RE = re.compile(r'(?: UNION ALL SELECT \?(?:, \?)*)+', re.I)
+
+_lock = threading.Lock()
+_statements = {}  # statement id -> fingerprint
+_collectors = []
+
+# (route, per-request stats) of the request a helper thread works for; see bind_request()
+_bound_request = contextvars.ContextVar('bound_request', default=None)
+
+
+def _normalize(sql):
+    sql = _COMMENT_RE.sub(' ', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _WHITESPACE_RE.sub(' ', sql).strip()
+    sql = _COMMA_RE.sub(', ', sql)
+    sql = _PAREN_RE.sub(lambda m: m.group().strip(), sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    sql = _VALUES_RE.sub(r'\1, ...', sql)
+    return _UNION_RE.sub(' UNION ALL SELECT ...', sql)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """
+    Normalize a statement so every execution of it maps to one key.
+
+    Comments and extra whitespace are removed; string and number literals and
+    %s placeholders become ?; IN lists, multi-row VALUES lists and the UNION ALL
+    rows of call_function_many() collapse to "...".
+
+    Args:
+        sql (str): SQL statement
+
+    Returns:
+        tuple: (statement id, normalized SQL)
+    """
+    normalized = _normalize(sql)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12], normalized
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label tuple."""
+
+    def __init__(self, name, help_text, labels, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # label values -> [per-bucket counts, sum, count]
+
+    def observe(self, values, amount):
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = [[0] * len(self.buckets), 0.0, 0]
+        counts = series[0]
+        for i, bound in enumerate(self.buckets):
+            if amount <= bound:
+                counts[i] += 1
+                break
+        series[1] += amount
+        series[2] += 1
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, (counts, total, count) in sorted(self._series.items()):
+            labels = _labels(self.labels, values)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{labels},le="+Inf"}} {count}'
+            yield f"{self.name}_sum{{{labels}}} {total:.6f}"
+            yield f"{self.name}_count{{{labels}}} {count}"
+
+
+class Counter:
+    """Monotonic counter with one series per label tuple."""
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, values, amount=1):
+        self._series[values] = self._series.get(values, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for values, total in sorted(self._series.items()):
+            yield f"{self.name}{{{_labels(self.labels, values)}}} {total}"
+
+
+QUERY_DURATION = Histogram(
+    'coursetracker_db_query_duration_seconds',
+    'Time executing a statement and fetching its rows.', ('route', 'statement'))
+QUERY_ROWS = Counter(
+    'coursetracker_db_query_rows_total',
+    'Rows returned by queries or affected by writes.', ('route', 'statement'))
+QUERY_ERRORS = Counter(
+    'coursetracker_db_query_errors_total',
+    'Statements that raised a database error.', ('route', 'statement', 'errno'))
+CONNECT_DURATION = Histogram(
+    'coursetracker_db_connect_duration_seconds',
+    'Time borrowing a connection from the pool.', ('route',))
+CONNECT_ERRORS = Counter(
+    'coursetracker_db_connect_errors_total',
+    'Failed attempts to borrow a connection.', ('route',))
+REQUEST_DURATION = Histogram(
+    'coursetracker_http_request_duration_seconds',
+    'Time handling a request.', ('route', 'method', 'status'))
+REQUEST_QUERIES = Histogram(
+    'coursetracker_http_request_db_queries',
+    'Statements executed per request.', ('route',), QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = Histogram(
+    'coursetracker_http_request_db_seconds',
+    'Time executing statements per request.', ('route',))
+
+_METRICS = (QUERY_DURATION, QUERY_ROWS, QUERY_ERRORS, CONNECT_DURATION, CONNECT_ERRORS,
+            REQUEST_DURATION, REQUEST_QUERIES, REQUEST_DB_TIME)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def current_route():
+    """Metrics label for the current work: the Flask endpoint, or "background"."""
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    bound = _bound_request.get()
+    return bound[0] if bound else BACKGROUND_ROUTE
+
+
+def _request_stats():
+    if has_request_context():
+        return g.get('_query_stats')
+    bound = _bound_request.get()
+    return bound[1] if bound else None
+
+
+def request_binding():
+    """
+    Capture the current request for bind_request() in another thread.
+
+    Returns:
+        tuple: (route, per-request stats), or None outside a request
+    """
+    if not has_request_context():
+        return None
+    return current_route(), g.get('_query_stats')
+
+
+@contextmanager
+def bind_request(binding):
+    """
+    Attribute the statements run in this block (in a helper thread) to the
+    request captured by request_binding(): its route label and its
+    X-DB-Queries / X-DB-Time totals.
+    """
+    token = _bound_request.set(binding)
+    try:
+        yield
+    finally:
+        _bound_request.reset(token)
+
+
+def record_query(sql, seconds, rows=0, error=None):
+    """
+    Record one executed statement.
+
+    Args:
+        sql (str): SQL statement as sent (before parameter substitution)
+        seconds (float): Time executing it and fetching its rows
+        rows (int): Rows returned or affected
+        error (Exception, optional): Error it raised, if any
+    """
+    statement, normalized = fingerprint(sql)
+    key = (current_route(), statement)
+    with _lock:
+        _statements.setdefault(statement, normalized)
+        QUERY_DURATION.observe(key, seconds)
+        if error is None:
+            QUERY_ROWS.inc(key, max(rows or 0, 0))
+        else:
+            QUERY_ERRORS.inc(key + (str(getattr(error, 'errno', None) or type(error).__name__),))
+
+    stats = _request_stats()
+    if stats is not None:
+        with _lock:  # helper threads may update a request's totals concurrently
+            stats['queries'] += 1
+            stats['db_time'] += seconds
+
+
+def record_connect(seconds, error=None):
+    """
+    Record one attempt to borrow a pooled connection.
+
+    Args:
+        seconds (float): Time the attempt took
+        error (Exception, optional): Error it raised, if any
+    """
+    key = (current_route(),)
+    with _lock:
+        CONNECT_DURATION.observe(key, seconds)
+        if error is not None:
+            CONNECT_ERRORS.inc(key)
+
+    stats = _request_stats()
+    if stats is not None:
+        with _lock:
+            stats['connect_time'] += seconds
+
+
+class QueryTimer:
+    """
+    Handed out by track_query(); set `rows` before the block ends.
+
+    After the block, `seconds` holds the elapsed time and `error` the
+    exception it raised (None if it did not).
+    """
+
+    __slots__ = ('rows', 'seconds', 'error')
+
+    def __init__(self):
+        self.rows = 0
+        self.seconds = 0.0
+        self.error = None
+
+
+class track_query:
+    """
+    Context manager that times a statement and records it on exit.
+
+    Usage:
+        with track_query(sql) as timer:
+            cursor.execute(sql, params)
+            result = cursor.fetchall()
+            timer.rows = len(result)
+    """
+
+    __slots__ = ('sql', 'timer', 'started')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.timer = QueryTimer()
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self.timer
+
+    def __exit__(self, exc_type, exc, tb):
+        timer = self.timer
+        timer.seconds = time.perf_counter() - self.started
+        timer.error = exc
+        record_query(self.sql, timer.seconds, timer.rows, exc)
+        return False
+
+
+def register_collector(collector):
+    """
+    Add a source of extra samples to render_metrics().
+
+    Args:
+        collector (callable): Returns an iterable of (name, type, help, value)
+            where type is "gauge" or "counter"
+    """
+    _collectors.append(collector)
+
+
+def render_metrics():
+    """
+    Render every metric in the Prometheus text exposition format (0.0.4).
+
+    Returns:
+        str: Exposition text
+    """
+    with _lock:
+        lines = ["# HELP coursetracker_db_statement_info Normalized SQL of each statement id.",
+                 "# TYPE coursetracker_db_statement_info gauge"]
+        lines.extend(f'coursetracker_db_statement_info{{statement="{statement}",'
+                     f'fingerprint="{_escape(normalized)}"}} 1'
+                     for statement, normalized in sorted(_statements.items()))
+        for metric in _METRICS:
+            lines.extend(metric.render())
+
+    for collector in _collectors:
+        try:
+            samples = list(collector())
+        except Exception as e:
+            print(f"Error collecting metrics from {collector.__name__}: {e}")
+            continue
+        for name, kind, help_text, value in samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    """Clear every recorded series (used by benchmarks between runs)."""
+    with _lock:
+        _statements.clear()
+        for metric in _METRICS:
+            metric._series.clear()
+
+
+def _begin_request():
+    g._query_stats = {'queries': 0, 'db_time': 0.0, 'connect_time': 0.0,
+                      'started': time.perf_counter()}
+
+
+def _finish_request(response, add_headers):
+    stats = g.pop('_query_stats', None)
+    if stats is None:
+        return response
+
+    elapsed = time.perf_counter() - stats['started']
+    route = current_route()
+    with _lock:
+        REQUEST_DURATION.observe((route, request.method, str(response.status_code)), elapsed)
+        REQUEST_QUERIES.observe((route,), stats['queries'])
+        REQUEST_DB_TIME.observe((route,), stats['db_time'])
+
+    if add_headers:
+        db_ms = stats['db_time'] * 1000
+        response.headers['X-DB-Queries'] = str(stats['queries'])
+        response.headers['X-DB-Time'] = f"{db_ms:.2f}"
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.2f};desc="{stats["queries"]} queries", '
+            f'db-connect;dur={stats["connect_time"] * 1000:.2f}, app;dur={elapsed * 1000:.2f}')
+    return response
+
+
+def init_app(app):
+    """
+    Register the per-request hooks on a Flask app.
+
+    The X-DB-* and Server-Timing headers are added unless
+    app.config['QUERY_TIMING_HEADERS'] is false.
+
+    Args:
+        app: Flask application
+    """
+    add_headers = app.config.get('QUERY_TIMING_HEADERS', True)
+    app.before_request(_begin_request)
+    app.after_request(lambda response: _finish_request(response, add_headers))
@@ -0,0 +1,74 @@
+"""
+Keyset (cursor) pagination helpers for CourseTracker.
+
+Keyset pagination remembers the sort key of the last row shown and asks for
+rows strictly after it, instead of using OFFSET. The database never reads and
+discards the rows of earlier pages, so page 1000 costs the same as page 1.
+
+Cursors are passed around as opaque URL-safe tokens (base64 of a JSON list).
+"""
+
+import base64
+import binascii
+import json
+
+
+def encode_cursor(values):
+    """
+    Encode the sort-key values of the last row on a page as a URL-safe token.
+
+    Args:
+        values (list/tuple): Sort-key values (str/int)
+
+    Returns:
+        str: Opaque cursor token
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, length):
+    """
+    Decode a cursor token produced by encode_cursor().
+
+    Args:
+        token (str): Cursor token from the query string (may be None or empty)
+        length (int): Expected number of key values
+
+    Returns:
+        list: Sort-key values, or None if the token is missing or malformed
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def keyset_params(values):
+    """
+    Expand cursor values into the parameters of a keyset predicate.
+
+    For an ORDER BY on columns (a, b, c) the predicate selecting rows strictly
+    after the cursor is written out as
+        a > %s OR (a = %s AND (b > %s OR (b = %s AND c > %s)))
+    which MySQL can turn into an index range on the leading column (unlike a
+    row-constructor comparison such as (a, b, c) > (x, y, z)). Every value but
+    the last appears twice.
+
+    Args:
+        values (list): Sort-key values of the last row already shown
+
+    Returns:
+        list: Parameters in placeholder order
+    """
+    params = []
+    for value in values[:-1]:
+        params.extend([value, value])
+    params.append(values[-1])
+    return params
@@ -0,0 +1,77 @@
+"""
+Concurrent execution of independent queries for CourseTracker
+
+A page that needs several independent result sets (the analytics page) would
+otherwise wait for their round trips one after another. run_parallel() runs
+them at the same time on a bounded, process-wide thread pool and gathers the
+results, so the page waits roughly as long as the slowest of them.
+
+execute_query() borrows a pooled connection for every statement, so each task
+runs on a connection of its own: tasks share neither a transaction nor a
+snapshot, so use run_parallel() only for independent reads. The tasks'
+statements still count towards the calling request in the metrics (see
+bind_request() in utils/metrics.py). Loads that usually come from a cache
+gain nothing from a thread; call them inline.
+
+PARALLEL_QUERY_WORKERS bounds the threads, and so the extra connections, per
+process (under Gunicorn, per worker). With 1 the tasks run one after another
+in the calling thread.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import Config
+from utils.metrics import request_binding, bind_request
+
+# Shared thread pool, created on first use; a forked worker builds its own
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=Config.PARALLEL_QUERY_WORKERS,
+                                               thread_name_prefix='parallel-query')
+                _executor_pid = pid
+    return _executor
+
+
+def run_parallel(tasks):
+    """
+    Run independent query tasks concurrently and gather their results.
+
+    Example:
+        results = run_parallel({
+            'courses': lambda: execute_query(COURSES_SQL),
+            'student': lambda: execute_query(STUDENT_SQL, (student_id,), fetch_one=True),
+        })
+
+    Args:
+        tasks (dict): name -> callable taking no arguments
+
+    Returns:
+        dict: name -> what the callable returned
+
+    Raises:
+        Exception: The exception of the first failing task (in the order
+            given), after every task has finished
+    """
+    if Config.PARALLEL_QUERY_WORKERS <= 1 or len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    binding = request_binding()
+
+    def run(task):
+        with bind_request(binding):
+            return task()
+
+    executor = _get_executor()
+    futures = {name: executor.submit(run, task) for name, task in tasks.items()}
+    wait(futures.values())
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Query Plan Regression Check for CourseTracker
+
+Runs EXPLAIN on every SQL statement the application issues and fails if any
+of them does a full table scan of a large table. Statements are collected from:
+    - routes/*.py and utils/*.py (SQL string literals inside functions and
+      module-level SQL constants)
+    - database/views.sql (each view, probed the way the routes read it)
+    - database/triggers.sql and database/procedures_functions.sql (the
+      SELECT/INSERT/UPDATE/DELETE statements inside each body, with NEW./OLD.
+      references and parameters replaced by sample values)
+
+Placeholders (%s) are replaced by the sample value '1' and str.format() fields
+such as {filter} are dropped, which checks the unfiltered form. SQL assembled
+in f-strings (IN lists sized at run time, the function calls in
+utils/db_connection.py, the loaders in utils/synthetic_data.py and the batched
+lookups in utils/grades.py and utils/analytics_rollup.py) is not covered. Plans only mean something
+against realistic data volumes, so run this against a scaled dataset
+(for example the scratch database kept by `benchmarks.bench_view_plans --keep`).
+
+Usage:
+    python -m utils.plan_check [--database NAME] [--min-rows N] [--verbose]
+
+Options:
+    --database NAME: Database to EXPLAIN against (default: configured database)
+    --min-rows N: Only flag full scans the optimizer expects to read at least N rows (default 1000)
+    --verbose: Print the plan of every statement, not just failures
+
+Exit status is 1 if any statement fails the check or cannot be EXPLAINed, and
+2 if the database cannot be reached. The project has no test runner, so the
+check is a command like the benchmarks rather than a test suite; use it as a
+CI step after loading a scaled dataset.
+"""
+
+import argparse
+import ast
+import glob
+import os
+import re
+import sys
+
+import mysql.connector
+from mysql.connector import Error
+from config import Config
+from utils.init_db import get_database_dir, read_sql_file
+
+# Tables that grow with the student body; full scans of these fail the check
+LARGE_TABLES = {'enrolls_in', 'Student', 'app_users', 'degree_audit'}
+
+# Full scans that are inherent to what a statement does.
+# Key: (source file, function or object name, table) -> reason
+ALLOWED_FULL_SCANS = {
+    ('routes/admin_routes.py', 'degree_audit', 'degree_audit'):
+        'the registrar summary aggregates every audited requirement',
+    ('utils/analytics_rollup.py', 'COURSE_STATS_SQL', 'enrolls_in'):
+        'a full rollup rebuild aggregates every completed enrollment',
+    ('utils/analytics_rollup.py', 'PROFESSOR_STATS_SQL', 'enrolls_in'):
+        'a full rollup rebuild aggregates every completed enrollment',
+    ('utils/degree_audit.py', 'run_audit', 'degree_audit'):
+        'a full audit replaces every stored requirement',
+}
+
+# How the routes read each view; views not listed are probed with SELECT *
+VIEW_PROBES = {
+    'current_student_enrollments': "SELECT * FROM current_student_enrollments WHERE studentId = '1'",
+    'completed_student_courses': "SELECT * FROM completed_student_courses WHERE studentId = '1'",
+}
+
+SQL_START = re.compile(r'^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\s', re.IGNORECASE)
+SAMPLE_VALUE = "'1'"
+
+
+class Statement:
+    """One SQL statement to EXPLAIN, with where it came from."""
+
+    def __init__(self, source, name, sql):
+        self.source = source
+        self.name = name
+        self.sql = sql
+
+    @property
+    def label(self):
+        return f"{self.source}:{self.name}"
+
+
+def project_root():
+    """Absolute path of the repository root."""
+    return os.path.dirname(get_database_dir())
+
+
+def bind_samples(sql):
+    """Replace %s placeholders with sample literal values and drop format fields."""
+    sql = re.sub(r'\{\w+\}', '', sql)
+    sql = re.sub(r'\bLIMIT\s+%s', 'LIMIT 10', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'\bOFFSET\s+%s', 'OFFSET 0', sql, flags=re.IGNORECASE)
+    return sql.replace('%s', SAMPLE_VALUE)
+
+
+def python_statements(path):
+    """
+    Collect SQL string literals from a Python module: those inside functions
+    and module-level constants (NAME = "SELECT ..."), labelled with the name.
+
+    Args:
+        path (str): Path to a .py file
+
+    Returns:
+        list: Statement objects
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    source = os.path.relpath(path, project_root())
+    # Literal pieces of f-strings are fragments, not statements
+    fragments = {id(part) for node in ast.walk(tree) if isinstance(node, ast.JoinedStr)
+                 for part in node.values}
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if (isinstance(targets[0], ast.Name) and isinstance(value, ast.Constant)
+                and isinstance(value.value, str) and SQL_START.match(value.value)):
+            statements.append(Statement(source, targets[0].id, bind_samples(value.value)))
+
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for node in ast.walk(func):
+            if (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                    and id(node) not in fragments and SQL_START.match(node.value)):
+                statements.append(Statement(source, func.name, bind_samples(node.value)))
+    return statements
+
+
+def view_statements(sql_content):
+    """Probe statements for every view defined in views.sql."""
+    statements = []
+    for name in re.findall(r'CREATE\s+VIEW\s+(\w+)', sql_content, re.IGNORECASE):
+        probe = VIEW_PROBES.get(name, f"SELECT * FROM {name}")
+        statements.append(Statement('database/views.sql', name, probe))
+    return statements
+
+
+def routine_statements(sql_content, source):
+    """
+    Extract DML statements from trigger, procedure and function bodies.
+
+    SELECT ... INTO targets are dropped, NEW./OLD. column references and routine
+    parameters are replaced by sample values, and IF ... THEN prefixes are skipped.
+    """
+    statements = []
+    pattern = re.compile(
+        r'CREATE\s+(TRIGGER|PROCEDURE|FUNCTION)\s+(\w+)\s*(\([^)]*(?:\([^)]*\)[^)]*)*\))?(.*?)\bBEGIN\b(.*?)\bEND\s*//',
+        re.IGNORECASE | re.DOTALL)
+
+    for kind, name, params, _, body in pattern.findall(sql_content):
+        param_names = []
+        if params:
+            param_names = re.findall(r'(?:^|[(,])\s*(?:IN\s+|OUT\s+|INOUT\s+)?(\w+)\s+[A-Za-z]',
+                                     params, re.IGNORECASE)
+
+        body = re.sub(r'--[^\n]*', '', body)
+        for chunk in body.split(';'):
+            match = re.search(r'\b(SELECT|INSERT|UPDATE|DELETE)\b', chunk, re.IGNORECASE)
+            if not match:
+                continue
+            sql = chunk[match.start():].strip()
+            if sql.upper().startswith('SELECT'):
+                sql = re.sub(r'\bINTO\s+\w+(\s*,\s*\w+)*\s+(?=FROM\b)', '', sql,
+                             count=1, flags=re.IGNORECASE)
+            sql = re.sub(r'\b(?:NEW|OLD)\.\w+', SAMPLE_VALUE, sql, flags=re.IGNORECASE)
+            for param in param_names:
+                sql = re.sub(rf'\b{param}\b', SAMPLE_VALUE, sql)
+            statements.append(Statement(source, f"{kind.lower()} {name}", sql))
+    return statements
+
+
+def collect_statements():
+    """Collect every statement covered by the check."""
+    root = project_root()
+    statements = []
+
+    for package in ('routes', 'utils'):
+        for path in sorted(glob.glob(os.path.join(root, package, '*.py'))):
+            statements.extend(python_statements(path))
+
+    database_dir = get_database_dir()
+    views = read_sql_file(os.path.join(database_dir, 'views.sql')) or ''
+    statements.extend(view_statements(views))
+
+    for filename in ('triggers.sql', 'procedures_functions.sql'):
+        content = read_sql_file(os.path.join(database_dir, filename)) or ''
+        statements.extend(routine_statements(content, f"database/{filename}"))
+
+    # A closure's statements are also found in its enclosing function, and
+    # triggers share statements; EXPLAIN each one once per file
+    seen = set()
+    unique = []
+    for stmt in statements:
+        if (stmt.source, stmt.sql) not in seen:
+            seen.add((stmt.source, stmt.sql))
+            unique.append(stmt)
+    return unique
+
+
+def alias_map(cursor):
+    """
+    Map plan aliases to base table names.
+
+    EXPLAIN reports tables by alias (and expands views into their base tables).
+    The rewritten statement in the Note that follows EXPLAIN names every table
+    as `db`.`table` `alias`, which lets us map the aliases back.
+
+    Returns:
+        dict: alias -> table name
+    """
+    cursor.execute("SHOW WARNINGS")
+    aliases = {}
+    for warning in cursor.fetchall():
+        for table, alias in re.findall(r'(?<![.\w`])`\w+`\.`(\w+)`(?!\.)(?:\s+`(\w+)`)?',
+                                      warning.get('Message', '')):
+            aliases[alias or table] = table
+    return aliases
+
+
+def full_scans(plan_rows, aliases, min_rows):
+    """
+    Find full scans of large tables in tabular EXPLAIN output.
+
+    Returns:
+        list: (table, estimated rows) tuples
+    """
+    scans = []
+    for row in plan_rows:
+        alias = row.get('table') or ''
+        table = aliases.get(alias, alias)
+        if row.get('type') == 'ALL' and table in LARGE_TABLES and (row.get('rows') or 0) >= min_rows:
+            scans.append((table, row.get('rows')))
+    return scans
+
+
+def check(cursor, statements, min_rows, verbose):
+    """
+    EXPLAIN every statement and report violations.
+
+    Returns:
+        int: Number of failing statements
+    """
+    failures = 0
+    for stmt in statements:
+        try:
+            cursor.execute(f"EXPLAIN {stmt.sql}")
+            plan_rows = cursor.fetchall()
+            aliases = alias_map(cursor)
+        except Error as e:
+            failures += 1
+            print(f"✗ {stmt.label}: could not EXPLAIN ({e.msg})")
+            continue
+
+        violations = []
+        for table, rows in full_scans(plan_rows, aliases, min_rows):
+            reason = ALLOWED_FULL_SCANS.get((stmt.source, stmt.name, table))
+            if reason:
+                if verbose:
+                    print(f"  (allowed) {stmt.label}: full scan of {table} - {reason}")
+            else:
+                violations.append((table, rows))
+
+        if violations:
+            failures += 1
+            scans = ', '.join(f"{table} (~{rows} rows)" for table, rows in violations)
+            print(f"✗ {stmt.label}: full scan of {scans}")
+            print("    " + " ".join(stmt.sql.split())[:200])
+        elif verbose:
+            print(f"✓ {stmt.label}")
+
+        if verbose or violations:
+            for row in plan_rows:
+                print(f"    {row.get('table') or '-':<28} type={row.get('type') or '-':<7} "
+                      f"key={row.get('key') or '-':<36} rows={row.get('rows')}")
+
+    return failures
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="EXPLAIN every application query and fail on large full scans.")
+    parser.add_argument('--database', default=Config.DB_CONFIG['database'])
+    parser.add_argument('--min-rows', type=int, default=1000)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    config = Config.DB_CONFIG.copy()
+    config['database'] = args.database
+    # EXPLAIN always emits a note; do not turn it into an exception
+    config['raise_on_warnings'] = False
+
+    statements = collect_statements()
+
+    print("=" * 70)
+    print("CourseTracker Query Plan Check")
+    print("=" * 70)
+    print(f"Database: {args.database}")
+    print(f"Statements: {len(statements)}  (full-scan threshold: {args.min_rows} rows)")
+    print("=" * 70)
+
+    connection = None
+    cursor = None
+    try:
+        connection = mysql.connector.connect(**config)
+        cursor = connection.cursor(dictionary=True)
+        failures = check(cursor, statements, args.min_rows, args.verbose)
+    except Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(2)
+    finally:
+        if cursor:
+            cursor.close()
+        if connection and connection.is_connected():
+            connection.close()
+
+    print("=" * 70)
+    if failures:
+        print(f"✗ {failures} of {len(statements)} statements failed the plan check.")
+    else:
+        print(f"✓ All {len(statements)} statements passed the plan check.")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
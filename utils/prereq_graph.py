@@ -0,0 +1,193 @@
+"""
+In-memory prerequisite graph for CourseTracker.
+
+prerequisite_of is small and rarely changes, but every eligibility question
+("can this student take course X?") needs it. PrerequisiteGraph loads the
+table once and stores, per course, its direct prerequisites and their
+transitive closure as bitsets (Python ints, one bit per course), so checking a
+student's completed courses against a course is a couple of integer ANDs.
+
+The loaded graph is fingerprinted (row count + XOR of row checksums). At most
+every PREREQ_GRAPH_CHECK_INTERVAL seconds get_prerequisite_graph() re-reads the
+fingerprint, which is a single aggregate query, and rebuilds the graph only if
+the table changed. The graph is loaded during startup warm-up (see
+utils/warmup.py).
+"""
+
+import threading
+import time
+from config import Config
+from utils.db_connection import execute_query
+from utils.warmup import register_warmer
+
+PREREQ_ROWS_SQL = "SELECT prereqCourseId, targetCourseId FROM prerequisite_of"
+
+PREREQ_FINGERPRINT_SQL = """
+    SELECT COUNT(*) AS row_count,
+           COALESCE(BIT_XOR(CRC32(CONCAT_WS(':', prereqCourseId, targetCourseId))), 0) AS checksum
+    FROM prerequisite_of
+"""
+
+
+class PrerequisiteGraph:
+    """
+    Prerequisite relation with precomputed transitive closure.
+
+    Args:
+        edges (iterable): (prereqCourseId, targetCourseId) pairs
+        fingerprint (tuple, optional): Table fingerprint the edges were read under
+    """
+
+    def __init__(self, edges, fingerprint=None):
+        self.fingerprint = fingerprint
+        self._bit = {}        # courseId -> bit position
+        self._course = []     # bit position -> courseId
+        self.direct = {}      # target courseId -> bitset of direct prerequisites
+
+        for prereq, target in edges:
+            self.direct[target] = self.direct.get(target, 0) | (1 << self._index(prereq))
+            self._index(target)
+
+        self.closure = {}     # target courseId -> bitset of all transitive prerequisites
+        for target in self.direct:
+            self._close(target)
+
+    def _index(self, course_id):
+        if course_id not in self._bit:
+            self._bit[course_id] = len(self._course)
+            self._course.append(course_id)
+        return self._bit[course_id]
+
+    def _close(self, course_id):
+        """
+        Depth-first closure with memoization; cycles are cut, not followed.
+
+        Iterative (explicit stack), so a long prerequisite chain does not hit
+        the recursion limit.
+        """
+        if course_id in self.closure:
+            return
+        partial = {course_id: self.direct.get(course_id, 0)}  # courses on the stack -> mask so far
+        stack = [(course_id, iter(self.courses(partial[course_id])))]
+        while stack:
+            node, prereqs = stack[-1]
+            for prereq in prereqs:
+                if prereq in partial:
+                    continue
+                if prereq in self.closure:
+                    partial[node] |= self.closure[prereq]
+                    continue
+                partial[prereq] = self.direct.get(prereq, 0)
+                stack.append((prereq, iter(self.courses(partial[prereq]))))
+                break
+            else:
+                stack.pop()
+                self.closure[node] = partial.pop(node)
+                if stack:
+                    partial[stack[-1][0]] |= self.closure[node]
+
+    def mask(self, course_ids):
+        """
+        Bitset of a collection of courses (courses outside the graph are ignored).
+
+        Args:
+            course_ids (iterable): Course IDs, e.g. a student's completed courses
+
+        Returns:
+            int: Bitset
+        """
+        mask = 0
+        for course_id in course_ids:
+            bit = self._bit.get(course_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def courses(self, mask):
+        """
+        Course IDs whose bits are set, in bit order.
+
+        Args:
+            mask (int): Bitset
+
+        Returns:
+            list: Course IDs
+        """
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self._course[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def missing(self, course_id, completed_mask, transitive=False):
+        """
+        Prerequisites of a course that are not in the completed set.
+
+        Args:
+            course_id (int): Target course
+            completed_mask (int): Bitset from mask() of the completed courses
+            transitive (bool): Check the whole prerequisite chain instead of the
+                direct prerequisites (the prereq_check trigger checks direct ones)
+
+        Returns:
+            int: Bitset of missing prerequisites (0 if none)
+        """
+        required = (self.closure if transitive else self.direct).get(course_id, 0)
+        return required & ~completed_mask
+
+
+_graph = None
+_graph_lock = threading.Lock()
+_last_check = 0.0
+
+
+def _load():
+    """Read prerequisite_of and build a graph; None if the database is unavailable."""
+    fingerprint = execute_query(PREREQ_FINGERPRINT_SQL, fetch_one=True)
+    rows = execute_query(PREREQ_ROWS_SQL)
+    if fingerprint is None or rows is None:
+        return None
+    return PrerequisiteGraph(((r['prereqCourseId'], r['targetCourseId']) for r in rows),
+                             fingerprint=(fingerprint['row_count'], fingerprint['checksum']))
+
+
+def get_prerequisite_graph():
+    """
+    Return the current prerequisite graph, rebuilding it if prerequisite_of changed.
+
+    Returns:
+        PrerequisiteGraph: The graph, or None if it has never been loaded and
+        the database is unavailable
+    """
+    global _graph, _last_check
+    now = time.monotonic()
+    if _graph is not None and now - _last_check < Config.PREREQ_GRAPH_CHECK_INTERVAL:
+        return _graph
+
+    with _graph_lock:
+        if _graph is not None and now - _last_check < Config.PREREQ_GRAPH_CHECK_INTERVAL:
+            return _graph
+        _last_check = now
+
+        if _graph is not None:
+            current = execute_query(PREREQ_FINGERPRINT_SQL, fetch_one=True)
+            if current is None or (current['row_count'], current['checksum']) == _graph.fingerprint:
+                return _graph
+
+        graph = _load()
+        if graph is not None:
+            _graph = graph
+        return _graph
+
+register_warmer('prerequisite graph', get_prerequisite_graph)
+
+
+def refresh_prerequisite_graph():
+    """
+    Re-check prerequisite_of on the next get_prerequisite_graph() call instead
+    of waiting for the check interval. Call after changing the table.
+    """
+    global _last_check
+    with _graph_lock:
+        _last_check = 0.0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Seat Counter Reconciliation for CourseTracker
+
+The section_stats table holds a materialized enrolled count per section that is
+kept current by triggers on enrolls_in (see database/triggers.sql). This script
+recomputes every counter from enrolls_in, reports any section whose stored
+values have drifted, and rebuilds the table.
+
+Usage:
+    python -m utils.reconcile_seats [--check]
+
+Options:
+    --check: Only report drift, do not rebuild. Exits with status 1 if drift is found.
+"""
+
+import sys
+from mysql.connector import Error
+from utils.db_connection import unit_of_work
+
+# Sections whose stored counters differ from a fresh COUNT(*) over enrolls_in
+DRIFT_SQL = """
+    SELECT
+        s.courseId,
+        s.sectionNo,
+        s.capacity,
+        ss.capacity AS stored_capacity,
+        ss.enrolled_count AS stored_enrolled,
+        COUNT(e.studentId) AS actual_enrolled
+    FROM Section s
+    LEFT JOIN section_stats ss
+        ON ss.courseId = s.courseId AND ss.sectionNo = s.sectionNo
+    LEFT JOIN enrolls_in e
+        ON e.courseId = s.courseId
+        AND e.sectionNo = s.sectionNo
+        AND e.status = 'enrolled'
+    GROUP BY s.courseId, s.sectionNo, s.capacity, ss.capacity, ss.enrolled_count
+    HAVING stored_enrolled IS NULL
+        OR stored_enrolled <> actual_enrolled
+        OR stored_capacity <> s.capacity
+    ORDER BY s.courseId, s.sectionNo
+"""
+
+# Rebuild every counter from scratch. INSERT ... SELECT takes shared locks on the
+# enrolls_in rows it reads, so concurrent enrollments wait instead of racing the rebuild.
+REBUILD_SQL = """
+    INSERT INTO section_stats (courseId, sectionNo, capacity, enrolled_count)
+    SELECT s.courseId, s.sectionNo, s.capacity, COUNT(e.studentId)
+    FROM Section s
+    LEFT JOIN enrolls_in e
+        ON e.courseId = s.courseId
+        AND e.sectionNo = s.sectionNo
+        AND e.status = 'enrolled'
+    GROUP BY s.courseId, s.sectionNo, s.capacity
+    ON DUPLICATE KEY UPDATE
+        capacity = VALUES(capacity),
+        enrolled_count = VALUES(enrolled_count)
+"""
+
+
+def find_drift(uow):
+    """
+    Find sections whose section_stats row is missing or out of date.
+
+    Args:
+        uow (UnitOfWork): Open unit of work
+
+    Returns:
+        list: Rows with courseId, sectionNo, capacity, stored_capacity,
+            stored_enrolled and actual_enrolled
+    """
+    return uow.query(DRIFT_SQL)
+
+
+def print_drift(drift):
+    """Print a drift report table."""
+    if not drift:
+        print("✓ No drift: every section_stats counter matches enrolls_in.")
+        return
+
+    print(f"⚠️  Drift found in {len(drift)} section(s):")
+    print(f"  {'Course':>8} {'Section':>8} {'Stored':>8} {'Actual':>8} {'Stored cap':>11} {'Capacity':>9}")
+    for row in drift:
+        stored = '-' if row['stored_enrolled'] is None else row['stored_enrolled']
+        stored_cap = '-' if row['stored_capacity'] is None else row['stored_capacity']
+        print(f"  {row['courseId']:>8} {row['sectionNo']:>8} {stored:>8} "
+              f"{row['actual_enrolled']:>8} {stored_cap:>11} {row['capacity']:>9}")
+
+
+def reconcile(check_only=False):
+    """
+    Report drift in section_stats and (unless check_only) rebuild it.
+
+    Args:
+        check_only (bool): If True, only report drift
+
+    Returns:
+        list: Drifted rows found before the rebuild
+    """
+    with unit_of_work() as uow:
+        drift = find_drift(uow)
+        print_drift(drift)
+
+        if not check_only:
+            uow.execute(REBUILD_SQL)
+            print("✓ Rebuilt section_stats from enrolls_in.")
+
+    return drift
+
+
+def main():
+    """Main entry point."""
+    check_only = '--check' in sys.argv
+
+    print("=" * 70)
+    print("CourseTracker Seat Counter Reconciliation")
+    print("=" * 70)
+
+    try:
+        drift = reconcile(check_only=check_only)
+    except Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(2)
+
+    sys.exit(1 if check_only and drift else 0)
+
+
+if __name__ == '__main__':
+    main()
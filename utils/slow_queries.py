@@ -0,0 +1,277 @@
+"""
+Slow Query Log for CourseTracker
+
+execute_query() and execute_update() hand every statement that takes at least
+SLOW_QUERY_THRESHOLD_MS to the slow query log. A capture holds the statement's
+fingerprint (see utils/metrics.py), its parameters with the values redacted
+(only their types and lengths are kept), the route that ran it, how long it
+took, any error, and the statement's plan from EXPLAIN FORMAT=JSON. The plan
+is captured at most once per statement every SLOW_QUERY_EXPLAIN_INTERVAL
+seconds; later captures reuse it. Only one EXPLAIN per statement runs at a
+time (concurrent captures of the same statement go without a plan), and it
+waits at most SLOW_QUERY_EXPLAIN_TIMEOUT seconds for a pooled connection, so
+a busy pool costs a plan rather than a request.
+
+Captures go into a bounded ring buffer (the oldest are dropped after
+SLOW_QUERY_BUFFER_SIZE) and, if SLOW_QUERY_LOG_FILE is set, are appended to
+that file as JSON lines, from which the buffer is reloaded after a restart.
+Admins see them grouped by statement and sorted by total time at
+/admin/slow-queries.
+
+The buffer lives in process memory; with several worker processes each keeps
+its own (they can share the file).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from config import Config
+from utils.metrics import fingerprint, current_route
+
+# Statements EXPLAIN accepts
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def redact_params(params):
+    """
+    Replace parameter values with their type (and length for strings).
+
+    Args:
+        params (tuple/list/dict): Statement parameters
+
+    Returns:
+        list/dict: e.g. ['int', 'str(12)', None]
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: _redact(value) for key, value in params.items()}
+    return [_redact(value) for value in params]
+
+
+def _redact(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    return type(value).__name__
+
+
+def plan_summary(plan):
+    """
+    Pull the headline numbers out of an EXPLAIN FORMAT=JSON plan.
+
+    Args:
+        plan (dict): Parsed plan
+
+    Returns:
+        tuple: (query cost or None, tables read with a full scan)
+    """
+    cost = None
+    full_scans = []
+
+    def walk(node):
+        nonlocal cost
+        if isinstance(node, dict):
+            if cost is None and 'cost_info' in node and 'query_cost' in node['cost_info']:
+                cost = float(node['cost_info']['query_cost'])
+            if node.get('access_type') == 'ALL' and node.get('table_name'):
+                full_scans.append(node['table_name'])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(plan)
+    return cost, sorted(set(full_scans))
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of slow statement captures, optionally backed by a file.
+
+    Args:
+        threshold_ms (float): Capture statements at least this slow; 0 disables the log
+        maxlen (int): Captures kept
+        path (str, optional): JSON lines file to append captures to
+        explain_interval (float): Seconds a statement's plan is reused
+    """
+
+    def __init__(self, threshold_ms=250, maxlen=200, path=None, explain_interval=300.0):
+        self.threshold = threshold_ms / 1000.0
+        self.maxlen = maxlen
+        self.path = path or None
+        self.explain_interval = explain_interval
+        self._entries = deque(maxlen=maxlen)
+        self._plans = {}  # statement id -> (monotonic time, plan fields)
+        self._explaining = set()  # statement ids with an EXPLAIN in flight
+        self._lock = threading.Lock()
+        self._loaded = self.path is None
+        self._file_lines = 0
+
+    def is_slow(self, seconds):
+        """True if a statement that took `seconds` should be captured."""
+        return self.threshold > 0 and seconds >= self.threshold
+
+    def capture(self, sql, params, seconds, error=None, explain=None):
+        """
+        Record a slow statement.
+
+        Args:
+            sql (str): SQL statement
+            params (tuple/list): Its parameters (stored redacted)
+            seconds (float): Time it took
+            error (Exception, optional): Error it raised, if any
+            explain (callable, optional): explain(sql, params) -> EXPLAIN FORMAT=JSON
+                text; called when the statement has no recent plan
+
+        Returns:
+            dict: The capture
+        """
+        statement, normalized = fingerprint(sql)
+        entry = {
+            'statement': statement,
+            'fingerprint': normalized,
+            'params': redact_params(params),
+            'route': current_route(),
+            'ms': round(seconds * 1000, 2),
+            'error': str(error) if error is not None else None,
+            'capturedAt': datetime.now().isoformat(timespec='seconds'),
+        }
+        entry.update(self._plan(statement, sql, params, explain))
+
+        with self._lock:
+            self._load()
+            self._entries.append(entry)
+            self._persist(entry)
+        return entry
+
+    def _plan(self, statement, sql, params, explain):
+        """Plan fields for a capture, from the cache or a new EXPLAIN."""
+        fields = {'plan': None, 'cost': None, 'fullScans': []}
+        words = sql.split(None, 1)
+        if explain is None or not words or words[0].upper() not in EXPLAINABLE:
+            return fields
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(statement)
+            if cached and now - cached[0] < self.explain_interval:
+                return cached[1]
+            if statement in self._explaining:
+                return fields
+            self._explaining.add(statement)
+
+        try:
+            text = explain(sql, params)
+            cost, full_scans = plan_summary(json.loads(text))
+            fields = {'plan': text, 'cost': cost, 'fullScans': full_scans}
+        except Exception as e:
+            print(f"Error explaining slow query: {e}")
+            fields['plan'] = f"EXPLAIN failed: {e}"
+
+        with self._lock:
+            self._explaining.discard(statement)
+            if len(self._plans) >= 1000:
+                self._plans.clear()
+            self._plans[statement] = (now, fields)
+        return fields
+
+    def _load(self):
+        """Fill the buffer from the log file (once, on first use)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    self._file_lines += 1
+                    try:
+                        self._entries.append(json.loads(line))
+                    except ValueError:
+                        pass
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error reading slow query log {self.path}: {e}")
+
+    def _persist(self, entry):
+        """Append to the log file, rewriting it once it holds twice the buffer."""
+        if self.path is None:
+            return
+        try:
+            if self._file_lines >= 2 * self.maxlen:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for kept in self._entries:
+                        f.write(json.dumps(kept, default=str) + '\n')
+                os.replace(tmp_path, self.path)
+                self._file_lines = len(self._entries)
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, default=str) + '\n')
+                self._file_lines += 1
+        except OSError as e:
+            print(f"Error writing slow query log {self.path}: {e}")
+
+    def entries(self):
+        """Captures in the buffer, newest first."""
+        with self._lock:
+            self._load()
+            return list(reversed(self._entries))
+
+    def summary(self):
+        """
+        Captures grouped by statement, slowest total first.
+
+        Returns:
+            list: One dict per statement with statement, fingerprint, count,
+            total_ms, avg_ms, max_ms, errors, routes, lastSeen and latest
+            (the newest capture, whose plan is shown)
+        """
+        groups = {}
+        for entry in reversed(self.entries()):
+            group = groups.get(entry['statement'])
+            if group is None:
+                group = groups[entry['statement']] = {
+                    'statement': entry['statement'],
+                    'fingerprint': entry['fingerprint'],
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'errors': 0,
+                    'routes': set(),
+                }
+            group['count'] += 1
+            group['total_ms'] += entry['ms']
+            group['max_ms'] = max(group['max_ms'], entry['ms'])
+            group['errors'] += entry.get('error') is not None
+            group['routes'].add(entry['route'])
+            group['lastSeen'] = entry['capturedAt']
+            if entry.get('plan') or 'latest' not in group:
+                group['latest'] = entry
+
+        for group in groups.values():
+            group['avg_ms'] = group['total_ms'] / group['count']
+            group['routes'] = sorted(group['routes'])
+        return sorted(groups.values(), key=lambda g: g['total_ms'], reverse=True)
+
+    def clear(self):
+        """Drop every capture (and empty the log file)."""
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+            self._loaded = True
+            self._file_lines = 0
+            if self.path is not None:
+                try:
+                    open(self.path, 'w').close()
+                except OSError as e:
+                    print(f"Error clearing slow query log {self.path}: {e}")
+
+
+slow_query_log = SlowQueryLog(threshold_ms=Config.SLOW_QUERY_THRESHOLD_MS,
+                              maxlen=Config.SLOW_QUERY_BUFFER_SIZE,
+                              path=Config.SLOW_QUERY_LOG_FILE,
+                              explain_interval=Config.SLOW_QUERY_EXPLAIN_INTERVAL)
@@ -0,0 +1,427 @@
+"""
+Synthetic Data for CourseTracker
+
+SyntheticDataset generates a referentially consistent dataset of any size in
+place of the hand-written database/data.sql: colleges and departments,
+professors, TAs and advisors, students, courses at four levels with a
+prerequisite DAG (a course only requires lower-level courses), sections,
+cross-listed codes, requirements and majors, declarations, and an enrollment
+history per student. Students take courses term by term, only once they have
+passed the prerequisites; completed courses get a grade, a few are withdrawn,
+and the current term's enrollments never exceed a section's capacity. The
+same seed always produces the same data.
+
+load_dataset() writes it with batched multi-row INSERTs (or LOAD DATA LOCAL
+INFILE) with foreign key and unique checks off. It must run before
+database/triggers.sql: MySQL cannot switch triggers off, so the loader refuses
+to load tables that have them. triggers.sql then seeds section_stats and
+student_gpa from the loaded rows, as it does for data.sql.
+
+Students are numbered from 4001, so the teststudent account created by
+auth_table.sql is linked to a synthetic student.
+
+Usage (through init_db):
+    python -m utils.init_db --force --scale large
+    python -m utils.init_db --force --students 65000 --courses 3000 [--load-data-infile]
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import date
+from config import Config
+
+# Preset sizes for --scale (students, courses); "large" is about 1M enrollments
+SCALES = {
+    'small': {'students': 2000, 'courses': 200},
+    'medium': {'students': 20000, 'courses': 1000},
+    'large': {'students': 65000, 'courses': 3000},
+}
+
+GRADES = ('A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F')
+GRADE_WEIGHTS = (4, 12, 10, 10, 12, 9, 8, 9, 6, 4, 4, 2, 3)
+
+SUBJECTS = (
+    ('CS', 'Computer Science'), ('MATH', 'Mathematics'), ('ECE', 'Electrical Engineering'),
+    ('BUS', 'Management Sciences'), ('BIOS', 'Biostatistics'), ('PHYS', 'Physics'),
+    ('CHEM', 'Chemistry'), ('BIO', 'Biology'), ('ECON', 'Economics'), ('PSY', 'Psychology'),
+    ('STAT', 'Statistics'), ('HIST', 'History'), ('ENGL', 'English'), ('PHIL', 'Philosophy'),
+    ('ME', 'Mechanical Engineering'), ('CEE', 'Civil Engineering'), ('ACCT', 'Accounting'),
+    ('FIN', 'Finance'), ('EDU', 'Education'), ('EPI', 'Epidemiology'),
+)
+
+COLLEGES = ('Liberal Arts & Sciences', 'Engineering', 'Business', 'Education', 'Public Health')
+
+LEVEL_TITLES = ('Introduction to', 'Intermediate', 'Advanced', 'Topics in')
+# Share of courses at each level (100- to 400-level)
+LEVEL_WEIGHTS = (4, 3, 2, 1)
+
+FIRST_NAMES = ('Emma', 'Liam', 'Olivia', 'Noah', 'Ava', 'Ethan', 'Sophia', 'Mason', 'Mia',
+               'Lucas', 'Amelia', 'Logan', 'Harper', 'James', 'Evelyn', 'Aiden', 'Abigail',
+               'Elijah', 'Emily', 'Jacob', 'Priya', 'Wei', 'Fatima', 'Diego', 'Yuki', 'Omar')
+LAST_NAMES = ('Johnson', 'Smith', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Chen', 'Nguyen', 'Patel', 'Kim', 'Lee', 'Wilson',
+              'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Okafor', 'Silva')
+
+BUILDINGS = ('MLH', 'SC', 'PBB', 'CB', 'VAN', 'EPB', 'SH', 'LIB')
+
+DEGREE_TYPES = ('BA', 'BS', 'BFA', 'BBA', 'BSE')
+
+# Id ranges follow database/data.sql
+COLLEGE_BASE, DEPT_BASE, EMPLOYEE_BASE, STUDENT_BASE = 1, 10, 1001, 4001
+COURSE_BASE, REQUIREMENT_BASE, MAJOR_BASE = 5001, 6001, 1
+
+# First day of the current term; completed terms alternate Fall / Spring before it
+CURRENT_TERM = date(2025, 1, 13)
+
+
+def term_start(terms_ago):
+    """Start date of the term `terms_ago` semesters before the current one."""
+    if terms_ago % 2 == 0:
+        return date(CURRENT_TERM.year - terms_ago // 2, 1, 13)
+    return date(CURRENT_TERM.year - (terms_ago + 1) // 2, 8, 19)
+
+
+class SyntheticDataset:
+    """
+    A generated dataset; tables() yields its rows table by table.
+
+    Args:
+        students (int): Number of students
+        courses (int): Number of courses
+        sections_per_course (int): Average sections per course
+        courses_per_term (int): Courses a student takes per term
+        seed (int): Random seed
+    """
+
+    def __init__(self, students=2000, courses=200, sections_per_course=2,
+                 courses_per_term=4, seed=42):
+        self.students = students
+        self.courses = courses
+        self.sections_per_course = sections_per_course
+        self.courses_per_term = courses_per_term
+        self.seed = seed
+
+    def tables(self):
+        """
+        Generate the dataset in foreign key order.
+
+        Yields:
+            tuple: (table, columns, rows) where rows is a list or, for
+            enrolls_in, a generator of parameter tuples
+        """
+        rng = random.Random(self.seed)
+
+        # Organization
+        dept_count = max(5, self.courses // 40)
+        college_count = min(len(COLLEGES), max(2, dept_count // 4))
+        colleges = [(COLLEGE_BASE + i, f"College of {COLLEGES[i]}") for i in range(college_count)]
+        departments = []
+        subject_codes = {}
+        for i in range(dept_count):
+            code, name = SUBJECTS[i % len(SUBJECTS)]
+            if i >= len(SUBJECTS):
+                suffix = i // len(SUBJECTS) + 1
+                code, name = f"{code}{suffix}", f"{name} {suffix}"
+            dept_id = DEPT_BASE + i
+            subject_codes[dept_id] = code
+            departments.append((dept_id, name, colleges[i % college_count][0]))
+        yield 'College', ('collegeId', 'name'), colleges
+        yield 'Department', ('deptId', 'name', 'collegeId'), departments
+
+        # Courses, levels and the prerequisite DAG
+        dept_ids = [d[0] for d in departments]
+        course_ids = list(range(COURSE_BASE, COURSE_BASE + self.courses))
+        level = {c: rng.choices((1, 2, 3, 4), LEVEL_WEIGHTS)[0] for c in course_ids}
+        dept_of = {c: rng.choice(dept_ids) for c in course_ids}
+        by_dept_level = {}
+        for c in course_ids:
+            by_dept_level.setdefault((dept_of[c], level[c]), []).append(c)
+
+        prereqs = {c: set() for c in course_ids}
+        for c in course_ids:
+            if level[c] == 1:
+                continue
+            lower = by_dept_level.get((dept_of[c], level[c] - 1)) or by_dept_level.get(
+                (rng.choice(dept_ids), level[c] - 1)) or []
+            prereqs[c].update(rng.sample(lower, min(len(lower), rng.randint(1, 2))))
+
+        subject_names = {d[0]: d[1] for d in departments}
+        numbers = {}
+        courses = []
+        for c in course_ids:
+            numbers[c] = level[c] * 1000 + (c - COURSE_BASE) % 1000
+            title = f"{LEVEL_TITLES[level[c] - 1]} {subject_names[dept_of[c]]} {numbers[c]}"
+            courses.append((c, title, rng.choices((1, 2, 3, 4), (1, 2, 10, 4))[0],
+                            rng.choice(BUILDINGS)))
+
+        # People
+        section_keys = []
+        sections = []
+        capacity = {}
+        for c in course_ids:
+            count = max(1, min(9, round(rng.gauss(self.sections_per_course, 1))))
+            for n in range(1, count + 1):
+                key = (c, f"{n:04d}")
+                capacity[key] = rng.choice((25, 30, 40, 60, 90, 120, 200) if level[c] == 1
+                                           else (20, 25, 30, 40, 60))
+                section_keys.append(key)
+                sections.append(key + (capacity[key],))
+
+        professors = max(1, self.courses // 3)
+        tas = max(1, len(section_keys) // 3)
+        advisors = max(1, self.students // 250)
+        employees = []
+        roles = (('Professor', professors, 85000, 130000),
+                 ('TA', tas, 18000, 26000),
+                 ('Advisor', advisors, 48000, 65000))
+        role_ids = {}
+        next_id = EMPLOYEE_BASE
+        for role, count, low, high in roles:
+            role_ids[role] = list(range(next_id, next_id + count))
+            for employee_id in role_ids[role]:
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                if role == 'Professor':
+                    name = f"Dr. {name}"
+                employees.append((employee_id, name, rng.choice('MFX'),
+                                  round(rng.uniform(low, high), -2), role))
+            next_id += count
+        yield 'Employee', ('employeeId', 'name', 'gender', 'salary', 'role'), employees
+        yield 'Professor', ('employeeId',), [(e,) for e in role_ids['Professor']]
+        yield 'TA', ('employeeId',), [(e,) for e in role_ids['TA']]
+        yield 'Advisor', ('employeeId',), [(e,) for e in role_ids['Advisor']]
+
+        student_ids = list(range(STUDENT_BASE, STUDENT_BASE + self.students))
+        year = {s: rng.randint(1, 4) for s in student_ids}
+        yield 'Student', ('studentId', 'name', 'gender', 'year'), [
+            (s, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice('MFX'), year[s])
+            for s in student_ids]
+
+        yield 'Course', ('courseId', 'title', 'credits', 'building'), courses
+
+        # Requirements and majors: core requirements per department, shared genEds
+        requirements = []
+        core_reqs = {}
+        gen_eds = []
+        next_req = REQUIREMENT_BASE
+        for dept_id in dept_ids:
+            for n in range(2):
+                requirements.append((next_req, f"{subject_codes[dept_id]} Core {n + 1}", 'core'))
+                core_reqs.setdefault(dept_id, []).append(next_req)
+                next_req += 1
+        for n in range(max(3, dept_count // 3)):
+            requirements.append((next_req, f"General Education {n + 1}", 'genEd'))
+            gen_eds.append(next_req)
+            next_req += 1
+        elective = next_req
+        requirements.append((elective, 'Free Elective', 'other'))
+        yield 'Requirement', ('reqId', 'name', 'reqType'), requirements
+
+        majors = []
+        next_major = MAJOR_BASE
+        for dept_id, name, _ in departments:
+            for degree in rng.sample(DEGREE_TYPES, rng.randint(1, 2)):
+                majors.append((next_major, degree, f"{name} {degree}", dept_id))
+            next_major += 1
+        yield 'Major', ('majorId', 'degreeType', 'name', 'deptId'), majors
+
+        yield 'Section', ('courseId', 'sectionNo', 'capacity'), sections
+
+        cross_lists = []
+        for c in course_ids:
+            cross_lists.append((dept_of[c], c, f"{subject_codes[dept_of[c]]}:{numbers[c]}"))
+            if rng.random() < 0.1:
+                other = rng.choice(dept_ids)
+                if other != dept_of[c]:
+                    cross_lists.append((other, c, f"{subject_codes[other]}:{numbers[c]}"))
+        yield 'cross_lists', ('deptId', 'courseId', 'code'), cross_lists
+
+        yield 'teaches', ('employeeId', 'courseId'), [
+            (rng.choice(role_ids['Professor']), c) for c in course_ids]
+        yield 'assists', ('employeeId', 'courseId', 'sectionNo'), [
+            (rng.choice(role_ids['TA']),) + key for key in section_keys if rng.random() < 0.8]
+        yield 'advises', ('employeeId', 'studentId'), [
+            (rng.choice(role_ids['Advisor']), s) for s in student_ids]
+
+        declares = []
+        for s in student_ids:
+            for major in rng.sample(majors, 2 if rng.random() < 0.08 else 1):
+                declares.append((s, major[0], major[1]))
+        yield 'declares', ('studentId', 'majorId', 'degreeType'), declares
+
+        sections_of = {}
+        for key in section_keys:
+            sections_of.setdefault(key[0], []).append(key[1])
+        by_level = {}
+        for c in course_ids:
+            by_level.setdefault(level[c], []).append(c)
+
+        yield ('enrolls_in', ('studentId', 'courseId', 'sectionNo', 'status', 'grade', 'enrolledDate'),
+               self._enrollments(rng, student_ids, year, by_level, prereqs, sections_of, capacity))
+
+        fulfills = set()
+        for dept_id in dept_ids:
+            dept_courses = [c for c in course_ids if dept_of[c] == dept_id] or course_ids
+            for req in core_reqs[dept_id]:
+                for c in rng.sample(dept_courses, min(len(dept_courses), rng.randint(2, 5))):
+                    fulfills.add((c, req))
+        for req in gen_eds + [elective]:
+            for c in rng.sample(course_ids, min(len(course_ids), rng.randint(5, 15))):
+                fulfills.add((c, req))
+        yield 'fulfills', ('courseId', 'reqId'), sorted(fulfills)
+
+        requires = []
+        for major_id, degree, _, dept_id in majors:
+            reqs = core_reqs[dept_id] + rng.sample(gen_eds, min(2, len(gen_eds))) + [elective]
+            requires.extend((major_id, degree, req) for req in reqs)
+        yield 'requires', ('majorId', 'degreeType', 'reqId'), requires
+
+        yield 'prerequisite_of', ('prereqCourseId', 'targetCourseId'), [
+            (p, c) for c in course_ids for p in sorted(prereqs[c])]
+
+    def _enrollments(self, rng, student_ids, year, by_level, prereqs, sections_of, capacity):
+        """Enrollment history, term by term, oldest term first, per student."""
+        seats = dict(capacity)  # open seats in the current term
+        for s in student_ids:
+            passed = set()
+            taken = set()
+            terms = 2 * (year[s] - 1) + rng.randint(0, 1)
+            for terms_ago in range(terms, -1, -1):
+                current = terms_ago == 0
+                max_level = min(4, 1 + (terms - terms_ago) // 2)
+                enrolled_date = term_start(terms_ago)
+                for c in self._pick_courses(rng, by_level, max_level, prereqs, passed, taken):
+                    open_sections = [n for n in sections_of[c] if not current or seats[(c, n)] > 0]
+                    if not open_sections:
+                        continue
+                    section = rng.choice(open_sections)
+                    taken.add(c)
+                    if current:
+                        seats[(c, section)] -= 1
+                        yield (s, c, section, 'enrolled', None, enrolled_date)
+                    elif rng.random() < 0.03:
+                        yield (s, c, section, 'withdrawn', None, enrolled_date)
+                    else:
+                        grade = rng.choices(GRADES, GRADE_WEIGHTS)[0]
+                        if grade != 'F':
+                            passed.add(c)
+                        yield (s, c, section, 'completed', grade, enrolled_date)
+
+    def _pick_courses(self, rng, by_level, max_level, prereqs, passed, taken):
+        """Up to courses_per_term courses the student may take (prerequisites passed)."""
+        picked = []
+        for _ in range(self.courses_per_term * 8):
+            if len(picked) == self.courses_per_term:
+                break
+            c = rng.choice(by_level.get(rng.randint(1, max_level)) or by_level[1])
+            if c not in taken and c not in picked and prereqs[c] <= passed:
+                picked.append(c)
+        return picked
+
+
+def loaded_triggers(cursor, tables):
+    """Names of triggers defined on any of `tables` in the current database."""
+    placeholders = ', '.join(['%s'] * len(tables))
+    cursor.execute(
+        f"SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+        f"WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE IN ({placeholders})",
+        tuple(tables))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+def _load_infile(cursor, table, columns, rows):
+    """Write rows to a temporary TSV file and LOAD DATA LOCAL INFILE it."""
+    count = 0
+    fd, path = tempfile.mkstemp(suffix='.tsv')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write('\t'.join(_tsv_value(v) for v in row) + '\n')
+                count += 1
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+            (path,))
+    finally:
+        os.remove(path)
+    return count
+
+
+def load_dataset(connection, dataset, batch_size=None, method='insert'):
+    """
+    Load a SyntheticDataset into the connection's current database.
+
+    The tables must exist and be empty, and have no triggers yet (load before
+    database/triggers.sql). Foreign key and unique checks are off for the load;
+    the generated data satisfies them.
+
+    Args:
+        connection: mysql.connector connection (opened with allow_local_infile=True
+            for method='infile')
+        dataset (SyntheticDataset): Data to load
+        batch_size (int, optional): Rows per multi-row INSERT
+            (default Config.DATA_LOAD_BATCH_SIZE)
+        method (str): 'insert' (batched multi-row INSERTs) or 'infile' (LOAD DATA LOCAL INFILE)
+
+    Returns:
+        dict: Table name -> (rows loaded, seconds)
+
+    Raises:
+        RuntimeError: If any of the tables already has triggers
+        mysql.connector.Error: If the load fails
+    """
+    batch_size = batch_size or Config.DATA_LOAD_BATCH_SIZE
+    cursor = connection.cursor()
+    report = {}
+    try:
+        triggers = loaded_triggers(cursor, ('enrolls_in', 'Section', 'Course', 'teaches'))
+        if triggers:
+            raise RuntimeError(f"Load the data before creating triggers (found {', '.join(triggers)})")
+
+        cursor.execute("SET SESSION foreign_key_checks = 0")
+        cursor.execute("SET SESSION unique_checks = 0")
+
+        for table, columns, rows in dataset.tables():
+            started = time.perf_counter()
+            if method == 'infile':
+                count = _load_infile(cursor, table, columns, rows)
+            else:
+                sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                       f"VALUES ({', '.join(['%s'] * len(columns))})")
+                count = 0
+                # executemany() sends each batch as one multi-row INSERT
+                for batch in _batches(rows, batch_size):
+                    cursor.executemany(sql, batch)
+                    connection.commit()
+                    count += len(batch)
+            connection.commit()
+            report[table] = (count, time.perf_counter() - started)
+
+        cursor.execute("ANALYZE TABLE " + ', '.join(report))
+        cursor.fetchall()
+        return report
+
+    finally:
+        try:
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.execute("SET SESSION unique_checks = 1")
+        finally:
+            cursor.close()
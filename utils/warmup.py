@@ -0,0 +1,209 @@
+"""
+Startup Warm-up and Health Checks for CourseTracker
+
+Without a warm-up the first requests after a start pay for opening database
+connections, compiling Jinja templates and loading the catalog cache and the
+prerequisite graph. warm_up() does that work before the process takes traffic:
+    connections: opens WARMUP_CONNECTIONS pool connections (default
+                 DB_POOL_SIZE) at once and returns them to the pool idle
+    templates:   compiles every template under templates/
+    caches:      runs the cache loaders registered with register_warmer(),
+                 which also executes each hot catalog statement once
+run.py warms up before starting the development server. Under Gunicorn the
+preloaded master compiles the templates and fills the caches, which the
+workers inherit, and every worker opens its own connections after the fork
+(see gunicorn.conf.py).
+
+init_app() adds two endpoints for load balancers and orchestrators:
+    /healthz  200 while the process can serve requests (liveness)
+    /readyz   200 once warm-up has run, the pool has a free connection and
+              the database answers SELECT 1 within READY_CHECK_TIMEOUT seconds
+              on a connection of its own; 503 with the failing checks
+              otherwise (readiness)
+
+A step that fails is recorded and does not stop the others; readiness then
+depends on the live checks.
+"""
+
+import os
+import time
+import mysql.connector
+from flask import jsonify
+from mysql.connector import Error
+from config import Config
+from utils.db_connection import get_pool
+
+WARMUP_STEPS = ('connections', 'templates', 'caches')
+
+# (name, callable) cache loaders run by the caches step
+_warmers = []
+
+# Warm-up progress of this process
+_state = {'finished': None, 'steps': {}}
+_started_at = time.time()
+
+
+def register_warmer(name, loader):
+    """
+    Register a cache loader to run during warm-up.
+
+    Args:
+        name (str): Label shown in the warm-up report
+        loader (callable): Called with no arguments; should fill its cache
+    """
+    _warmers.append((name, loader))
+
+
+def _open_connections(app):
+    """Borrow connections all at once so the pool keeps them open and idle."""
+    count = Config.WARMUP_CONNECTIONS or app.config['DB_POOL_SIZE']
+    pool = get_pool()
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(pool.acquire())
+    finally:
+        for connection in connections:
+            connection.close()
+    return f"{len(connections)} opened"
+
+
+def _compile_templates(app):
+    """Load every template so Jinja compiles and caches it."""
+    env = app.jinja_env
+    names = env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    if env.cache is not None and len(names) > getattr(env.cache, 'capacity', len(names)):
+        print(f"⚠️  {len(names)} templates exceed the Jinja cache ({env.cache.capacity}); "
+              "some will be compiled again")
+    for name in names:
+        env.get_template(name)
+    return f"{len(names)} compiled"
+
+
+def _prime_caches(app):
+    """Run the registered cache loaders."""
+    failed = []
+    for name, loader in _warmers:
+        try:
+            if loader() is None:
+                failed.append(name)
+        except Exception as e:
+            print(f"Error warming {name}: {e}")
+            failed.append(name)
+    if failed:
+        raise RuntimeError(f"could not load {', '.join(failed)}")
+    return f"{len(_warmers)} loaded"
+
+
+_STEP_FUNCTIONS = {
+    'connections': _open_connections,
+    'templates': _compile_templates,
+    'caches': _prime_caches,
+}
+
+
+def warm_up(app, steps=WARMUP_STEPS):
+    """
+    Run the warm-up steps and record the outcome for /readyz.
+
+    Args:
+        app: Flask application
+        steps (iterable): Steps to run, from WARMUP_STEPS
+
+    Returns:
+        dict: step -> {'ok': bool, 'detail': str, 'ms': float}
+    """
+    report = {}
+    for step in steps:
+        started = time.perf_counter()
+        try:
+            ok, detail = True, _STEP_FUNCTIONS[step](app)
+        except Exception as e:
+            ok, detail = False, str(e)
+        report[step] = {'ok': ok, 'detail': detail,
+                        'ms': round((time.perf_counter() - started) * 1000, 1)}
+    _state['steps'].update(report)
+    _state['finished'] = time.time()
+    return report
+
+
+def print_report(report, prefix=''):
+    """Print a warm_up() report, one line per step."""
+    for step, result in report.items():
+        mark = '✓' if result['ok'] else '✗'
+        print(f"{prefix}{mark} warm-up {step}: {result['detail']} ({result['ms']:.0f} ms)")
+
+
+def is_warm():
+    """True once warm-up has run in this process (or is disabled)."""
+    return not Config.WARMUP_ON_START or _state['finished'] is not None
+
+
+def _check_database():
+    """
+    Run SELECT 1 on a connection of its own.
+
+    The connection is opened with connection_timeout=READY_CHECK_TIMEOUT on the
+    pure-Python driver, where it is the socket timeout, so a server that
+    accepts the connection but never answers fails the check instead of
+    hanging the probe.
+    """
+    config = Config.DB_CONFIG.copy()
+    config.update(connection_timeout=Config.READY_CHECK_TIMEOUT, use_pure=True)
+    connection = mysql.connector.connect(**config)
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def readiness():
+    """
+    Run the readiness checks.
+
+    Returns:
+        tuple: (ready, checks) where checks maps warmup, pool and database
+        to {'ok': bool, 'detail': str}
+    """
+    checks = {}
+    steps = _state['steps']
+    checks['warmup'] = {
+        'ok': is_warm(),
+        'detail': ', '.join(f"{step} {'ok' if s['ok'] else 'failed'}" for step, s in steps.items())
+                  or ('disabled' if not Config.WARMUP_ON_START else 'not run'),
+    }
+
+    status = get_pool().status()
+    limit = status['size'] + status['max_overflow']
+    checks['pool'] = {'ok': status['in_use'] < limit,
+                      'detail': f"{status['in_use']}/{limit} in use"}
+
+    try:
+        _check_database()
+        checks['database'] = {'ok': True, 'detail': 'reachable'}
+    except Error as e:
+        checks['database'] = {'ok': False, 'detail': str(e)}
+
+    return all(check['ok'] for check in checks.values()), checks
+
+
+def init_app(app):
+    """
+    Add the /healthz and /readyz endpoints.
+
+    Args:
+        app: Flask application
+    """
+    def healthz():
+        return jsonify(status='ok', pid=os.getpid(),
+                       uptime=round(time.time() - _started_at, 1))
+
+    def readyz():
+        ready, checks = readiness()
+        return jsonify(status='ready' if ready else 'not ready', checks=checks), 200 if ready else 503
+
+    app.add_url_rule('/healthz', 'healthz', healthz)
+    app.add_url_rule('/readyz', 'readyz', readyz)
@@ -0,0 +1,24 @@
+"""
+CourseTracker WSGI Entry Point
+
+The application object for production WSGI servers. With Gunicorn and
+gunicorn.conf.py the app is imported once in the master process (preload) and
+shared by the forked workers. The master compiles the templates and fills the
+caches before forking (see utils/warmup.py); each worker then opens its own
+connection pool and starts its own analytics refresh thread.
+
+Usage:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import create_app
+from utils.db_connection import close_pool
+from utils.warmup import warm_up, print_report
+
+app = create_app(start_scheduler=False)
+
+if app.config['WARMUP_ON_START']:
+    print_report(warm_up(app, steps=('templates', 'caches')))
+
+# The master serves no requests; hold no connections that workers would inherit
+close_pool()